@@ -9,7 +9,10 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import os
+import io
 import json
+import gzip
+import atexit
 
 import logging
 import logging.handlers
@@ -36,8 +39,39 @@ DOCUMENTATION = '''
         ini:
         - section: callback_json_to_file
           key: logfile
+      format:
+        description:
+          - format of the log file.
+          - C(json) writes a JSON array, with the events indented.
+          - C(jsonl) writes one compact JSON event per line, through a buffered file handle.
+            The C(.json) extension of the logfile is replaced by C(.jsonl).
+        env:
+        - name: ANSIBLE_JSON_TO_LOGFILE_FORMAT
+        default: json
+        choices: [json, jsonl]
+        ini:
+        - section: callback_json_to_file
+          key: format
+      compression:
+        description:
+          - compression of the log file. Its extension (C(.gz) or C(.zst)) is appended to the logfile.
+          - C(zstd) requires the zstandard python package, C(gzip) is used if it isn't available.
+        env:
+        - name: ANSIBLE_JSON_TO_LOGFILE_COMPRESSION
+        default: none
+        choices: [none, gzip, zstd]
+        ini:
+        - section: callback_json_to_file
+          key: compression
 '''
 
+BUFFER_SIZE = 1024 * 1024
+
+COMPRESSION_EXTENSIONS = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
 
 
 class CallbackModule(CallbackBase):
@@ -58,31 +92,75 @@ class CallbackModule(CallbackBase):
         super(CallbackModule, self).set_options(task_keys=task_keys, var_options=var_options, direct=direct)
 
         self.logfile = self.get_option("logfile")
+        self.format = self.get_option("format")
+        self.compression = self.get_option("compression")
+
+        if self.compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                print("JSON_TO_LOGFILE: WARNING: zstandard not available, using gzip compression")
+                self.compression = "gzip"
+
+        if self.format == "jsonl" and self.logfile.endswith(".json"):
+            self.logfile += "l"
+
+        self.logfile += COMPRESSION_EXTENSIONS.get(self.compression, "")
 
-        with open(self.logfile, "a+") as f:
-            print("[", file=f)
+        self.logfile_f = self._open()
+        atexit.register(self._close)
+
+        if self.format == "json":
+            print("[", file=self.logfile_f, flush=True)
         self.is_open = True
 
         print("JSON_TO_LOGFILE: Storing json logs in", self.logfile)
         self.hostname = socket.gethostname()
 
+    def _open(self):
+        if self.compression == "gzip":
+            return gzip.open(self.logfile, "at")
+
+        if self.compression == "zstd":
+            import zstandard
+
+            writer = zstandard.ZstdCompressor().stream_writer(open(self.logfile, "ab"), closefd=True)
+            return io.TextIOWrapper(writer, write_through=False)
+
+        return open(self.logfile, "a", buffering=BUFFER_SIZE)
+
+    def _close(self):
+        if self.logfile_f is None: return
+
+        self.logfile_f.close()
+        self.logfile_f = None
+
     def _write(self, data, finished=False):
-        self._warn_if_not_open()
+        if not self._warn_if_not_open():
+            return
 
-        if not finished:
-            end = "," + "\n"
+        if self.format == "jsonl":
+            print(json.dumps(data, separators=(",", ":")), file=self.logfile_f)
         else:
-            end = "\n]" + "\n"
-            self.is_open = False
+            if not finished:
+                end = "," + "\n"
+            else:
+                end = "\n]" + "\n"
 
-        with open(self.logfile, "a+") as f:
-            print(json.dumps(data, indent=4, sort_keys=True), end=end, file=f)
+            # flushed at every event, like when the file was reopened for every event
+            print(json.dumps(data, indent=4, sort_keys=True), end=end, file=self.logfile_f, flush=True)
+
+        if finished:
+            self.is_open = False
+            self._close()
 
     def _warn_if_not_open(self):
-        if self.is_open: return
+        if self.is_open: return True
 
         print("JSON_TO_LOGFILE: WARNING: logfile already closed ....")
 
+        return False
+
     def playbook_on_stats(self, stats):
         hosts = set()
         for dictt in stats.ok, stats.failures, stats.skipped, stats.rescued:
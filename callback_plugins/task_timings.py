@@ -0,0 +1,118 @@
+# Make coding more python3-ish
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import time
+import atexit
+
+from ansible.plugins.callback import CallbackBase
+
+DOCUMENTATION = '''
+    callback: task_timings
+    callback_type: aggregate
+    requirements:
+      - whitelist in configuration
+    short_description: records the timing of each task in a JSON-lines file
+    description:
+      - This plugin records, for each task and host, the start and end timestamps,
+        the role, the status, the number of loop items and the number of retries.
+      - One JSON object is written per line, when the task completes on the host.
+    options:
+      logfile:
+        description: filename where the task timings will be stored
+        env:
+        - name: ANSIBLE_TASK_TIMINGS_FILE
+        default: /tmp/ansible.task_timings.jsonl
+        ini:
+        - section: callback_task_timings
+          key: logfile
+'''
+
+
+class CallbackModule(CallbackBase):
+    """
+    records the start/end timestamps of the tasks to a file in the JSON-lines format
+    """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'task_timings'
+    CALLBACK_NEEDS_WHITELIST = True
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+
+        self.logfile_f = None
+        self.play_artifact_dir = None # artifact_extra_logs_dir var of the current play
+        self.task_start = {} # task uuid -> timestamp
+        self.host_start = {} # (task uuid, host name) -> timestamp
+
+    def set_options(self, task_keys=None, var_options=None, direct=None):
+        super(CallbackModule, self).set_options(task_keys=task_keys, var_options=var_options, direct=direct)
+
+        self.logfile = self.get_option("logfile")
+
+        self.logfile_f = open(self.logfile, "a")
+        atexit.register(self._close)
+
+    def _close(self):
+        if self.logfile_f is None: return
+
+        self.logfile_f.close()
+        self.logfile_f = None
+
+    def _record(self, result, status):
+        if self.logfile_f is None: return
+
+        end = time.time()
+
+        task = result._task
+        host = result._host.get_name()
+        start = self.host_start.pop((task._uuid, host), None) or self.task_start.get(task._uuid, end)
+
+        res = result._result if isinstance(result._result, dict) else {}
+
+        print(json.dumps({
+            "task": task.name or task.action, # get_name() prefixes the role name
+            "role": task._role.get_name() if task._role else None,
+            "action": task.action,
+            "path": task.get_path(),
+            "host": host,
+            "status": status,
+            "start": start,
+            "end": end,
+            "duration": end - start,
+            "loop_items": len(res["results"]) if isinstance(res.get("results"), list) else 0,
+            "attempts": res.get("attempts", 1),
+            "artifact_extra_logs_dir": self.play_artifact_dir,
+        }, separators=(",", ":")), file=self.logfile_f, flush=True)
+
+    def v2_playbook_on_play_start(self, play):
+        # the batched toolbox commands run in one play each, with their own artifacts directory
+        artifact_dir = play.get_vars().get("artifact_extra_logs_dir")
+        self.play_artifact_dir = artifact_dir if isinstance(artifact_dir, str) else None
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self.task_start[task._uuid] = time.time()
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self.task_start[task._uuid] = time.time()
+
+    def v2_runner_on_start(self, host, task):
+        self.host_start[(task._uuid, host.get_name())] = time.time()
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, "OK")
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, "IGNORED" if ignore_errors else "FAILED")
+
+    def v2_runner_on_skipped(self, result):
+        self._record(result, "SKIPPED")
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, "UNREACHABLE")
+
+    def v2_playbook_on_stats(self, stats):
+        self._close()
@@ -0,0 +1,226 @@
+import os
+import ssl
+import json
+import time
+import base64
+import pathlib
+import logging
+import tempfile
+import threading
+import http.client
+import urllib.parse
+import concurrent.futures
+
+import yaml
+
+# Minimal Kubernetes API client, to create the resources of the load
+# test without launching one `oc create` process per resource.
+#
+# The resources are POSTed by a pool of worker threads, each keeping
+# its HTTP connection to the API server open between the requests.
+# The submission is asynchronous: the scheduler only queues the
+# resource and returns, so the creation times follow the schedule
+# plan, even when the API server is slow to answer.
+
+DEFAULT_WORKERS = 16
+REQUEST_TIMEOUT = 60 # seconds
+
+# plural names which aren't the lower-case kind + 's'
+PLURALS = {}
+
+
+class KubeConfig(object):
+    """
+    The connection settings of the current context of a kubeconfig file.
+    """
+
+    def __init__(self, server, ssl_context=None, token=None, namespace=None):
+        self.server = urllib.parse.urlparse(server)
+        self.ssl_context = ssl_context
+        self.token = token
+        self.namespace = namespace
+
+
+def _data_or_file(entry, key, tmp_dir):
+    # returns the path of the `key` (file) or `key-data` (base64 inline) entry
+    if data := entry.get(f"{key}-data"):
+        path = pathlib.Path(tmp_dir) / key
+        path.write_bytes(base64.b64decode(data))
+        return str(path)
+
+    return entry.get(key)
+
+
+def load_kubeconfig(kubeconfig=None):
+    """
+    Loads the current context of a kubeconfig file.
+
+    Args:
+      kubeconfig: the kubeconfig file. Default: $KUBECONFIG, or ~/.kube/config
+    """
+
+    if kubeconfig is None:
+        kubeconfig = os.environ.get("KUBECONFIG", "").split(os.pathsep)[0] or pathlib.Path.home() / ".kube" / "config"
+
+    with open(kubeconfig) as f:
+        config = yaml.safe_load(f)
+
+    def get_named(section, name):
+        try:
+            return next(entry for entry in config.get(section) or [] if entry["name"] == name)
+        except StopIteration:
+            raise ValueError(f"{kubeconfig}: {section} entry '{name}' not found") from None
+
+    context = get_named("contexts", config["current-context"])["context"]
+    cluster = get_named("clusters", context["cluster"])["cluster"]
+    user = get_named("users", context["user"])["user"] if context.get("user") else {}
+
+    ssl_context = None
+    if cluster["server"].startswith("https://"):
+        ssl_context = ssl.create_default_context()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            if cluster.get("insecure-skip-tls-verify"):
+                ssl_context.check_hostname = False
+                ssl_context.verify_mode = ssl.CERT_NONE
+            elif ca_file := _data_or_file(cluster, "certificate-authority", tmp_dir):
+                ssl_context.load_verify_locations(cafile=ca_file)
+
+            cert_file = _data_or_file(user, "client-certificate", tmp_dir)
+            key_file = _data_or_file(user, "client-key", tmp_dir)
+            if cert_file:
+                ssl_context.load_cert_chain(cert_file, key_file)
+
+    token = user.get("token")
+    if not token and (token_file := user.get("tokenFile")):
+        token = pathlib.Path(token_file).read_text().strip()
+
+    return KubeConfig(cluster["server"], ssl_context, token, context.get("namespace"))
+
+
+def resource_path(resource):
+    """
+    Returns the API path where a namespaced resource is created.
+    """
+
+    group_version = resource["apiVersion"]
+    plural = PLURALS.get(resource["kind"], resource["kind"].lower() + "s")
+    prefix = f"/apis/{group_version}" if "/" in group_version else f"/api/{group_version}"
+
+    return f"{prefix}/namespaces/{resource['metadata']['namespace']}/{plural}"
+
+
+class ApiClient(object):
+    """
+    Creates resources with a pool of workers, each with a persistent connection to the API server.
+
+    Args:
+      kubeconfig: the KubeConfig of the API server
+      workers: the number of concurrent requests
+    """
+
+    def __init__(self, kubeconfig, workers=DEFAULT_WORKERS):
+        self.kubeconfig = kubeconfig
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api_client")
+        self.futures = []
+        self._local = threading.local()
+
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+        }
+        if kubeconfig.token:
+            self.headers["Authorization"] = f"Bearer {kubeconfig.token}"
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            server = self.kubeconfig.server
+            if server.scheme == "https":
+                conn = http.client.HTTPSConnection(server.hostname, server.port or 443,
+                                                   context=self.kubeconfig.ssl_context, timeout=REQUEST_TIMEOUT)
+            else:
+                conn = http.client.HTTPConnection(server.hostname, server.port or 80, timeout=REQUEST_TIMEOUT)
+
+            self._local.conn = conn
+            self._local.reused = False
+
+        return conn
+
+    def _post(self, path, body):
+        """
+        POSTs the body, on the persistent connection of the worker thread.
+
+        Returns:
+          (status, body, retried)
+        """
+
+        for attempt in range(2):
+            conn = self._connection()
+            reused = self._local.reused
+            try:
+                conn.request("POST", self.kubeconfig.server.path.rstrip("/") + path, body, self.headers)
+                response = conn.getresponse()
+                self._local.reused = True
+                return response.status, response.read(), attempt > 0
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                self._local.conn = None
+                # the server closed the idle keep-alive connection before
+                # reading the request: retry once with a new connection.
+                # Otherwise (eg, a timeout), the request may have been
+                # processed, so it isn't sent again.
+                if attempt or not reused:
+                    raise
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                self._local.conn = None
+                raise
+
+    def _create(self, resources):
+        record = dict(submitted=time.time())
+        try:
+            for resource in resources:
+                status, body, retried = self._post(resource_path(resource), json.dumps(resource))
+                record["status"] = status
+                if status == 409 and retried:
+                    # AlreadyExists: the first attempt created it
+                    record["retried"] = True
+                    continue
+                if status >= 300:
+                    record["error"] = body.decode("utf8", errors="replace")[:1000]
+                    break
+        except Exception as e:
+            record["status"] = None
+            record["error"] = f"{e.__class__.__name__}: {e}"
+
+        record["completed"] = time.time()
+
+        return record
+
+    def create(self, resources):
+        """
+        Queues the creation of resources (created in order, by the same worker).
+
+        Returns:
+          a Future of the creation record: dict(submitted, completed, status[, error])
+        """
+
+        future = self.executor.submit(self._create, resources)
+        self.futures.append(future)
+
+        return future
+
+    def wait(self):
+        """
+        Waits for all the queued creations to complete.
+
+        Returns:
+          the list of the creation records, in the order of the create() calls
+        """
+
+        records = [future.result() for future in self.futures]
+        self.executor.shutdown()
+
+        return records
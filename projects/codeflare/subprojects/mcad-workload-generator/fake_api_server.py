@@ -0,0 +1,160 @@
+#! /usr/bin/env python
+
+# Fake Kubernetes API server, to test the 'api' creation backend of
+# the generator without a cluster.
+#
+# It accepts the resource creation requests (with an optional
+# latency), and records their arrival time and the client
+# connection. `main` runs the generator against it and checks that
+# all the resources have been created, with pooled connections.
+
+import sys
+import json
+import time
+import pathlib
+import tempfile
+import threading
+import http.server
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+import fire
+import yaml
+
+
+class FakeApiServer(http.server.ThreadingHTTPServer):
+    """
+    Records the POSTed resources, and answers them with '201 Created'.
+
+    Args:
+      latency: the time (in seconds) taken to answer each request
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.requests = []
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def write_kubeconfig(self, dest, namespace="fake"):
+        with open(dest, "w") as f:
+            yaml.dump({
+                "apiVersion": "v1",
+                "kind": "Config",
+                "current-context": "fake",
+                "clusters": [dict(name="fake", cluster=dict(server=self.url))],
+                "users": [dict(name="fake", user=dict(token="fake-token"))],
+                "contexts": [dict(name="fake", context=dict(cluster="fake", user="fake", namespace=namespace))],
+            }, f)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # keep the connections alive
+
+    def do_POST(self):
+        received = time.time()
+        resource = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        with self.server.lock:
+            self.server.requests.append(dict(
+                path=self.path,
+                name=resource["metadata"]["name"],
+                received=received,
+                client=self.client_address,
+                authorization=self.headers.get("Authorization"),
+            ))
+
+        body = json.dumps(resource).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # too verbose
+
+
+def main(aw_count=500, timespan=0.25, latency=0.05, api_workers=16, job_mode=False):
+    """
+    Runs the generator with the 'api' backend against a fake API server, and checks the result.
+
+    Args:
+      aw_count: number of resources to create
+      timespan: number of minutes over which the resources should be created
+      latency: time (in seconds) taken by the fake server to answer each request
+      api_workers: number of concurrent creation requests
+      job_mode: if true, create Jobs instead of AppWrappers
+    """
+
+    import generator
+
+    server = FakeApiServer(latency=latency).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = pathlib.Path(tmp_dir)
+            server.write_kubeconfig(tmp_dir / "kubeconfig")
+
+            generator.ARTIFACT_DIR = tmp_dir
+            generator.main(dry_run=False, backend="api", kubeconfig=tmp_dir / "kubeconfig",
+                           aw_count=aw_count, timespan=timespan, api_workers=api_workers,
+                           job_mode=job_mode, visualize=False)
+
+            with open(tmp_dir / "schedule_result.json") as f:
+                schedule_result = json.load(f)
+    finally:
+        server.stop()
+
+    errors = []
+    if len(server.requests) != aw_count:
+        errors.append(f"{len(server.requests)} resources created, expected {aw_count}")
+
+    created = set(request["name"] for request in server.requests)
+    if missing := [result["name"] for result in schedule_result if not any(name.startswith(result["name"]) for name in created)]:
+        errors.append(f"{len(missing)} resources not created, eg: {missing[0]}")
+
+    if any(request["authorization"] != "Bearer fake-token" for request in server.requests):
+        errors.append("requests without the kubeconfig token")
+
+    connections = len(set(request["client"] for request in server.requests))
+    if connections > api_workers:
+        errors.append(f"{connections} connections opened, expected at most {api_workers}")
+
+    if any(result.get("status") != 201 for result in schedule_result):
+        errors.append("schedule_result.json entries without a '201' status")
+
+    logging.info(f"{len(server.requests)} resources created through {connections} connections, "
+                 f"for {len(server.requests) / connections:.1f} requests per connection.")
+
+    for error in errors:
+        logging.error(error)
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # Print help rather than opening a pager
+    fire.core.Display = lambda lines, out: print(*lines, file=out)
+
+    fire.Fire(main)
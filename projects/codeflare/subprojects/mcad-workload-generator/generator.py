@@ -8,6 +8,7 @@ import yaml, json
 import copy
 from collections import defaultdict
 import datetime
+import time
 import logging
 logging.getLogger().setLevel(logging.INFO)
 
@@ -17,6 +18,7 @@ import jsonpath_ng
 
 import k8s_quantity
 import scheduler
+import api_client
 
 ARTIFACT_DIR = pathlib.Path(os.environ.get("ARTIFACT_DIR", "."))
 
@@ -87,7 +89,11 @@ def main(dry_run=True,
          aw_count=3,
          timespan=0,
          distribution="poisson",
+         distribution_args={},
          visualize=True,
+         backend="oc",
+         api_workers=api_client.DEFAULT_WORKERS,
+         kubeconfig=None,
          ):
     """
     Generates workload for the MCAD load test
@@ -105,9 +111,26 @@ def main(dry_run=True,
       aw_count: number of AppWrapper replicas to create
       timespan: number of minutes over which the AppWrappers should be created
       distribution: the distribution method to use to spread the resource creation over the requested timespan
+      distribution_args: the arguments of the distribution method, eg: {trace_file: schedule_result.json} for 'trace', {phases: 'ramp:1:1,plateau:3:3,burst:1:2'} for 'composite'
       visualize: activate or deactive the visualization of the generator load distribution
+      backend: 'oc' to create the resources with one `oc create` process each, 'api' to create them with a pool of persistent API server connections
+      api_workers: with the 'api' backend, the number of concurrent creation requests
+      kubeconfig: with the 'api' backend, the kubeconfig file of the API server. Default: $KUBECONFIG, or ~/.kube/config
     """
 
+    if backend not in ("oc", "api"):
+        logging.error(f"Invalid backend '{backend}'. Expected 'oc' or 'api'.")
+        sys.exit(1)
+
+    api = None
+    if backend == "api" and not dry_run:
+        api_kubeconfig = api_client.load_kubeconfig(kubeconfig)
+        logging.info(f"Creating the resources with {api_workers} connections to {api_kubeconfig.server.geturl()}")
+        api = api_client.ApiClient(api_kubeconfig, workers=api_workers)
+
+        if namespace is None:
+            namespace = api_kubeconfig.namespace or "default"
+
     if namespace is None:
         logging.info("Getting the current project name ...")
 
@@ -203,7 +226,9 @@ def main(dry_run=True,
         if aw_index == 0:
             logging.info(f"First resource: {resource_json}")
 
-        if not dry_run:
+        if api:
+            api.create([json.loads(line) for line in resource_json.split("\n")])
+        elif not dry_run:
             nonlocal processes
             processes += [run_in_background("oc create -f-".split(" "), input=resource_json, verbose=verbose_resource_creation, capture_stdout=not verbose_resource_creation)]
 
@@ -216,18 +241,26 @@ def main(dry_run=True,
             else (lambda : datetime.datetime.now().time())
 
         create_ts = str(time_fct())
+        submitted = time.time()
         name = create_appwrapper(aw_index)
 
-        schedule_result.append(dict(
+        result = dict(
             create=create_ts,
             name=name,
             delay=float(delay),
             index=aw_index
-        ))
+        )
+        if not dry_run:
+            result["planned"] = plan_start + float(delay)
+            result["submitted"] = submitted # with the 'api' backend, updated with the time of the request
 
+        schedule_result.append(result)
+
+    plan_start = time.time() # the scheduler delays are relative to its preparation
     times, schedule = scheduler.prepare(_create_appwrapper, distribution, timespan_sec, aw_count,
                                         dry_run=dry_run,
-                                        verbose_dry_run=verbose_resource_creation)
+                                        verbose_dry_run=verbose_resource_creation,
+                                        distribution_args=distribution_args)
 
     schedule_plan_dest = ARTIFACT_DIR / f"schedule_plan.yaml"
 
@@ -249,8 +282,27 @@ def main(dry_run=True,
             logging.error(f"Background call #{idx} to '{' '.join(proc.args)}' returned {ret} :/")
             sys.exit(1)
 
+    failed_creations = 0
+    if api:
+        for result, record in zip(schedule_result, api.wait()):
+            result.update(record)
+            if record.get("error"):
+                failed_creations += 1
+                logging.error(f"Creation of {result['name']} failed (status={record['status']}): {record['error']}")
+
     end_wait = datetime.datetime.now()
-    logging.info(f"Had to wait a total of {(end_wait - start_wait).total_seconds():.1f}s to join all the {len(processes)} background processes.")
+    if api:
+        logging.info(f"Had to wait a total of {(end_wait - start_wait).total_seconds():.1f}s for the completion of the {len(schedule_result)} creation requests.")
+    else:
+        logging.info(f"Had to wait a total of {(end_wait - start_wait).total_seconds():.1f}s to join all the {len(processes)} background processes.")
+
+    if not dry_run and schedule_result:
+        _log_submission_drift(schedule_result)
+
+    for result in schedule_result:
+        for key in ("planned", "submitted", "completed"):
+            if key in result:
+                result[key] = datetime.datetime.fromtimestamp(result[key]).isoformat()
 
     schedule_result_dest = ARTIFACT_DIR / f"schedule_result.json"
 
@@ -258,10 +310,26 @@ def main(dry_run=True,
     with open(schedule_result_dest, "w") as f:
         json.dump(schedule_result, f)
 
+    if failed_creations:
+        logging.error(f"{failed_creations} resource creation(s) failed :/")
+        sys.exit(1)
+
     if visualize:
         import visualize_schedule
         visualize_schedule.main(ARTIFACT_DIR, schedule_result)
 
+
+def _log_submission_drift(schedule_result):
+    drifts = []
+    for result in schedule_result:
+        result["submit_drift"] = result["submitted"] - result["planned"]
+        drifts.append(result["submit_drift"])
+
+    drifts.sort()
+    logging.info(f"Submission drift from the schedule plan: median={drifts[len(drifts)//2]:.3f}s "
+                 f"p90={drifts[int(len(drifts)*0.9)]:.3f}s max={drifts[-1]:.3f}s")
+
+
 if __name__ == "__main__":
     try:
         # Print help rather than opening a pager
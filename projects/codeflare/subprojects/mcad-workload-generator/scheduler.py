@@ -6,18 +6,96 @@ import logging
 
 RNG_SEED = np.random.default_rng(123456789)
 
+PHASE_SHAPES = ("ramp", "ramp_down", "plateau", "burst")
+
+# fraction of its phase during which a burst phase creates its instances
+BURST_WIDTH = 0.05
+
+
+def _scale(times, start, end):
+    times = times - times.min()
+    if not times.max():
+        return times + start
+
+    return times * (end/times.max()) + start
+
+
+def load_trace(trace_file):
+    """
+    Loads the arrival times (in seconds, sorted, starting at 0) of a recorded arrival log:
+    - a schedule_result.json file (the `submitted` timestamps, or the planned `delay`s)
+    - a schedule_plan.yaml file (index: time), or a YAML/JSON list of times
+    - a CSV file, with a `timestamp`, `time`, `submitted` or `delay` column (or the first column),
+      in seconds or in ISO format.
+    """
+
+    trace_file = str(trace_file)
+    if trace_file.endswith(".csv"):
+        import csv
+        with open(trace_file) as f:
+            rows = list(csv.DictReader(f))
+        if not rows:
+            raise ValueError(f"{trace_file}: empty trace")
+        column = next((name for name in ("timestamp", "time", "submitted", "delay") if name in rows[0]),
+                      next(iter(rows[0])))
+        values = [row[column] for row in rows if row[column]]
+    else:
+        with open(trace_file) as f:
+            data = yaml.safe_load(f) # also parses JSON
+
+        if isinstance(data, dict):
+            values = list(data.values())
+        elif data and isinstance(data[0], dict):
+            key = "submitted" if "submitted" in data[0] else "delay"
+            values = [entry[key] for entry in data]
+        else:
+            values = data
+
+    if not values:
+        raise ValueError(f"{trace_file}: empty trace")
+
+    try:
+        times = np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        # ISO timestamps (without their timezone suffix, numpy doesn't parse it)
+        times = np.array([str(value).rstrip("Z") for value in values], dtype="datetime64[ns]")
+        times = (times - times.min()) / np.timedelta64(1, "s")
+
+    times = np.sort(times)
+
+    return times - times[0]
+
+
+def parse_phases(phases):
+    """
+    Parses the phases of the composite timeline.
+
+    Args:
+      phases: list of dict(shape=..., duration=..., share=...), or the equivalent
+              'shape:duration:share,...' string, eg: 'ramp:1:1,plateau:3:3,burst:1:2'.
+              The durations and shares are relative to the other phases.
+    """
+
+    if isinstance(phases, str):
+        parsed = []
+        for phase in phases.split(","):
+            shape, duration, share = phase.strip().split(":")
+            parsed.append(dict(shape=shape, duration=float(duration), share=float(share)))
+        phases = parsed
+
+    for phase in phases:
+        if phase["shape"] not in PHASE_SHAPES:
+            raise ValueError(f"Invalid phase shape '{phase['shape']}'. Available shapes: {', '.join(PHASE_SHAPES)}")
+
+    return phases
+
+
 class Timelines:
     # https://arxiv.org/pdf/1607.05356.pdf
     # scale is 1/lamda, or target time between requests
     @staticmethod
     def poisson(n, rng, scale=1.0, t0=0.0, start=0.0, end=60.0):
-        t = t0
-        delays = rng.exponential(scale=scale, size=n)
-        times = []
-        for d in delays:
-            t += d
-            times.append(t)
-        times = np.array(times)
+        times = np.cumsum(rng.exponential(scale=scale, size=n)) + t0
         return times * (end/times.max()) + start
 
     @staticmethod
@@ -43,15 +121,70 @@ class Timelines:
         times = times - times.min()
         return times * (end/times.max()) + start
 
-dry_run_time = 0.0
+    @staticmethod
+    def trace(n, rng, trace_file=None, start=0.0, end=60.0):
+        # replays a recorded arrival log (see load_trace), time-scaled
+        # onto the timespan. When the trace doesn't have n arrivals,
+        # it is resampled through its inverse cumulative distribution,
+        # so that the arrival density keeps the same shape.
+        if trace_file is None:
+            raise ValueError("The trace timeline requires a trace_file")
+
+        times = load_trace(trace_file)
+        if len(times) != n:
+            times = np.interp(np.linspace(0, 1, n), np.linspace(0, 1, len(times)), times)
+
+        return _scale(times, start, end)
+
+    @staticmethod
+    def composite(n, rng, phases="ramp:1:1,plateau:3:3,burst:1:2", start=0.0, end=60.0):
+        # piecewise timeline: each phase gets its share of the n
+        # instances, over its share of the timespan
+        phases = parse_phases(phases)
+
+        durations = np.array([phase["duration"] for phase in phases], dtype=float)
+        shares = np.array([phase["share"] for phase in phases], dtype=float)
+
+        phase_ends = np.cumsum(durations) / durations.sum()
+        phase_starts = np.concatenate(([0.0], phase_ends[:-1]))
+
+        # largest remainder distribution of the instances
+        exact = shares / shares.sum() * n
+        counts = np.floor(exact).astype(int)
+        counts[np.argsort(counts - exact)[:n - counts.sum()]] += 1
+
+        times = []
+        for phase, phase_start, phase_end, count in zip(phases, phase_starts, phase_ends, counts):
+            u = rng.uniform(size=count)
+            if phase["shape"] == "ramp":
+                u = np.sqrt(u) # linearly increasing arrival rate
+            elif phase["shape"] == "ramp_down":
+                u = 1 - np.sqrt(u)
+            elif phase["shape"] == "burst":
+                u = u * phase.get("width", BURST_WIDTH)
+
+            times.append(phase_start + u * (phase_end - phase_start))
+
+        return np.sort(np.concatenate(times)) * end + start
+
+
+def generate(distribution, instances, timespan, rng=RNG_SEED, distribution_args=None):
+    """
+    Generates the times (in seconds) of the instances, with the given Timelines distribution.
+    """
 
-def prepare(method, distribution, timespan, instances, rng_seed=RNG_SEED, dry_run=False, verbose_dry_run=True):
     distribution_func = getattr(Timelines, distribution, None)
     if distribution_func is None:
         raise ValueError(f"Invalid distribution name '{distribution}'. "
                          f"Available names: {', '.join([f for f in dir(Timelines) if not f.startswith('_')])}")
 
-    distributed_times = distribution_func(instances, rng_seed, end=timespan)
+    return distribution_func(instances, rng, end=timespan, **(distribution_args or {}))
+
+
+dry_run_time = 0.0
+
+def prepare(method, distribution, timespan, instances, rng_seed=RNG_SEED, dry_run=False, verbose_dry_run=True, distribution_args=None):
+    distributed_times = generate(distribution, instances, timespan, rng_seed, distribution_args)
 
     def time_monotonic():
         return dry_run_time
@@ -75,3 +208,36 @@ def prepare(method, distribution, timespan, instances, rng_seed=RNG_SEED, dry_ru
         scheduler.enter(delay, 1, method, argument=[index, delay])
 
     return distributed_times, scheduler
+
+
+def main(distribution="poisson", instances=10, timespan=60, dest=None, **distribution_args):
+    """
+    Generates a schedule plan, eg to reproduce a production load pattern with `local_ci run_multi` or the locust tests.
+
+    Args:
+      distribution: the Timelines distribution to use
+      instances: number of instances to schedule
+      timespan: number of seconds over which the instances should be scheduled
+      dest: file where the plan is saved (index: time in seconds), in the schedule_plan.yaml format. Printed if not set.
+      distribution_args: the arguments of the distribution, eg: --trace_file=schedule_result.json or --phases=ramp:1:1,plateau:3:1
+    """
+
+    times = np.sort(generate(distribution, instances, timespan, distribution_args=distribution_args)).tolist()
+    plan = dict(zip(range(len(times)), times))
+
+    if dest is None:
+        print(yaml.dump(plan), end="")
+        return
+
+    logging.info(f"Saving the schedule plan in {dest}")
+    with open(dest, "w") as f:
+        yaml.dump(plan, f)
+
+
+if __name__ == "__main__":
+    import fire
+
+    # Print help rather than opening a pager
+    fire.core.Display = lambda lines, out: print(*lines, file=out)
+
+    fire.Fire(main)
@@ -40,6 +40,14 @@ def main(artifact_dir=pathlib.Path("."), schedule_result=None):
          "scheduling timeline", "timeline",
          artifact_dir)
 
+    if "submit_drift" in df:
+        logging.info("Generating the submission drift ...")
+        save(px.line(df, x="delay", y="submit_drift"),
+             "submission drift", "drift",
+             artifact_dir,
+             "Planned creation time, in seconds",
+             )
+
     logging.info("Generating the distance histogram ...")
     distance_data = []
     current_time = 0
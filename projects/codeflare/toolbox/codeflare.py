@@ -23,6 +23,8 @@ class Codeflare:
                            pod_requests={"cpu": "100m"},
                            timespan=0,
                            distribution="poisson",
+                           distribution_args={},
+                           creation_backend="oc",
                            mcad_namespace="opendatahub",
                            mcad_labels="app=mcad-mcad",
                            mcad_deploy="mcad-controller-mcad",
@@ -43,6 +45,8 @@ class Codeflare:
           aw_count: number of AppWrapper replicas to create
           timespan: number of minutes over which the AppWrappers should be created
           distribution: the distribution method to use to spread the resource creation over the requested timespan
+          distribution_args: the arguments of the distribution method, eg: {trace_file: schedule_result.json} to replay a recorded arrival log, or {phases: 'ramp:1:1,plateau:3:3,burst:1:2'} for the composite timeline
+          creation_backend: 'oc' to create each resource with an `oc create` process, 'api' to create them with a pool of persistent API server connections
           mcad_namespace: namespace where MCAD is deployed
           mcad_labels: labels to find the MCAD controller pods
           mcad_deploy: name of the MCAD controller deployment
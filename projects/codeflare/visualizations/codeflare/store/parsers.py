@@ -6,19 +6,16 @@ import os
 import json
 import datetime
 
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import k8s_parsing, prom_metrics
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store.prom_db as store_prom_db
 
 from . import prom as workload_prom
-from . import k8s_quantity
 
 register_important_file = None # will be when importing store/__init__.py
 
-K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
-K8S_TIME_MILLI_FMT = "%Y-%m-%dT%H:%M:%S.%fZ"
-
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
@@ -152,16 +149,14 @@ def _parse_test_config(dirname):
 
     def get(key, missing=...):
         nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
-
-        match = jsonpath_expression.find(yaml_file)
+        match = jsonpath_cache.find(yaml_file, f'$.{key}')
         if not match:
             if missing != ...:
                 return missing
 
             raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+        return match[0]
 
     test_config.get = get
 
@@ -195,9 +190,9 @@ def _parse_nodes_info(dirname, sutest_cluster=True):
             not node_info.control_plane
 
         node_info.allocatable = types.SimpleNamespace()
-        node_info.allocatable.memory = float(k8s_quantity.parse_quantity(node["status"]["allocatable"]["memory"]))
-        node_info.allocatable.memory = float(k8s_quantity.parse_quantity(node["status"]["allocatable"]["memory"]))
-        node_info.allocatable.cpu = float(k8s_quantity.parse_quantity(node["status"]["allocatable"]["cpu"]))
+        node_info.allocatable.memory = float(k8s_parsing.parse_quantity(node["status"]["allocatable"]["memory"]))
+        node_info.allocatable.memory = float(k8s_parsing.parse_quantity(node["status"]["allocatable"]["memory"]))
+        node_info.allocatable.cpu = float(k8s_parsing.parse_quantity(node["status"]["allocatable"]["cpu"]))
 
         node_info.allocatable.gpu = int(node["status"]["allocatable"].get("nvidia.com/gpu", 0))
         node_info.allocatable.__dict__["nvidia.com/gpu"] = node_info.allocatable.gpu
@@ -224,18 +219,7 @@ def _extract_metrics(dirname):
         "sutest": (str(artifact_paths.CLUSTER_DUMP_PROM_DB_DIR / "prometheus.t*"), workload_prom.get_sutest_metrics()),
     }
 
-    metrics = {}
-    for name, (tarball_glob, metric) in METRICS.items():
-        try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
-        except IndexError:
-            logging.warning(f"No {tarball_glob} in '{dirname}'.")
-            continue
-
-        register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
-
-    return metrics
+    return prom_metrics.extract_metrics(dirname, METRICS, register_important_file)
 
 def _extract_cluster_info(nodes_info):
     cluster_info = types.SimpleNamespace()
@@ -274,15 +258,14 @@ def _parse_pod_times(dirname):
       pod_time.pod_friendly_name = pod_friendly_name
       pod_time.hostname = pod["spec"].get("nodeName")
 
-      pod_time.creation_time = datetime.datetime.strptime(
-              pod["metadata"]["creationTimestamp"], K8S_TIME_FMT)
+      pod_time.creation_time = k8s_parsing.parse_time(pod["metadata"]["creationTimestamp"])
 
       start_time_str = pod["status"].get("startTime")
       pod_time.start_time = None if not start_time_str else \
-          datetime.datetime.strptime(start_time_str, K8S_TIME_FMT)
+          k8s_parsing.parse_time(start_time_str)
 
       for condition in pod["status"].get("conditions", []):
-          last_transition = datetime.datetime.strptime(condition["lastTransitionTime"], K8S_TIME_FMT)
+          last_transition = k8s_parsing.parse_time(condition["lastTransitionTime"])
 
           if condition["type"] == "ContainersReady":
               pod_time.containers_ready = last_transition
@@ -294,9 +277,7 @@ def _parse_pod_times(dirname):
 
       for containerStatus in pod["status"].get("containerStatuses", []):
           try:
-              finishedAt =  datetime.datetime.strptime(
-                  containerStatus["state"]["terminated"]["finishedAt"],
-                  K8S_TIME_FMT)
+              finishedAt =  k8s_parsing.parse_time(containerStatus["state"]["terminated"]["finishedAt"])
           except KeyError: continue
 
           # take the last container_finished found
@@ -327,8 +308,7 @@ def _parse_resource_times(dirname):
             metadata = item["metadata"]
 
             kind = item["kind"]
-            creationTimestamp = datetime.datetime.strptime(
-                metadata["creationTimestamp"], K8S_TIME_FMT)
+            creationTimestamp = k8s_parsing.parse_time(metadata["creationTimestamp"])
 
             name = metadata["name"]
             generate_name, found, suffix = name.rpartition("-")
@@ -346,9 +326,7 @@ def _parse_resource_times(dirname):
                 resource_times.aw_conditions = {}
 
                 if "annotations" in item["metadata"] and "scheduleTime" in item["metadata"]["annotations"]:
-                    resource_times.aw_conditions["OC Created"] = datetime.datetime.strptime(
-                        item["metadata"]["annotations"]["scheduleTime"],
-                        K8S_TIME_FMT)
+                    resource_times.aw_conditions["OC Created"] = k8s_parsing.parse_time(item["metadata"]["annotations"]["scheduleTime"])
 
                 elif not missing_label_warning_printed:
                     missing_label_warning_printed = True
@@ -360,31 +338,23 @@ def _parse_resource_times(dirname):
                 if not item.get("status"): continue
 
                 if "controllerfirsttimestamp" in item["status"]:
-                    resource_times.aw_conditions["Discovered"] = datetime.datetime.strptime(
-                        item["status"]["controllerfirsttimestamp"],
-                        K8S_TIME_MILLI_FMT)
+                    resource_times.aw_conditions["Discovered"] = k8s_parsing.parse_time(item["status"]["controllerfirsttimestamp"])
 
                 for condition in item["status"].get("conditions", []):
                     if condition.get("reason") != "PodsCompleted": continue
                     if condition.get("status") != "True": continue
                     if condition.get("type") != "Completed": continue
                     resource_times.completion = \
-                        datetime.datetime.strptime(
-                            condition["lastUpdateMicroTime"],
-                            K8S_TIME_MILLI_FMT)
+                        k8s_parsing.parse_time(condition["lastUpdateMicroTime"])
                     break
 
                 for condition in item["status"]["conditions"]:
                     resource_times.aw_conditions[condition["type"]] = \
-                        datetime.datetime.strptime(
-                            condition["lastUpdateMicroTime"],
-                            K8S_TIME_MILLI_FMT)
+                        k8s_parsing.parse_time(condition["lastUpdateMicroTime"])
 
             elif kind == "Job":
                 resource_times.completion = \
-                    datetime.datetime.strptime(
-                        item["status"].get("completionTime"),
-                        K8S_TIME_FMT) \
+                    k8s_parsing.parse_time(item["status"].get("completionTime")) \
                         if item["status"].get("completionTime") else None
             else:
                 logging.Warning(f"Completion time parsing not supported for resource type {kind}.")
@@ -405,9 +375,7 @@ def _parse_test_start_end_time(dirname):
 
     for cm in start_end_cm["items"]:
         name = cm["metadata"]["name"]
-        ts = datetime.datetime.strptime(
-            cm["metadata"]["creationTimestamp"],
-            K8S_TIME_FMT)
+        ts = k8s_parsing.parse_time(cm["metadata"]["creationTimestamp"])
         test_start_end_time.__dict__[name] = ts
 
     logging.debug(f'Start time: {test_start_end_time.start}')
@@ -426,9 +394,7 @@ def _parse_cleanup_start_end_time(dirname):
 
     for cm in configmaps["items"]:
         name = cm["metadata"]["name"]
-        ts = datetime.datetime.strptime(
-            cm["metadata"]["creationTimestamp"],
-            K8S_TIME_FMT)
+        ts = k8s_parsing.parse_time(cm["metadata"]["creationTimestamp"])
         cleanup_times.__dict__[name] = ts
 
     logging.debug(f'Start time: {cleanup_times.start}')
@@ -1,8 +1,12 @@
 import sys, os
 import yaml
 import io
+import json
+import copy
+import hashlib
 import logging
 import traceback
+import threading
 
 import jinja2
 import jinja2.filters
@@ -47,65 +51,19 @@ class From_Config:
             logging.error("--command_args_file flag or CI_ARTIFACTS_FROM_COMMAND_ARGS_FILE env var must have a value.")
             raise SystemExit(1)
 
-        import topsail
-        toolbox = topsail.Toolbox()
-
-        with open(config_file) as f:
-            config = yaml.safe_load(f)
-
-        with open(command_args_file) as f:
-            # parse the file as yaml and dump it a string,
-            # to resolve yaml aliases
-            command_args = f.read()
-
-        def raise_exception(msg):
-            raise Exception(msg)
-
-        @jinja2.filters.pass_environment
-        def or_env(environment, value, attribute=None):
-            if value:
-                return value
-
-            if not attribute:
-                logging.error("An attribute must be passed to env_override ...")
-                raise SystemExit(1)
-
-            return os.getenv(attribute)
-
-        jinja2.filters.FILTERS["or_env"] = or_env
-        jinja2.filters.FILTERS["raise_exception"] = raise_exception
-
-        command_args_tpl = jinja2.Template(command_args)
         try:
-            command_args_rendered = command_args_tpl.render(config)
-        except jinja2.exceptions.UndefinedError as e:
-            template_frame = traceback.extract_tb(e.__traceback__)[-2]
-            if template_frame.filename != "<template>":
-                raise e
-            msg = f"Error at line {template_frame.lineno} of file {command_args_file}: {e.message}"
-            logging.error("Failed to render the Jinja template.")
-            logging.error(msg)
-            raise jinja2.exceptions.UndefinedError(msg)
-
-        if group == "dump" and command == "config":
-            print(command_args_rendered)
-            raise SystemExit(0)
-
-        command_args = yaml.safe_load(command_args_rendered)
-
-        command_key = f"{group} {command}"
-        if prefix:
-            command_key = f"{prefix}/{command_key}"
-        if suffix:
-            command_key = f"{command_key}/{suffix}"
+            if group == "dump" and command == "config":
+                print(render_command_args(command_args_file, config_file=config_file))
+                raise SystemExit(0)
 
-        try:
-            command_args = command_args[command_key].copy()
-        except KeyError:
-            logging.error(f"key '{command_key}' not found. Available keys: \n- "
-                          + "\n- ".join(sorted(command_args.keys())))
+            command_args = get_command_args(group, command, prefix, suffix,
+                                            config_file=config_file, command_args_file=command_args_file)
+        except KeyError as e:
+            logging.error(e.args[0])
             raise SystemExit(1)
 
+        command_key = _get_command_key(group, command, prefix, suffix)
+
         if not isinstance(extra, dict):
             logging.error(f"--extra must be a dictionnary. Got '{extra}', type '{extra.__class__.__name__}'.")
             raise SystemExit(1)
@@ -128,6 +86,9 @@ class From_Config:
             if key.startswith("_"):
                 del command_args[key]
 
+        import topsail
+        toolbox = topsail.Toolbox()
+
         group_obj = getattr(toolbox, group)
         command_obj = getattr(group_obj, command.replace("-", "_"))
 
@@ -143,4 +104,167 @@ class From_Config:
         return run_ansible_role
 
 
+# in-process resolution of the command arguments, without going
+# through `run_toolbox.py`. The compiled template and the rendered
+# result are cached, keyed on the content hash of the files/config.
+
+RENDERED_CACHE_SIZE = 16
+
+_template_cache = {} # command_args_file -> (template_hash, jinja2.Template)
+_rendered_cache = {} # (template_hash, config_hash) -> dict(env_lookups, rendered, parsed)
+
+
+_render_lock = threading.Lock()
+_env_lookups = None # env vars read by the template during the current rendering
+
+
+def _raise_exception(msg):
+    raise Exception(msg)
+
+
+@jinja2.filters.pass_environment
+def _or_env(environment, value, attribute=None):
+    if value:
+        return value
+
+    if not attribute:
+        logging.error("An attribute must be passed to env_override ...")
+        raise SystemExit(1)
+
+    _env_lookups[attribute] = os.getenv(attribute)
+
+    return _env_lookups[attribute]
+
+
+_jinja_env = jinja2.Environment()
+_jinja_env.filters["or_env"] = _or_env
+_jinja_env.filters["raise_exception"] = _raise_exception
+
+
+def _get_command_key(group, command, prefix="", suffix=""):
+    command_key = f"{group} {command}"
+    if prefix:
+        command_key = f"{prefix}/{command_key}"
+    if suffix:
+        command_key = f"{command_key}/{suffix}"
+
+    return command_key
+
+
+def _hash_config(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _load_config(config_file):
+    with open(config_file) as f:
+        return yaml.safe_load(f)
+
+
+def _get_template(command_args_file):
+    with open(command_args_file, "rb") as f:
+        command_args = f.read()
+
+    template_hash = hashlib.sha256(command_args).hexdigest()
+
+    cached = _template_cache.get(str(command_args_file))
+    if cached and cached[0] == template_hash:
+        return template_hash, cached[1]
+
+    template = _jinja_env.from_string(command_args.decode("utf8"))
+    _template_cache[str(command_args_file)] = (template_hash, template)
+
+    return template_hash, template
+
+
+def _render(command_args_file, config):
+    with _render_lock:
+        return _render_locked(command_args_file, config)
+
+
+def _render_locked(command_args_file, config):
+    global _env_lookups
+
+    template_hash, command_args_tpl = _get_template(command_args_file)
+    key = (template_hash, _hash_config(config))
+
+    cached = _rendered_cache.get(key)
+    # the template may read environment variables with `or_env`,
+    # make sure that they did not change since the rendering.
+    if cached and all(os.getenv(k) == v for k, v in cached["env_lookups"].items()):
+        return cached
+
+    _env_lookups = env_lookups = {}
+
+    try:
+        command_args_rendered = command_args_tpl.render(config)
+    except jinja2.exceptions.UndefinedError as e:
+        template_frame = traceback.extract_tb(e.__traceback__)[-2]
+        if template_frame.filename != "<template>":
+            raise e
+        msg = f"Error at line {template_frame.lineno} of file {command_args_file}: {e.message}"
+        logging.error("Failed to render the Jinja template.")
+        logging.error(msg)
+        raise jinja2.exceptions.UndefinedError(msg)
+
+    while len(_rendered_cache) >= RENDERED_CACHE_SIZE:
+        del _rendered_cache[next(iter(_rendered_cache))] # evict the oldest entry
+
+    _rendered_cache[key] = entry = dict(env_lookups=env_lookups, rendered=command_args_rendered, parsed=None)
+
+    return entry
+
+
+def render_command_args(command_args_file, config=None, config_file=None):
+    """
+    Renders the command arguments template with the given configuration.
+
+    Args:
+      command_args_file: Command argument configuration file (Jinja template).
+      config: Configuration dictionnary. Takes precedence over config_file.
+      config_file: Configuration file from which the parameters will be looked up.
+    """
+
+    if config is None:
+        config = _load_config(config_file)
+
+    return _render(command_args_file, config)["rendered"]
+
+
+def get_command_args(group, command, prefix="", suffix="", config=None, config_file=None, command_args_file=None):
+    """
+    Resolves the arguments of a toolbox command from the configuration, in-process.
+
+    Args:
+      group: Group from which the command belongs.
+      command: Command to call, within the group.
+      prefix: Prefix to apply to the role name to lookup the command options.
+      suffix: Suffix to apply to the role name to lookup the command options.
+      config: Configuration dictionnary. Takes precedence over config_file.
+      config_file: Configuration file from which the parameters will be looked up.
+      command_args_file: Command argument configuration file (Jinja template).
+
+    Returns:
+      A copy of the command arguments dictionnary.
+
+    Raises:
+      KeyError: if the command key isn't defined in the command arguments file.
+    """
+
+    if config is None:
+        config = _load_config(config_file)
+
+    entry = _render(command_args_file, config)
+    if entry["parsed"] is None:
+        entry["parsed"] = yaml.safe_load(entry["rendered"])
+
+    command_args = entry["parsed"]
+    command_key = _get_command_key(group, command, prefix, suffix)
+
+    try:
+        return copy.deepcopy(command_args[command_key])
+    except KeyError:
+        raise KeyError(f"key '{command_key}' not found. Available keys: \n- "
+                       + "\n- ".join(sorted(command_args.keys())))
+
+
 __entrypoint = From_Config.run
@@ -211,7 +211,7 @@ def run_one():
             try: run_one_test(*args, **kwargs)
             finally: sync_file.touch()
 
-        with run.Parallel("test_and_watch_failures", dedicated_dir=False) as parallel:
+        with run.Parallel("test_and_watch_failures", dedicated_dir=False, drain_on_exception=False) as parallel:
             parallel.delayed(test_and_mark_as_done, namespace, job_index)
             parallel.delayed(watch_failures, namespace)
 
@@ -55,17 +55,15 @@ def _get_test_details(entry, args):
     llm_data = entry.results.llm_load_test_output
 
     errorDistribution = defaultdict(int)
-    success_count = 0
+    success_count = len(entry.results.llm_calls)
     for idx, block in enumerate(llm_data):
-        error_count = 0
         for descr, count in block.get("errorDistribution", {}).items():
             simplified_error = simplify_error(descr)
             if not simplified_error:
                 continue
 
             errorDistribution[simplified_error] += count
-            error_count += count
-        success_count += len(block["details"]) - error_count
+            success_count -= count
     errorDistribution["success"] = success_count
 
     header += report.Plot_and_Text(f"Latency details", report.set_config(dict(show_errors=True, entry=entry), args))
@@ -90,17 +88,15 @@ def _get_error_overview(entries, args):
     errorDistribution = defaultdict(int)
     for entry in entries:
         llm_data = entry.results.llm_load_test_output
-        success_count = 0
+        success_count = len(entry.results.llm_calls)
         for idx, block in enumerate(llm_data):
-            error_count = 0
             for descr, count in block.get("errorDistribution", {}).items():
                 simplified_error = simplify_error(descr)
                 if not simplified_error:
                     continue
 
                 errorDistribution[simplified_error] += count
-                error_count += count
-            success_count += len(block["details"]) - error_count
+                success_count -= count
         errorDistribution[entry.get_name(variables)] = success_count
 
     graph_text = report.Plot_and_Text(f"Errors distribution", args)
@@ -99,12 +99,10 @@ def generateSuccesssCount(entries, variables):
     for entry in entries:
         llm_data = entry.results.llm_load_test_output
 
-        success_count = 0
+        success_count = len(entry.results.llm_calls)
         for idx, block in enumerate(llm_data):
-            error_count = 0
             for descr, count in block.get("errorDistribution", {}).items():
-                error_count += count
-            success_count += len(block["details"]) - error_count
+                success_count -= count
         data.append(dict(
             test_name=entry.get_name(variables),
             count=success_count,
@@ -134,17 +132,10 @@ def generateFinishReasonData(entries, variables):
     data = []
 
     for entry in entries:
-        llm_data = entry.results.llm_load_test_output
+        calls = entry.results.llm_calls.to_pandas(["error", "finish_reason"])
 
-        finishReasons = defaultdict(int)
-        for idx, block in enumerate(llm_data):
-            for detail in block.get("details"):
-                if detail["error"]:
-                    reason = "ERROR"
-                else:
-                    reason = detail["response"].get("finishReason", "ERROR")
-                pass
-                finishReasons[reason] += 1
+        reasons = calls.finish_reason.astype(object).where(calls.error == "", "ERROR").fillna("ERROR")
+        finishReasons = reasons.value_counts(sort=False)
 
         for reason, count in finishReasons.items():
             datum = {}
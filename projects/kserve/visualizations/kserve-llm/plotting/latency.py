@@ -5,8 +5,6 @@ import datetime
 import math
 import copy
 
-import statistics as stats
-
 import plotly.graph_objs as go
 import pandas as pd
 import plotly.express as px
@@ -15,6 +13,8 @@ from dash import html
 import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
+from topsail.visualizations import distribution_stats
+
 from . import error_report, report
 
 def register():
@@ -83,68 +83,36 @@ class LatencyDistribution():
                     plot.visible = "legendonly"
 
         msg = []
-        for test_fullname in df.sort_values(by=["test_fullname"]).test_fullname.unique() if cfg__show_text else []:
-            stats_data = df[df.test_fullname == test_fullname][y_key]
+        if cfg__only_tokens:
+            label = "of the calls contained less than"
+            fmt = distribution_stats.value_formatter("tokens")
+        else:
+            label = "of the calls performed faster than"
+            fmt = distribution_stats.value_formatter("ms/token")
 
+        for test_fullname, test_stats in distribution_stats.describe_groups(df, "test_fullname", y_key).iterrows() if cfg__show_text else []:
             msg += [html.H3(test_fullname)]
-            q0 = stats_data.min()
-            q100 = stats_data.max()
-            q1, med, q3 = stats.quantiles(stats_data)
-            q90 = stats.quantiles(stats_data, n=10)[8] # 90th percentile
-            if cfg__only_tokens:
-                label = "the calls contained less than"
-                unit = "tokens"
-            else:
-                label = "the calls performed faster than"
-                unit = "ms/token"
-
-            msg.append(f"0% of {label} {q0:.0f} {unit} [min]")
-            msg.append(html.Br())
-            msg.append(f"25% of {label} {q1:.0f} {unit} [Q1]")
-            msg.append(html.Br())
-            msg.append(f"50% of {label} {med:.0f} {unit} (+ {med-q1:.0f} {unit}) [median]")
-            msg.append(html.Br())
-            msg.append(f"75% of {label} {q3:.0f} {unit} (+ {q3-med:.0f} {unit}) [Q3]")
-            msg.append(html.Br())
-            msg.append(f"90% of {label} {q90:.0f} {unit} (+ {q90-q3:.0f} {unit}) [90th quantile]")
-            msg.append(html.Br())
-            msg.append(f"100% of {label} {q100:.0f} {unit} (+ {q100-q90:.0f} {unit}) [max]")
-            msg.append(html.Br())
-            msg.append(html.Br())
-            msg.append(f"There are {len(stats_data)} recorded calls.")
-            msg.append(html.Br())
-            msg.append(f"The median is {med:.0f} {unit}.")
-            msg.append(html.Br())
-            q3_q1 = q3 - q1
-            msg.append(f"There are {q3_q1:.0f} {unit} between Q1 and Q3 ({q3_q1/med*100:.1f}% of the median).")
-            msg.append(html.Br())
-            q100_q0 = q100 - q0
-            msg.append(f"There are {q100 - q0:.0f} {unit} between min and max ({q100_q0/med*100:.1f}% of the median).")
+            msg += distribution_stats.quantiles_summary(test_stats, label, fmt)
             msg.append(html.Br())
+            msg += distribution_stats.spread_summary(test_stats, fmt, "recorded calls")
 
         return fig, msg
 
 
 def plotCustomComparison(df, x, y):
     fig = go.Figure()
-    data_whatxy = defaultdict(dict)
-
-    for x_value in df[x].unique():
-        df_x_value = df[df[x] == x_value]
-        y_min = df_x_value[y].min()
-        y_max = df_x_value[y].max()
-        q1, median, q3 = stats.quantiles(df_x_value[y])
 
-        q90 = stats.quantiles(df_x_value[y], n=10)[8] # 90th percentile
-        q99 = stats.quantiles(df_x_value[y], n=100)[98] # 99th percentile
+    x_stats = distribution_stats.describe_groups(df, x, y, sort=False)
 
-        data_whatxy["max"][x_value] = y_max
-        data_whatxy["99th percentile"][x_value] = q99
-        data_whatxy["90th percentile"][x_value] = q90
-        data_whatxy["Q3 (75%)"][x_value] = q3
-        data_whatxy["median (50%)"][x_value] = median
-        data_whatxy["Q1 (25%)"][x_value] = q1
-        data_whatxy["min"][x_value] = y_min
+    data_whatxy = {}
+    for legend_name, stat in (("max", "max"),
+                              ("99th percentile", "p99"),
+                              ("90th percentile", "p90"),
+                              ("Q3 (75%)", "q3"),
+                              ("median (50%)", "median"),
+                              ("Q1 (25%)", "q1"),
+                              ("min", "min")):
+        data_whatxy[legend_name] = x_stats[stat].to_dict()
 
     all_x_values = set()
     all_y_values = []
@@ -174,50 +142,52 @@ def generateLatencyDetailsData(entries, _variables, only_errors=False, test_name
         has_multiple_modes = False
 
     for entry in entries:
-        llm_data = entry.results.llm_load_test_output
-        for idx, block in enumerate(llm_data):
-            for detail in block["details"]:
-                if only_errors and not detail.get("error"):
-                    continue # in this plot, ignore the latency if no error occured
-                if not show_errors and detail.get("error"):
-                    continue
+        # the calls are memory-mapped from the columnar storage of the store
+        df = entry.results.llm_calls.to_pandas(["timestamp", "tokens", "latency", "error"])
 
-                datum = {}
+        failed = df.error != ""
+        if only_errors:
+            df = df[failed] # in this plot, ignore the latency if no error occured
+        elif not show_errors:
+            df = df[~failed]
 
-                datum["timestamp"] = detail["timestamp"]
+        if df.empty:
+            continue
 
-                generatedTokens = int(detail["response"].get("generatedTokens", 1))
-                datum["tokens"] = generatedTokens
+        failed = df.error != ""
+        datum = pd.DataFrame(index=df.index)
 
-                datum["latencyPerToken"] = detail["latency"] / 1000 / 1000 / generatedTokens # in ms/token
-                datum["latency"] = detail["latency"] / 1000 / 1000
+        datum["timestamp"] = df.timestamp
+        datum["tokens"] = df.tokens
 
-                datum["model_name"] = (f"{entry.settings.model_name}<br>"+entry.get_name([v for v in variables if v not in ("index", "mode", "model_name")]).replace(", ", "<br>")).removesuffix("<br>")
+        datum["latencyPerToken"] = df.latency / 1000 / 1000 / df.tokens # in ms/token
+        datum["latency"] = df.latency / 1000 / 1000
 
-                if has_multiple_modes:
-                    datum["model_name"] += f"<br>{entry.settings.mode.title()}"
+        datum["model_name"] = (f"{entry.settings.model_name}<br>"+entry.get_name([v for v in variables if v not in ("index", "mode", "model_name")]).replace(", ", "<br>")).removesuffix("<br>")
 
-                if collapse_index:
-                    datum["test_name"] = entry.get_name(v for v in variables if v != "index").replace(", ", "<br>")
-                elif test_name_by_error:
-                    simplified_error = datum["test_name"] = error_report.simplify_error(detail.get("error"))
-                    if not simplified_error: continue
+        if has_multiple_modes:
+            datum["model_name"] += f"<br>{entry.settings.mode.title()}"
 
-                elif detail.get("error"):
-                    datum["test_name"] = "errors"
-                    datum["latency"] = -1
-                else:
-                    datum["test_name"] = entry.get_name(variables).replace(", ", "<br>")
+        if collapse_index:
+            datum["test_name"] = entry.get_name(v for v in variables if v != "index").replace(", ", "<br>")
+        elif test_name_by_error:
+            # simplify_error is called once per distinct error
+            datum["test_name"] = df.error.map(error_report.simplify_error).astype(object)
+            datum = datum[datum.test_name.notna() & (datum.test_name != "")]
+        else:
+            datum["test_name"] = entry.get_name(variables).replace(", ", "<br>")
+            datum.loc[failed, "test_name"] = "errors"
+            datum.loc[failed, "latency"] = -1
 
-                datum["error"] = detail.get("error", "no error")
+        datum["error"] = df.error.astype(object).where(df.error != "", "no error")
 
-                datum["test_fullname"] = entry.get_name([v for v in variables if v != "index"] if collapse_index else variables)
-                if has_multiple_modes:
-                    datum["test_fullname"] += f" {entry.settings.mode.title()}"
+        datum["test_fullname"] = entry.get_name([v for v in variables if v != "index"] if collapse_index else variables)
+        if has_multiple_modes:
+            datum["test_fullname"] += f" {entry.settings.mode.title()}"
 
-                data.append(datum)
+        data.append(datum)
 
-    return data
+    return pd.concat(data, ignore_index=True) if data else pd.DataFrame()
 
 
 class LatencyDetails():
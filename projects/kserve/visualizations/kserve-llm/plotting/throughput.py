@@ -34,9 +34,6 @@ def generateThroughputData(entries, _variables):
         has_multiple_modes = False
 
     for entry in entries:
-        llm_data = entry.results.llm_load_test_output
-        generatedTokens = 0
-
         datum = {}
         datum["model_name"] = (f"{entry.settings.model_name}<br>"+entry.get_name([v for v in variables if v not in ("index", "mode", "model_name")]).replace(", ", "<br>")).removesuffix("<br>")
         datum["test_name"] = entry.get_name(variables).replace(", ", "<br>").replace("model_name=", "")
@@ -49,13 +46,10 @@ def generateThroughputData(entries, _variables):
         else:
             datum["test_name:sort_index"] = datum["test_name"]
 
-        calls_count = 0
-        latency_s = 0.0
-        for idx, block in enumerate(llm_data):
-            for detail in block["details"]:
-                generatedTokens += int(detail["response"].get("generatedTokens", 1))
-                calls_count += 1
-                latency_s += detail["latency"] / 1000 / 1000 / 1000
+        calls = entry.results.llm_calls
+        calls_count = len(calls)
+        generatedTokens = int(calls.column("tokens").sum())
+        latency_s = calls.column("latency").sum() / 1000 / 1000 / 1000
 
         duration = (entry.results.test_start_end.end-entry.results.test_start_end.start).total_seconds()
         datum["duration"] = int(duration)
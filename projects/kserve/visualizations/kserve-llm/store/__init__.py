@@ -11,6 +11,7 @@ import matrix_benchmarking.store.simple as store_simple
 
 from . import parsers
 from . import lts_parser
+from . import llm_calls
 
 CACHE_FILENAME = "cache.pickle"
 
@@ -36,7 +37,7 @@ def is_important_file(filename):
 
 
 def is_cache_file(filename):
-    return filename.name == CACHE_FILENAME
+    return filename.name in (CACHE_FILENAME, llm_calls.CALLS_FILENAME)
 
 
 def resolve_artifact_dirnames(dirname, artifact_dirnames):
@@ -0,0 +1,166 @@
+import logging
+
+import numpy as np
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+from topsail.visualizations import k8s_parsing
+
+# Columnar storage of the llm-load-test calls.
+#
+# The ghz-multiplexed-results files contain one `details` entry per
+# call. Long runs have millions of calls, so instead of keeping them
+# as a list of dicts, they are stored in a typed table, one row per
+# call. The table is saved next to the cache file, in the Arrow IPC
+# format, and memory-mapped when the plots need it.
+#
+# Without pyarrow, the table is kept in memory (and in the cache file).
+
+CALLS_FILENAME = "llm_calls.arrow"
+
+# the string columns are dictionary-encoded (they have only a few distinct values)
+STRING_COLUMNS = ("error", "finish_reason")
+
+# the columns: block index, call timestamp (UTC), latency (in ns), generated tokens,
+# error ("" if the call succeeded) and finish reason
+COLUMNS = ("block", "timestamp", "latency", "tokens") + STRING_COLUMNS
+
+
+def build_calls(llm_load_test_output):
+    """
+    Builds the table of the calls from the blocks of the ghz results files.
+    The `details` entries are removed from the blocks.
+    """
+
+    blocks = []
+    timestamps = []
+    latencies = []
+    tokens = []
+    errors = []
+    finish_reasons = []
+
+    for idx, block in enumerate(llm_load_test_output):
+        for detail in block.pop("details", []):
+            response = detail.get("response") or {}
+
+            blocks.append(idx)
+            timestamps.append(detail["timestamp"])
+            latencies.append(detail["latency"])
+            tokens.append(int(response.get("generatedTokens", 1)))
+            errors.append(detail.get("error") or "")
+            finish_reasons.append(response.get("finishReason"))
+
+    return LlmCalls(dict(
+        block=np.array(blocks, dtype=np.int32),
+        timestamp=k8s_parsing.parse_times(timestamps, unit="ns"),
+        latency=np.array(latencies, dtype=np.int64),
+        tokens=np.array(tokens, dtype=np.int64),
+        error=np.array(errors, dtype=object),
+        finish_reason=np.array(finish_reasons, dtype=object),
+    ))
+
+
+class LlmCalls(object):
+    """
+    Table of the llm-load-test calls, one row per call.
+
+    Once saved, only the location of the table is pickled, and the
+    table is memory-mapped from the Arrow file when it is accessed.
+    """
+
+    def __init__(self, columns, dirname=None):
+        self._columns = columns
+        self._table = None
+        self.dirname = dirname
+        self.saved = False
+
+    def save(self, dirname):
+        """
+        Saves the table in the Arrow IPC format, in dirname.
+
+        Returns:
+          True if the table has been saved, False if pyarrow isn't available.
+        """
+
+        self.dirname = dirname
+
+        if pyarrow is None:
+            logging.warning("pyarrow not available, keeping the llm-load-test calls in memory.")
+            return False
+
+        table = self._to_arrow(self._columns)
+        with pyarrow.OSFile(str(dirname / CALLS_FILENAME), "wb") as sink:
+            with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        self.saved = True
+
+        return True
+
+    @staticmethod
+    def _to_arrow(columns):
+        return pyarrow.table({
+            name: (pyarrow.array(columns[name], type=pyarrow.string()).dictionary_encode()
+                   if name in STRING_COLUMNS else pyarrow.array(columns[name]))
+            for name in COLUMNS
+        })
+
+    @property
+    def table(self):
+        """
+        The calls, as a (memory-mapped) pyarrow Table.
+        """
+
+        if self._table is None:
+            if self.saved:
+                source = pyarrow.memory_map(str(self.dirname / CALLS_FILENAME), "r")
+                self._table = pyarrow.ipc.open_file(source).read_all()
+            else:
+                self._table = self._to_arrow(self._columns)
+
+        return self._table
+
+    def __len__(self):
+        return len(self.table) if self.saved else len(self._columns["block"])
+
+    def column(self, name):
+        """
+        Returns a column of the table, as a numpy array.
+        """
+
+        if not self.saved:
+            return self._columns[name]
+
+        column = self.table.column(name)
+        if name in STRING_COLUMNS:
+            return np.array(column.to_pylist(), dtype=object)
+
+        return column.to_numpy()
+
+    def to_pandas(self, columns=COLUMNS):
+        """
+        Returns the given columns of the table, as a pandas DataFrame.
+        The string columns are categorical.
+        """
+
+        import pandas as pd
+
+        if self.saved:
+            return self.table.select(list(columns)).to_pandas()
+
+        return pd.DataFrame({
+            name: (pd.Categorical(self._columns[name]) if name in STRING_COLUMNS else self._columns[name])
+            for name in columns
+        })
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_table"] = None
+        if self.saved:
+            state["_columns"] = None # reloaded from the Arrow file
+
+        return state
@@ -32,15 +32,10 @@ def generate_lts_payload(results, lts_results, import_settings, must_validate=Fa
 
 
 def _generate_throughput(results):
-    generated_tokens = 0
+    calls = results.llm_calls
+    succeeded = calls.column("error") == "" # ignore the calls where an error occured
 
-    llm_data = results.llm_load_test_output
-    for idx, block in enumerate(llm_data):
-        for detail in block["details"]:
-            if detail.get("error"):
-                continue # in this plot, ignore the latency if an error occured
-
-            generated_tokens += int(detail["response"]["generatedTokens"])
+    generated_tokens = int(calls.column("tokens")[succeeded].sum())
 
     duration_s = (results.test_start_end.end - results.test_start_end.start).total_seconds()
 
@@ -48,19 +43,13 @@ def _generate_throughput(results):
 
 
 def _generate_time_per_output_token(results):
-    time_per_output_token = []
-
-    llm_data = results.llm_load_test_output
-    for idx, block in enumerate(llm_data):
-        for detail in block["details"]:
-            if detail.get("error"):
-                continue # in this plot, ignore the latency if an error occured
+    calls = results.llm_calls
+    succeeded = calls.column("error") == "" # ignore the latency if an error occured
 
-            generated_tokens = int(detail["response"]["generatedTokens"])
-            latency_ms = detail["latency"] / 1000 / 1000
-            time_per_output_token.append(latency_ms / generated_tokens)
+    latency_ms = calls.column("latency")[succeeded] / 1000 / 1000
+    time_per_output_token = latency_ms / calls.column("tokens")[succeeded]
 
-    return time_per_output_token
+    return time_per_output_token.tolist()
 
 
 def _generate_time_to_first_token(results):
@@ -10,17 +10,18 @@ import dateutil.parser
 import urllib.parse
 import uuid
 
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import k8s_parsing
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store.prom_db as store_prom_db
 
 from . import prom as workload_prom
+from . import llm_calls
 
 
 register_important_file = None # will be when importing store/__init__.py
 
-K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
@@ -57,12 +58,20 @@ def _parse_always(results, dirname, import_settings):
     results.from_local_env = _parse_local_env(dirname)
     results.test_config = _parse_test_config(dirname)
 
+    if hasattr(results, "llm_calls"):
+        # the results directory may have been moved since the cache file was generated
+        results.llm_calls.dirname = dirname
+    elif hasattr(results, "llm_load_test_output"):
+        # cache file generated before the columnar storage of the calls
+        results.llm_calls = _parse_llm_calls(dirname, results.llm_load_test_output)
+
 
 def _parse_once(results, dirname):
     results.llm_load_test_output = _parse_llm_load_test_output(dirname)
+    results.llm_calls = _parse_llm_calls(dirname, results.llm_load_test_output)
     results.predictor_logs = _parse_predictor_logs(dirname)
     results.predictor_pod = _parse_predictor_pod(dirname)
-    results.test_start_end = _parse_test_start_end(dirname, results.llm_load_test_output)
+    results.test_start_end = _parse_test_start_end(dirname, results.llm_load_test_output, results.llm_calls)
     results.ocp_version = _parse_ocp_version(dirname)
     results.rhods_info = _parse_rhods_info(dirname)
     results.test_uuid = _parse_test_uuid(dirname)
@@ -132,16 +141,14 @@ def _parse_test_config(dirname):
 
     def get(key, missing=...):
         nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
-
-        match = jsonpath_expression.find(yaml_file)
+        match = jsonpath_cache.find(yaml_file, f'$.{key}')
         if not match:
             if missing != ...:
                 return missing
 
             raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+        return match[0]
 
     test_config.get = get
 
@@ -162,6 +169,13 @@ def _parse_llm_load_test_output(dirname):
     return llm_load_test_output
 
 
+def _parse_llm_calls(dirname, llm_load_test_output):
+    calls = llm_calls.build_calls(llm_load_test_output or [])
+    calls.save(dirname)
+
+    return calls
+
+
 @ignore_file_not_found
 def _parse_predictor_pod(dirname):
     if not artifact_paths.KSERVE_CAPTURE_STATE:
@@ -193,15 +207,13 @@ def _parse_predictor_pod(dirname):
     condition_times = {}
     for condition in pod["status"]["conditions"]:
         condition_times[condition["type"]] = \
-            datetime.datetime.strptime(
-                condition["lastTransitionTime"], K8S_TIME_FMT)
+            k8s_parsing.parse_time(condition["lastTransitionTime"])
 
     containers_start_time = {}
     for container_status in pod["status"]["containerStatuses"]:
         try:
             containers_start_time[container_status["name"]] = \
-                datetime.datetime.strptime(
-                    container_status["state"]["running"]["startedAt"], K8S_TIME_FMT)
+                k8s_parsing.parse_time(container_status["state"]["running"]["startedAt"])
         except KeyError: pass # container not running
 
 
@@ -238,16 +250,16 @@ def _parse_predictor_logs(dirname):
     return predictor_logs
 
 
-def _parse_test_start_end(dirname, llm_load_test_output):
+def _parse_test_start_end(dirname, llm_load_test_output, calls):
     test_start_end = types.SimpleNamespace()
     test_start_end.start = None
     test_start_end.end = None
 
-    for entry in llm_load_test_output:
-        start = dateutil.parser.isoparse(entry["details"][0]["timestamp"])
-        if test_start_end.start is None or start < test_start_end.start:
-            test_start_end.start = start
+    if len(calls):
+        start = calls.column("timestamp").min().astype("datetime64[us]").item()
+        test_start_end.start = start.replace(tzinfo=datetime.timezone.utc)
 
+    for entry in llm_load_test_output:
         end = dateutil.parser.isoparse(entry["date"])
         if test_start_end.end is None or end > test_start_end.end:
             test_start_end.end = end
@@ -285,7 +297,7 @@ def _parse_rhods_info(dirname):
         rhods_info.createdAt_raw = f.read().strip()
 
     try:
-        rhods_info.createdAt = datetime.datetime.strptime(rhods_info.createdAt_raw, K8S_TIME_FMT)
+        rhods_info.createdAt = k8s_parsing.parse_time(rhods_info.createdAt_raw)
     except ValueError as e:
         logging.error("Couldn't parse RHODS version timestamp: {e}")
         rhods_info.createdAt = None
@@ -8,7 +8,8 @@ import datetime
 import dateutil.parser
 import uuid
 
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import prom_metrics
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store.prom_db as store_prom_db
@@ -73,18 +74,7 @@ def _extract_metrics(dirname):
         "uwm": (str(artifact_paths.CLUSTER_DUMP_PROM_DB_UWM_DIR / "prometheus.t*"), []),
     }
 
-    metrics = {}
-    for name, (tarball_glob, metric) in METRICS.items():
-        try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
-        except IndexError:
-            logging.warning(f"No {tarball_glob} in '{dirname}'.")
-            continue
-
-        register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
-
-    return metrics
+    return prom_metrics.extract_metrics(dirname, METRICS, register_important_file)
 
 
 @ignore_file_not_found
@@ -188,16 +178,14 @@ def _parse_test_config(dirname):
 
     def get(key, missing=...):
         nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
-
-        match = jsonpath_expression.find(yaml_file)
+        match = jsonpath_cache.find(yaml_file, f'$.{key}')
         if not match:
             if missing != ...:
                 return missing
 
             raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+        return match[0]
 
     test_config.get = get
 
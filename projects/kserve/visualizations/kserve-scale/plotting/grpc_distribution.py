@@ -1,7 +1,5 @@
 from collections import defaultdict
 
-import statistics as stats
-
 import plotly.graph_objs as go
 import pandas as pd
 import plotly.express as px
@@ -10,6 +8,8 @@ from dash import html
 import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
+from topsail.visualizations import distribution_stats
+
 def register():
     GrpcCallsDistribution()
 
@@ -76,9 +76,7 @@ class GrpcCallsDistribution():
 
         msg = []
         if len(df) >= 2 and not cfg__show_attempts:
-            q1, med, q3 = stats.quantiles(df.Duration)
-            q90 = stats.quantiles(df.Duration, n=10)[8] # 90th percentile
-            q100 = df.Duration.max()
+            duration_stats = distribution_stats.describe(df.Duration)
 
             def time(sec):
                 if sec < 0.001:
@@ -94,19 +92,10 @@ class GrpcCallsDistribution():
 
             msg += [f"{len(df)} GRPC calls were performed."]
             msg.append(html.Br())
-            msg += [f"It took them ", html.B(f"between {time(df.Duration.min())} and {time(df.Duration.max())}"), " to complete."]
-            msg.append(html.Br())
-            msg.append(f"25% completed in less than {time(q1)} [Q1]")
-            msg.append(html.Br())
-            msg.append(f"50% completed in less than {time(med)} (+ {time(med-q1)}) [median]")
-            msg.append(html.Br())
-            msg.append(f"75% completed in less than {time(q3)} (+ {time(q3-med)}) [Q3]")
-            msg.append(html.Br())
-            msg.append(f"90% completed in less than {time(q90)} (+ {time(q90-q3)}) [90th quantile]")
-            msg.append(html.Br())
-            msg.append(f"There are {time(q3 - q1)} between Q1 and Q3.")
-            msg.append(html.Br())
-            msg.append(f"There are {time(q100 - q3)} between Q3 and Q4.")
+            msg += [f"It took them ", html.B(f"between {time(duration_stats['min'])} and {time(duration_stats['max'])}"), " to complete."]
             msg.append(html.Br())
+            msg += distribution_stats.quantiles_summary(duration_stats, "completed in less than", time, min_max=False)
+            msg += distribution_stats.spread_summary(duration_stats, time, median_label=None, relative=False,
+                                                     spreads=distribution_stats.UPPER_QUARTILE_SPREADS)
 
         return fig, msg
@@ -6,8 +6,6 @@ import base64
 import pathlib
 import yaml
 
-import statistics as stats
-
 import pandas as pd
 from dash import html
 from dash import dcc
@@ -17,6 +15,8 @@ from matrix_benchmarking.common import Matrix
 import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
+from topsail.visualizations import distribution_stats
+
 
 def register():
     LoadtimeDistribution()
@@ -83,40 +83,13 @@ class LoadtimeDistribution():
 
 
         msg = []
-        for test_name in df.sort_values(by=["test_name"]).test_name.unique():
-            stats_data = df[df.test_name == test_name][y_key]
+        label = "of the InferenceServices were ready in less than"
+        fmt = distribution_stats.value_formatter("seconds")
 
+        for test_name, test_stats in distribution_stats.describe_groups(df, "test_name", y_key).iterrows():
             msg += [html.H3(test_name)]
-            q0 = stats_data.min()
-            q100 = stats_data.max()
-            q1, med, q3 = stats.quantiles(stats_data)
-            q90 = stats.quantiles(stats_data, n=10)[8] # 90th percentile
-
-            label = "the InferenceServices were ready in less than"
-            unit = "seconds"
-
-            msg.append(f"0% of {label} {q0:.0f} {unit} [min]")
-            msg.append(html.Br())
-            msg.append(f"25% of {label} {q1:.0f} {unit} [Q1]")
-            msg.append(html.Br())
-            msg.append(f"50% of {label} {med:.0f} {unit} (+ {med-q1:.0f} {unit}) [median]")
-            msg.append(html.Br())
-            msg.append(f"75% of {label} {q3:.0f} {unit} (+ {q3-med:.0f} {unit}) [Q3]")
-            msg.append(html.Br())
-            msg.append(f"90% of {label} {q90:.0f} {unit} (+ {q90-q3:.0f} {unit}) [90th quantile]")
-            msg.append(html.Br())
-            msg.append(f"100% of {label} {q100:.0f} {unit} (+ {q100-q90:.0f} {unit}) [max]")
-            msg.append(html.Br())
-            msg.append(html.Br())
-            msg.append(f"There are {len(stats_data)} Inference Services.")
-            msg.append(html.Br())
-            msg.append(f"The median load time is {med:.0f} {unit}.")
-            msg.append(html.Br())
-            q3_q1 = q3 - q1
-            msg.append(f"There are {q3_q1:.0f} {unit} between Q1 and Q3 ({q3_q1/med*100:.1f}% of the median).")
-            msg.append(html.Br())
-            q100_q0 = q100 - q0
-            msg.append(f"There are {q100 - q0:.0f} {unit} between min and max ({q100_q0/med*100:.1f}% of the median).")
+            msg += distribution_stats.quantiles_summary(test_stats, label, fmt)
             msg.append(html.Br())
+            msg += distribution_stats.spread_summary(test_stats, fmt, "Inference Services", median_label="The median load time")
 
         return fig, msg
@@ -8,6 +8,8 @@ import os
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+from topsail.visualizations import parse_cache, parallel_parse
+
 from . import parsers
 from . import lts
 from . import lts_parser
@@ -75,6 +77,9 @@ def register_important_file(base_dirname, filename):
         logging.warning(f"File '{filename}' not part of the important file list :/")
         if pathlib.Path(filename).is_absolute():
             logging.warning(f"File '{filename}' is an absolute path. Should be relative to {base_dirname}.")
+
+    parse_cache.record_file(base_dirname / filename)
+
     return base_dirname / filename
 
 parsers.register_important_file = register_important_file
@@ -137,7 +142,8 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
             logging.warning(f"Artifacts version '{results.artifacts_version}' does not match the parser version '{ARTIFACTS_VERSION}' ...")
 
     parsers._parse_always(results, dirname, import_settings)
-    parsers._parse_once(results, dirname)
+    with parse_cache.ParseCache(dirname, ignore=ignore_cache):
+        parsers._parse_once(results, dirname)
 
     lts_results = lts_parser.generate_lts_results(results)
     results.lts = lts_parser.generate_lts_payload(results, lts_results, import_settings, must_validate=False)
@@ -158,12 +164,11 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 def parse_data():
     # delegate the parsing to the simple_store
     store.register_custom_rewrite_settings(_rewrite_settings)
-    store_simple.register_custom_parse_results(_parse_directory)
 
     from . import lts
     store_simple.register_custom_build_lts_payloads(lts.build_lts_payloads)
 
-    return store_simple.parse_data()
+    return parallel_parse.parse_data(_parse_directory)
 
 
 def build_lts_payloads():
@@ -1,4 +1,5 @@
 import types
+import functools
 import pathlib
 import logging
 import yaml
@@ -9,7 +10,8 @@ import dateutil
 import urllib.parse
 import uuid
 
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import parse_cache, k8s_list, k8s_parsing, prom_metrics
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store.prom_db as store_prom_db
@@ -19,7 +21,6 @@ from . import prom as workload_prom
 
 register_important_file = None # will be when importing store/__init__.py
 
-K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
@@ -148,25 +149,25 @@ def _parse_test_config(dirname):
         logging.error("Config file '{filename}' is empty ...")
         yaml_file = test_config.yaml_file = {}
 
-    def get(key, missing=...):
-        nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
+    # not a closure, so that test_config can be pickled by the parallel parser
+    test_config.get = functools.partial(_get_test_config_value, yaml_file, filename)
 
-        match = jsonpath_expression.find(yaml_file)
-        if not match:
-            if missing != ...:
-                return missing
+    return test_config
 
-            raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+def _get_test_config_value(yaml_file, filename, key, missing=...):
+    match = jsonpath_cache.find(yaml_file, f'$.{key}')
+    if not match:
+        if missing != ...:
+            return missing
 
-    test_config.get = get
+        raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-    return test_config
+    return match[0]
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_nodes_info(dirname, sutest_cluster=True):
     nodes_info = {}
 
@@ -193,6 +194,7 @@ def _parse_nodes_info(dirname, sutest_cluster=True):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_ocp_version(dirname):
 
     with open(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "ocp_version.yml")) as f:
@@ -202,6 +204,7 @@ def _parse_ocp_version(dirname):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_rhods_info(dirname):
     rhods_info = types.SimpleNamespace()
     artifact_dirname = pathlib.Path("001__rhods__capture_state")
@@ -213,7 +216,7 @@ def _parse_rhods_info(dirname):
         rhods_info.createdAt_raw = f.read().strip()
 
     try:
-        rhods_info.createdAt = datetime.datetime.strptime(rhods_info.createdAt_raw, K8S_TIME_FMT)
+        rhods_info.createdAt = k8s_parsing.parse_time(rhods_info.createdAt_raw)
     except ValueError as e:
         logging.error(f"Couldn't parse RHODS version timestamp: {e}")
         rhods_info.createdAt = None
@@ -225,23 +228,13 @@ def _parse_rhods_info(dirname):
 
     return rhods_info
 
+@parse_cache.cached(version="2026-10-18")
 def _extract_metrics(dirname):
     METRICS = {
         "sutest": (str(artifact_paths.LOCAL_CI_RUN_MULTI_DIR / "prometheus_ocp.t*"), workload_prom.get_sutest_metrics()),
     }
 
-    metrics = {}
-    for name, (tarball_glob, metric) in METRICS.items():
-        try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
-        except IndexError:
-            logging.warning(f"No {tarball_glob} in '{dirname}'.")
-            continue
-
-        register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
-
-    return metrics
+    return prom_metrics.extract_metrics(dirname, METRICS, register_important_file)
 
 def _extract_cluster_info(nodes_info):
     cluster_info = types.SimpleNamespace()
@@ -259,6 +252,7 @@ def _extract_cluster_info(nodes_info):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_start_end_time(dirname):
     test_start_end_time = types.SimpleNamespace()
     test_start_end_time.start = None
@@ -268,15 +262,11 @@ def _parse_start_end_time(dirname):
         job = yaml.safe_load(f)
 
     test_start_end_time.start = \
-        datetime.datetime.strptime(
-            job["status"]["startTime"],
-            K8S_TIME_FMT)
+        k8s_parsing.parse_time(job["status"]["startTime"])
 
     if job["status"].get("completionTime"):
         test_start_end_time.end = \
-            datetime.datetime.strptime(
-                job["status"]["completionTime"],
-                K8S_TIME_FMT)
+            k8s_parsing.parse_time(job["status"]["completionTime"])
     else:
         test_start_end_time.end = test_start_end_time.start + datetime.timedelta(hours=1)
 
@@ -317,6 +307,7 @@ def _parse_user_progress(dirname, ci_pod_dir):
     return progress
 
 
+@parse_cache.cached(version="2026-10-18")
 def _parse_user_data(dirname, user_count):
     user_data = {}
     for user_id in range(user_count):
@@ -347,59 +338,54 @@ def _parse_file_locations(dirname):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_pod_times(dirname):
     filename = artifact_paths.KSERVE_CAPTURE_OPERATORS_STATE_DIR / "predictor_pods.json"
 
-    with open(register_important_file(dirname, filename)) as f:
-        try:
-            json_file = json.load(f)
-        except Exception as e:
-            logging.error(f"Couldn't parse JSON file '{filename}': {e}")
-            return
-
     pod_times = []
-    for pod in json_file["items"]:
-      pod_time = types.SimpleNamespace()
-      pod_times.append(pod_time)
+    try:
+        for pod in k8s_list.iter_items(register_important_file(dirname, filename)):
+            pod_time = types.SimpleNamespace()
+            pod_times.append(pod_time)
 
-      pod_time.namespace = pod["metadata"]["namespace"]
-      pod_time.pod_name = pod["metadata"]["name"]
+            pod_time.namespace = pod["metadata"]["namespace"]
+            pod_time.pod_name = pod["metadata"]["name"]
 
-      pod_time.hostname = pod["spec"].get("nodeName")
+            pod_time.hostname = pod["spec"].get("nodeName")
 
-      pod_time.creation_time = datetime.datetime.strptime(
-              pod["metadata"]["creationTimestamp"], K8S_TIME_FMT)
+            pod_time.creation_time = k8s_parsing.parse_time(pod["metadata"]["creationTimestamp"])
 
-      pod_time.user_idx = int(pod_time.namespace.split("-u")[-1])
-      pod_time.model_id = int(pod["metadata"]["name"].split("-m")[1].split("-")[0])
-      pod_time.pod_friendly_name = f"model_{pod_time.model_id}"
+            pod_time.user_idx = int(pod_time.namespace.split("-u")[-1])
+            pod_time.model_id = int(pod["metadata"]["name"].split("-m")[1].split("-")[0])
+            pod_time.pod_friendly_name = f"model_{pod_time.model_id}"
 
-      start_time_str = pod["status"].get("startTime")
-      pod_time.start_time = None if not start_time_str else \
-          datetime.datetime.strptime(start_time_str, K8S_TIME_FMT)
+            start_time_str = pod["status"].get("startTime")
+            pod_time.start_time = None if not start_time_str else \
+                k8s_parsing.parse_time(start_time_str)
 
-      for condition in pod["status"].get("conditions", []):
-          last_transition = datetime.datetime.strptime(condition["lastTransitionTime"], K8S_TIME_FMT)
+            for condition in pod["status"].get("conditions", []):
+                last_transition = k8s_parsing.parse_time(condition["lastTransitionTime"])
 
-          if condition["type"] == "ContainersReady":
-              pod_time.containers_ready = last_transition
+                if condition["type"] == "ContainersReady":
+                    pod_time.containers_ready = last_transition
 
-          elif condition["type"] == "Initialized":
-              pod_time.pod_initialized = last_transition
-          elif condition["type"] == "PodScheduled":
-              pod_time.pod_scheduled = last_transition
+                elif condition["type"] == "Initialized":
+                    pod_time.pod_initialized = last_transition
+                elif condition["type"] == "PodScheduled":
+                    pod_time.pod_scheduled = last_transition
 
-      for containerStatus in pod["status"].get("containerStatuses", []):
-          try:
-              finishedAt =  datetime.datetime.strptime(
-                  containerStatus["state"]["terminated"]["finishedAt"],
-                  K8S_TIME_FMT)
-          except KeyError: continue
+            for containerStatus in pod["status"].get("containerStatuses", []):
+                try:
+                    finishedAt =  k8s_parsing.parse_time(containerStatus["state"]["terminated"]["finishedAt"])
+                except KeyError: continue
 
-          # take the last container_finished found
-          if ("container_finished" not in pod_time.__dict__
-              or pod_time.container_finished < finishedAt):
-              pod_time.container_finished = finishedAt
+                # take the last container_finished found
+                if ("container_finished" not in pod_time.__dict__
+                    or pod_time.container_finished < finishedAt):
+                    pod_time.container_finished = finishedAt
+    except json.JSONDecodeError as e:
+        logging.error(f"Couldn't parse JSON file '{filename}': {e}")
+        return
 
     return pod_times
 
@@ -415,15 +401,11 @@ def _parse_user_resource_times(dirname, ci_pod_dir):
     _file_path = glob_expansion[0] / "serving.json"
     file_path = _file_path.relative_to(dirname)
 
-    with open(register_important_file(dirname, file_path)) as f:
-        data = json.load(f)
-
-    for item in data["items"]:
+    for item in k8s_list.iter_items(register_important_file(dirname, file_path)):
         metadata = item["metadata"]
 
         kind = item["kind"]
-        creationTimestamp = datetime.datetime.strptime(
-            metadata["creationTimestamp"], K8S_TIME_FMT)
+        creationTimestamp = k8s_parsing.parse_time(metadata["creationTimestamp"])
 
         name = metadata["name"]
         namespace = metadata["namespace"]
@@ -470,7 +452,7 @@ def _parse_user_resource_times(dirname, ci_pod_dir):
             for condition in item["status"].get("conditions", []):
                 if not condition["status"]: continue
 
-                ts = datetime.datetime.strptime(condition["lastTransitionTime"], K8S_TIME_FMT)
+                ts = k8s_parsing.parse_time(condition["lastTransitionTime"])
                 obj_resource_times.conditions[condition["type"]] = ts
 
     return dict(resource_times)
@@ -6,7 +6,8 @@ import os
 import json
 import datetime
 
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import k8s_parsing, prom_metrics
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store.prom_db as store_prom_db
@@ -16,7 +17,6 @@ from . import prom as workload_prom
 
 register_important_file = None # will be when importing store/__init__.py
 
-K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
@@ -125,16 +125,14 @@ def _parse_test_config(dirname):
 
     def get(key, missing=...):
         nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
-
-        match = jsonpath_expression.find(yaml_file)
+        match = jsonpath_cache.find(yaml_file, f'$.{key}')
         if not match:
             if missing != ...:
                 return missing
 
             raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+        return match[0]
 
     test_config.get = get
 
@@ -163,15 +161,14 @@ def _parse_pod_times(dirname):
 
         pod_time.hostname = pod["spec"].get("nodeName")
 
-        pod_time.creation_time = datetime.datetime.strptime(
-                pod["metadata"]["creationTimestamp"], K8S_TIME_FMT)
+        pod_time.creation_time = k8s_parsing.parse_time(pod["metadata"]["creationTimestamp"])
 
         start_time_str = pod["status"].get("startTime")
         pod_time.start_time = None if not start_time_str else \
-            datetime.datetime.strptime(start_time_str, K8S_TIME_FMT)
+            k8s_parsing.parse_time(start_time_str)
 
         for condition in pod["status"].get("conditions", []):
-            last_transition = datetime.datetime.strptime(condition["lastTransitionTime"], K8S_TIME_FMT)
+            last_transition = k8s_parsing.parse_time(condition["lastTransitionTime"])
 
             if condition["type"] == "ContainersReady":
                 pod_time.containers_ready = last_transition
@@ -183,12 +180,8 @@ def _parse_pod_times(dirname):
 
         for containerStatus in pod["status"].get("containerStatuses", []):
             try:
-                finishedAt =  datetime.datetime.strptime(
-                    containerStatus["state"]["terminated"]["finishedAt"],
-                    K8S_TIME_FMT)
-                startedAt = datetime.datetime.strptime(
-                        containerStatus["state"]["terminated"]["startedAt"],
-                        K8S_TIME_FMT)
+                finishedAt =  k8s_parsing.parse_time(containerStatus["state"]["terminated"]["finishedAt"])
+                startedAt = k8s_parsing.parse_time(containerStatus["state"]["terminated"]["startedAt"])
             except KeyError: continue
 
             # take the last container_finished found
@@ -264,18 +257,7 @@ def _extract_metrics(dirname):
         "sutest": (str(artifact_paths.CLUSTER_DUMP_PROM_DB_DIR / "prometheus.t*"), workload_prom.get_sutest_metrics()),
     }
 
-    metrics = {}
-    for name, (tarball_glob, metric) in METRICS.items():
-        try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
-        except IndexError:
-            logging.warning(f"No {tarball_glob} in '{dirname}'.")
-            continue
-
-        register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
-
-    return metrics
+    return prom_metrics.extract_metrics(dirname, METRICS, register_important_file)
 
 def _extract_cluster_info(nodes_info):
     cluster_info = types.SimpleNamespace()
@@ -87,6 +87,7 @@ class Local_Ci:
                   state_signal_redis_server=None,
                   sleep_factor=0.0,
                   user_batch_size=1,
+                  launch_delays_file=None,
                   abort_on_failure=False,
                   need_all_success=False,
                   ):
@@ -113,6 +114,7 @@ class Local_Ci:
             state_signal_redis_server: Optional address of the Redis server to pass to StateSignal synchronization.
             sleep_factor: Delay (in seconds) between the start of each of the users.
             user_batch_size: Number of users to launch after the sleep delay.
+            launch_delays_file: Optional schedule plan file (index: delay in seconds, eg generated with the mcad-workload-generator scheduler.py), giving the start delay of each of the users. Overrides sleep_factor and user_batch_size.
             abort_on_failure: If true, let the Job abort the parallel execution on the first Pod failure. If false, ignore the process failure and track the overall failure count with a flag.
             need_all_success: if true, fails the execution if any of the Pods failed. If false, fails it if none of the Pods succeed.
         """
@@ -1,9 +1,12 @@
 import functools
 import datetime
 import logging
-import threading, queue
+import atexit
 import collections
-import io, csv
+import csv
+
+import gevent
+import gevent.event
 
 env = None # set by locustfile.py
 
@@ -163,30 +166,69 @@ class ScaleTestError(Exception):
 
         return f'{self.__class__.__name__}("{self.msg}"{opts})'
 
-class CsvFileWriter(threading.Thread):
-    def __init__(self, filepath, csv_class):
-        threading.Thread.__init__(self, daemon=True)
-        self.queue = queue.Queue()
+# the rows are written to the file when the buffer reaches
+# FLUSH_BATCH_SIZE rows, or every FLUSH_INTERVAL seconds
+FLUSH_BATCH_SIZE = 500
+FLUSH_INTERVAL = 5 # seconds
+
+class CsvFileWriter():
+    """
+    Records the rows of a fixed-schema (namedtuple) CSV file.
+
+    `write` only appends the values to an in-memory columnar buffer, so
+    that the recording doesn't perturb the latencies being measured.
+    The rows are appended to the file by batches, from a background
+    greenlet.
+    """
+
+    def __init__(self, filepath, csv_class, batch_size=FLUSH_BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
         self.filepath = filepath
         self.csv_class = csv_class
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.columns = [[] for _ in self.csv_class._fields]
+
+        self.f = open(self.filepath, 'w', newline='')
+        self.csv_writer = csv.writer(self.f, quoting=csv.QUOTE_MINIMAL)
+        self.csv_writer.writerow(self.csv_class._fields)
+        self.f.flush()
 
-        self.queue.put(",".join(self.csv_class._fields) + "\n")
-        self.start()
+        self.batch_full = gevent.event.Event()
+        self.flusher = gevent.spawn(self._flush_loop)
 
-    def run(self):
-        with open(self.filepath, 'w') as f:
-            while True:
-                csv_line = self.queue.get()
-                f.write(csv_line)
-                f.flush()
-                self.queue.task_done()
+        atexit.register(self.close)
+
+    def _flush_loop(self):
+        while True:
+            self.batch_full.wait(timeout=self.flush_interval)
+            self.batch_full.clear()
+            self.flush()
 
     def write(self, csv_obj):
-        output = io.StringIO()
-        wr = csv.writer(output, quoting=csv.QUOTE_MINIMAL)
-        wr.writerow([getattr(csv_obj, attr) for attr in self.csv_class._fields])
+        for column, value in zip(self.columns, csv_obj):
+            column.append(value)
+
+        if len(self.columns[0]) >= self.batch_size:
+            self.batch_full.set() # wake up the flusher greenlet
+
+    def flush(self):
+        if self.f is None or not self.columns[0]:
+            return
+
+        columns, self.columns = self.columns, [[] for _ in self.csv_class._fields]
+
+        self.csv_writer.writerows(zip(*columns))
+        self.f.flush()
+
+    def close(self):
+        if self.f is None:
+            return
 
-        self.queue.put(output.getvalue())
+        self.flusher.kill(block=False)
+        self.flush()
+        self.f.close()
+        self.f = None
 
 CsvProgressEntry = collections.namedtuple(
     "CsvProgressEntry",
@@ -41,6 +41,8 @@ env.NOTEBOOK_IMAGE_NAME = os.getenv("NOTEBOOK_IMAGE_NAME")
 env.NOTEBOOK_SIZE_NAME = os.getenv("NOTEBOOK_SIZE_NAME")
 env.USER_INDEX_OFFSET = int(os.getenv("USER_INDEX_OFFSET", 0))
 env.USER_SLEEP_FACTOR = float(os.getenv("USER_SLEEP_FACTOR"))
+# the delays of the schedule plan, one per user index. Overrides USER_SLEEP_FACTOR.
+env.USER_LAUNCH_DELAYS = [float(delay) for delay in os.getenv("USER_LAUNCH_DELAYS", "").split()]
 env.REUSE_COOKIES = os.getenv("REUSE_COOKIES", False) == "1"
 env.WORKER_COUNT = int(os.getenv("WORKER_COUNT", 1))
 env.DEBUG_MODE = os.getenv("DEBUG_MODE", False) == "1"
@@ -67,6 +69,12 @@ with open(creds_file) as f:
 env.csv_progress = common.CsvFileWriter(f"{env.RESULTS_DEST}_worker{env.JOB_COMPLETION_INDEX}_progress.csv", common.CsvProgressEntry)
 env.csv_bug_hits = common.CsvFileWriter(f"{env.RESULTS_DEST}_worker{env.JOB_COMPLETION_INDEX}_bug_hits.csv", common.CsvBugHitEntry)
 
+@locust.events.quitting.add_listener
+def on_quitting(environment, **_kwargs):
+    # write the rows still in the buffers
+    env.csv_progress.close()
+    env.csv_bug_hits.close()
+
 env.start_event.__enter__()
 env.start_event.fire(dict(request_type="PROCESS_STARTED"))
 
@@ -134,7 +142,10 @@ class WorkbenchUser(HttpUser):
     def initialize(self):
         @common.Step("launch_delay")
         def sleep_delay(_dashboard_self):
-            sleep_delay = self.user_index * env.USER_SLEEP_FACTOR
+            if env.USER_LAUNCH_DELAYS:
+                sleep_delay = env.USER_LAUNCH_DELAYS[self.user_index]
+            else:
+                sleep_delay = self.user_index * env.USER_SLEEP_FACTOR
             logging.info(f"{self.user_name}: sleep for {sleep_delay:.1f}s before running.")
             time.sleep(sleep_delay)
             logging.info(f"{self.user_name}: done sleeping.")
@@ -26,6 +26,10 @@ export CREDS_FILE=$(_get_command_arg secret_properties_file $LOCUST_COMMAND)
 export NOTEBOOK_IMAGE_NAME=$(_get_command_arg notebook_image_name $LOCUST_COMMAND)
 export NOTEBOOK_SIZE_NAME=$(_get_command_arg notebook_size_name $LOCUST_COMMAND)
 export USER_SLEEP_FACTOR=$(_get_command_arg user_sleep_factor $LOCUST_COMMAND)
+user_launch_delays_file=$(_get_command_arg user_launch_delays_file $LOCUST_COMMAND)
+if [[ "$user_launch_delays_file" ]]; then
+    export USER_LAUNCH_DELAYS=$(python3 -c "import sys, yaml; print(' '.join(str(delay) for _, delay in sorted(yaml.safe_load(open(sys.argv[1])).items())))" "$user_launch_delays_file")
+fi
 
 export LOCUST_USERS=$(_get_command_arg user_count $LOCUST_COMMAND)
 #export LOCUST_RUN_TIME=$(_get_command_arg run_time $LOCUST_COMMAND)
@@ -102,17 +102,17 @@ show_help_and_exit() {
 }
 
 generate_plots() {
-    local artifact_next_dir_idx=$(ls "${ARTIFACT_DIR}/" | grep __ | wc -l)
-    local plots_dirname="$(printf '%03d' "$artifact_next_dir_idx")__plots"
-    local plots_artifact_dir="$ARTIFACT_DIR/$plots_dirname"
-
     local test_dir=$(get_config matbench.test_directory)
 
     if [[ "$test_dir" == null ]]; then
         _error "generate_plots: matbench.test_directory should be set."
     fi
 
-    mkdir -p "$plots_artifact_dir"
+    # allocates ARTIFACT_DIR/NNN__plots, see topsail.testing.env.allocate_artifact_dir
+    local plots_artifact_dir
+    plots_artifact_dir=$(PYTHONPATH="${TOPSAIL_DIR}" python3 -c 'import sys; from topsail.testing import env; print(env.allocate_artifact_dir(sys.argv[2], sys.argv[1]))' \
+                             "${ARTIFACT_DIR}" plots)
+    local plots_dirname=$(basename "$plots_artifact_dir")
 
     if ARTIFACT_DIR="$plots_artifact_dir" \
                    "$TESTING_NOTEBOOKS_DIR/generate_matrix-benchmarking.sh" \
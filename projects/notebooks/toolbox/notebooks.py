@@ -130,6 +130,7 @@ class Notebooks:
             toleration_key="",
             cpu_count: int = 1,
             user_sleep_factor: float = 1.0,
+            user_launch_delays_file="",
             capture_prom_db: bool = True,
     ):
 
@@ -156,6 +157,7 @@ class Notebooks:
           artifacts_exporter_istag: Imagestream tag of the artifacts exporter side-car container.
           cpu_count: Number of Locust processes to launch (one per Pod with 1cpu).
           user_sleep_factor: Delay to sleep between users
+          user_launch_delays_file: Optional schedule plan file (index: delay in seconds, eg generated with the mcad-workload-generator scheduler.py), giving the start delay of each of the users. Overrides user_sleep_factor.
           capture_prom_db: If True, captures the Prometheus DB of the systems.
         """
 
@@ -8,14 +8,14 @@ import datetime
 from collections import defaultdict
 import uuid
 
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import k8s_parsing
 
 import matrix_benchmarking.cli_args as cli_args
 from . import lts_parser
 
 register_important_file = None # will be when importing store/__init__.py
 
-K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
@@ -139,16 +139,14 @@ def _parse_test_config(dirname):
 
     def get(key, missing=...):
         nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
-
-        match = jsonpath_expression.find(yaml_file)
+        match = jsonpath_cache.find(yaml_file, f'$.{key}')
         if not match:
             if missing != ...:
                 return missing
 
             raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+        return match[0]
 
     test_config.get = get
 
@@ -218,7 +216,7 @@ def _parse_rhods_info(dirname):
         rhods_info.createdAt_raw = f.read().strip()
 
     try:
-        rhods_info.createdAt = datetime.datetime.strptime(rhods_info.createdAt_raw, K8S_TIME_FMT)
+        rhods_info.createdAt = k8s_parsing.parse_time(rhods_info.createdAt_raw)
     except ValueError as e:
         logging.error("Couldn't parse RHODS version timestamp: {e}")
         rhods_info.createdAt = None
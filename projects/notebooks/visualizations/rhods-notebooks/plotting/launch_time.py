@@ -1,5 +1,4 @@
 from collections import defaultdict
-import statistics as stats
 
 import plotly.graph_objs as go
 import pandas as pd
@@ -10,6 +9,8 @@ import logging
 import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
+from topsail.visualizations import distribution_stats
+
 from . import spawntime
 from . import utils
 
@@ -231,12 +232,12 @@ class RunTimeDistribution():
 
         stats_data = []
         base_value = 0
-        steps = data_df["Step Name"].unique()
+        steps_stats = distribution_stats.describe_groups(data_df, "Step Name", "Step Duration", sort=False)
+        steps = steps_stats.index
         notebook_ready_time = None
         msg = []
-        for step_name in steps:
-            step_df = data_df[data_df["Step Name"] == step_name]
-            q1, median, q3 = stats.quantiles(step_df["Step Duration"])
+        for step_name, step_stats in steps_stats.iterrows():
+            q1, median, q3 = step_stats["q1"], step_stats["median"], step_stats["q3"]
             q1_dist = median-q1
             q3_dist = q3-median
             stats_data.append(dict(
@@ -1,7 +1,5 @@
 from collections import defaultdict
 
-import statistics as stats
-
 import plotly.graph_objs as go
 import pandas as pd
 import plotly.express as px
@@ -11,6 +9,8 @@ from dash import html
 import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
+from topsail.visualizations import distribution_stats
+
 def register():
     NotebookPerformance("Notebook Performance")
 
@@ -87,29 +87,11 @@ class NotebookPerformance():
 
         msg = []
         if cfg__show_all_in_one or cfg__show_user_details:
-            q0 = min(times_data)
-            q100 = max(times_data)
-            q1, med, q3 = stats.quantiles(times_data)
-            q90 = stats.quantiles(times_data, n=10)[8] # 90th percentile
+            times_stats = distribution_stats.describe(times_data)
+            fmt = distribution_stats.value_formatter("seconds", digits=2)
 
-            msg.append(f"25% of the measurements ran in less than {q1:.2f} seconds [Q1]")
-            msg.append(html.Br())
-            msg.append(f"50% of the measurements ran in less than {med:.2f} seconds (+ {med-q1:.2f}s) [median]")
-            msg.append(html.Br())
-            msg.append(f"75% of the measurements ran in less than {q3:.2f} seconds (+ {q3-med:.2f}s) [Q3]")
-            msg.append(html.Br())
-            msg.append(f"90% of the measurements ran less than {q90:.2f} seconds (+ {q90-q3:.2f}s) [90th quantile]")
-            msg.append(html.Br())
-            msg.append(f"There are {len(times_data)} measurements.")
-            msg.append(html.Br())
-            msg.append(f"The median measurement time is {med:.2f} seconds.")
-            msg.append(html.Br())
-            q3_q1 = q3 - q1
-            msg.append(f"There are {q3_q1:.2f} seconds between Q1 and Q3 ({q3_q1/med*100:.1f}% of the median).")
-            msg.append(html.Br())
-            q100_q0 = q100 - q0
-            msg.append(f"There are {q100 - q0:.2f} seconds between min and max ({q100_q0/med*100:.1f}% of the median).")
-            msg.append(html.Br())
+            msg += distribution_stats.quantiles_summary(times_stats, "of the measurements ran in less than", fmt, min_max=False)
+            msg += distribution_stats.spread_summary(times_stats, fmt, "measurements", median_label="The median measurement time")
             try:
                 if "instance_type" in entry.settings.__dict__:
                     machine_type = entry.settings.instance_type
@@ -1,7 +1,5 @@
 from collections import defaultdict
 
-import statistics as stats
-
 import plotly.graph_objs as go
 import pandas as pd
 import plotly.express as px
@@ -10,6 +8,8 @@ from dash import html
 import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
+from topsail.visualizations import distribution_stats
+
 from . import utils
 
 def register():
@@ -98,9 +98,7 @@ class ExecutionDistribution():
 
         msg = []
         if (cfg__show_only_step or cfg__time_to_reach_step) and len(times_data) >= 2:
-            q1, med, q3 = stats.quantiles(times_data)
-            q90 = stats.quantiles(times_data, n=10)[8] # 90th percentile
-            q100 = max(times_data)
+            times_stats = distribution_stats.describe(times_data)
 
             def time(sec):
                 if sec <= 120:
@@ -108,17 +106,8 @@ class ExecutionDistribution():
                 else:
                     return f"{sec/60:.1f} minutes"
 
-            msg.append(f"25% of the users got their notebook in less than {time(q1)} [Q1]")
-            msg.append(html.Br())
-            msg.append(f"50% of the users got their notebook in less than {time(med)} (+ {time(med-q1)}) [median]")
-            msg.append(html.Br())
-            msg.append(f"75% of the users got their notebook in less than {time(q3)} (+ {time(q3-med)}) [Q3]")
-            msg.append(html.Br())
-            msg.append(f"90% of the users got their notebook in less than {time(q90)} (+ {time(q90-q3)}) [90th quantile]")
-            msg.append(html.Br())
-            msg.append(f"There are {time(q3 - q1)} between Q1 and Q3.")
-            msg.append(html.Br())
-            msg.append(f"There are {time(q100 - q3)} between Q3 and Q4.")
-            msg.append(html.Br())
+            msg += distribution_stats.quantiles_summary(times_stats, "of the users got their notebook in less than", time, min_max=False)
+            msg += distribution_stats.spread_summary(times_stats, time, median_label=None, relative=False,
+                                                     spreads=distribution_stats.UPPER_QUARTILE_SPREADS)
 
         return fig, msg
@@ -1,4 +1,5 @@
 import types
+import functools
 import pathlib
 import yaml
 import datetime
@@ -13,7 +14,8 @@ import pickle
 import uuid
 
 import pandas as pd
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import parse_cache, parallel_parse, k8s_list, k8s_parsing, prom_metrics
 
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
@@ -25,14 +27,12 @@ import matrix_benchmarking.cli_args as cli_args
 
 
 from . import models
-from . import k8s_quantity
 from . import store_theoretical
 from . import store_thresholds
+from . import store_locust
 from .plotting import prom as rhods_plotting_prom
 from . import lts_parser, lts
 
-K8S_EVT_TIME_FMT = "%Y-%m-%dT%H:%M:%S.%fZ"
-K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 ROBOT_TIME_FMT = "%Y%m%d %H:%M:%S.%f"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 
@@ -45,6 +45,9 @@ THIS_DIR = pathlib.Path(__file__).resolve().parent
 
 CACHE_FILENAME = "cache.pickle"
 
+# where the notebooks_locust_scale_test role exports the files of the Locust Pods
+LOCUST_DIRNAME = "locust-scale-test"
+
 IMPORTANT_FILES = [
     "_ansible.env",
     ".uuid",
@@ -77,6 +80,9 @@ IMPORTANT_FILES = [
 
     "notebook-artifacts/benchmark_measures.json",
 
+    f"{LOCUST_DIRNAME}/*/*_worker*{store_locust.PROGRESS_SUFFIX}",
+    f"{LOCUST_DIRNAME}/*/*_worker*{store_locust.BUG_HITS_SUFFIX}",
+
     "src/000_rhods_notebook.yaml",
 
     "metrics/*",
@@ -86,7 +92,7 @@ IMPORTANT_FILES = [
 
 
 ARTIFACTS_VERSION = "2022-11-09"
-PARSER_VERSION = "2022-12-14"
+PARSER_VERSION = "2026-10-18"
 
 
 def is_mandatory_file(filename):
@@ -114,6 +120,8 @@ def register_important_file(base_dirname, filename):
     if not is_important_file(filename):
         logging.warning(f"File '{filename}' not part of the important file list :/")
 
+    parse_cache.record_file(base_dirname / filename)
+
     return base_dirname / filename
 
 
@@ -262,6 +270,7 @@ def _parse_pr_comments(dirname):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_rhods_info(dirname):
     rhods_info = types.SimpleNamespace()
 
@@ -272,7 +281,7 @@ def _parse_rhods_info(dirname):
         rhods_info.createdAt_raw = f.read().strip()
 
     try:
-        rhods_info.createdAt = datetime.datetime.strptime(rhods_info.createdAt_raw, K8S_TIME_FMT)
+        rhods_info.createdAt = k8s_parsing.parse_time(rhods_info.createdAt_raw)
     except ValueError as e:
         logging.error("Couldn't parse RHODS version timestamp: {e}")
         rhods_info.createdAt = None
@@ -281,6 +290,7 @@ def _parse_rhods_info(dirname):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_tester_job(dirname):
     job_info = types.SimpleNamespace()
 
@@ -288,15 +298,11 @@ def _parse_tester_job(dirname):
         job = yaml.safe_load(f)
 
     job_info.creation_time = \
-        datetime.datetime.strptime(
-            job["status"]["startTime"],
-            K8S_TIME_FMT)
+        k8s_parsing.parse_time(job["status"]["startTime"])
 
     if job["status"].get("completionTime"):
         job_info.completion_time = \
-            datetime.datetime.strptime(
-                job["status"]["completionTime"],
-                K8S_TIME_FMT)
+            k8s_parsing.parse_time(job["status"]["completionTime"])
     else:
         job_info.completion_time = job_info.creation_time + datetime.timedelta(hours=1)
 
@@ -314,13 +320,14 @@ def _parse_tester_job(dirname):
     job_info.request = types.SimpleNamespace()
     rq = job["spec"]["template"]["spec"]["containers"][0]["resources"]["requests"]
 
-    job_info.request.cpu = float(k8s_quantity.parse_quantity(rq["cpu"]))
-    job_info.request.mem = float(k8s_quantity.parse_quantity(rq["memory"]) / 1024 / 1024 / 1024)
+    job_info.request.cpu = float(k8s_parsing.parse_quantity(rq["cpu"]))
+    job_info.request.mem = float(k8s_parsing.parse_quantity(rq["memory"]) / 1024 / 1024 / 1024)
 
     return job_info
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_nodes_info(dirname, sutest_cluster=False):
     nodes_info = {}
     filename = pathlib.Path("artifacts-sutest" if sutest_cluster else "artifacts-driver") / "nodes.json"
@@ -349,6 +356,7 @@ def _parse_nodes_info(dirname, sutest_cluster=False):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_odh_dashboard_config(dirname, notebook_size_name):
     odh_dashboard_config = types.SimpleNamespace()
     odh_dashboard_config.path = None
@@ -370,15 +378,16 @@ def _parse_odh_dashboard_config(dirname, notebook_size_name):
     for notebook_size in odh_dashboard_config.content["spec"]["notebookSizes"]:
         if notebook_size["name"] != odh_dashboard_config.notebook_size_name: continue
 
-        odh_dashboard_config.notebook_request_size_mem = float(k8s_quantity.parse_quantity(notebook_size["resources"]["requests"]["memory"]) / 1024 / 1024 / 1024)
-        odh_dashboard_config.notebook_request_size_cpu = float(k8s_quantity.parse_quantity(notebook_size["resources"]["requests"]["cpu"]))
+        odh_dashboard_config.notebook_request_size_mem = float(k8s_parsing.parse_quantity(notebook_size["resources"]["requests"]["memory"]) / 1024 / 1024 / 1024)
+        odh_dashboard_config.notebook_request_size_cpu = float(k8s_parsing.parse_quantity(notebook_size["resources"]["requests"]["cpu"]))
 
-        odh_dashboard_config.notebook_limit_size_mem = float(k8s_quantity.parse_quantity(notebook_size["resources"]["limits"]["memory"]) / 1024 / 1024 / 1024)
-        odh_dashboard_config.notebook_limit_size_cpu = float(k8s_quantity.parse_quantity(notebook_size["resources"]["limits"]["cpu"]))
+        odh_dashboard_config.notebook_limit_size_mem = float(k8s_parsing.parse_quantity(notebook_size["resources"]["limits"]["memory"]) / 1024 / 1024 / 1024)
+        odh_dashboard_config.notebook_limit_size_cpu = float(k8s_parsing.parse_quantity(notebook_size["resources"]["limits"]["cpu"]))
 
     return odh_dashboard_config
 
 
+@parse_cache.cached(version="2026-10-18")
 def _parse_resource_times(dirname):
     all_resource_times = defaultdict(dict)
 
@@ -387,11 +396,7 @@ def _parse_resource_times(dirname):
         print(f"Parsing {fname} ...")
 
         file_path = (dirname / "artifacts-sutest" / "project_dsg"/ f"{fname}.json").relative_to(dirname)
-        with open(register_important_file(dirname, file_path)) as f:
-            data = json.load(f)
-
-        for item in data["items"]:
-
+        for item in k8s_list.iter_items(register_important_file(dirname, file_path)):
             metadata = item["metadata"]
             if fname == "namespaces":
                 namespace = metadata["name"]
@@ -402,8 +407,7 @@ def _parse_resource_times(dirname):
             user_idx = int(namespace.replace(TEST_USERNAME_PREFIX, ""))
 
             kind = item["kind"]
-            creationTimestamp = datetime.datetime.strptime(
-                metadata["creationTimestamp"], K8S_TIME_FMT)
+            creationTimestamp = k8s_parsing.parse_time(metadata["creationTimestamp"])
 
             name = metadata["name"].replace(namespace, "username")
             generate_name, found, suffix = name.rpartition("-")
@@ -433,7 +437,7 @@ def _parse_notebook_times(dirname, pod_times):
                  (dirname / pathlib.Path("artifacts-sutest")).glob("project_*/notebooks.json")]
 
     def _parse_notebook_times_file(notebooks):
-        for notebook in notebooks["items"]:
+        for notebook in notebooks:
             notebook_name = notebook["metadata"]["name"]
             try:
                 user_index = int(re.findall(JUPYTER_USER_IDX_REGEX, notebook_name + "-0")[0])
@@ -454,15 +458,15 @@ def _parse_notebook_times(dirname, pod_times):
             if not last_activity_str or not last_activity_str.endswith("Z"):
                 continue
 
-            last_activity = datetime.datetime.strptime(last_activity_str, K8S_TIME_FMT)
+            last_activity = k8s_parsing.parse_time(last_activity_str)
             pod_times[user_index].last_activity = last_activity
 
 
     for filename in filenames:
-        with open(register_important_file(dirname, filename)) as f:
-            _parse_notebook_times_file(json.load(f))
+        _parse_notebook_times_file(k8s_list.iter_items(register_important_file(dirname, filename)))
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18", ignore_args=["test_config"], extra_files=["config.yaml"])
 def _parse_pod_times(dirname, test_config=None, is_notebook=False):
     if is_notebook:
         filenames = [fname.relative_to(dirname) for fname in
@@ -474,7 +478,7 @@ def _parse_pod_times(dirname, test_config=None, is_notebook=False):
     hostnames = {}
 
     def _parse_pod_times_file(pods):
-        for pod in pods["items"]:
+        for pod in pods:
             pod_name = pod["metadata"]["name"]
 
             if is_notebook:
@@ -497,10 +501,10 @@ def _parse_pod_times(dirname, test_config=None, is_notebook=False):
 
             start_time = pod["status"].get("startTime")
             pod_times[user_index].start_time = None if not start_time else \
-                datetime.datetime.strptime(start_time, K8S_TIME_FMT)
+                k8s_parsing.parse_time(start_time)
 
             for condition in pod["status"].get("conditions", []):
-                last_transition = datetime.datetime.strptime(condition["lastTransitionTime"], K8S_TIME_FMT)
+                last_transition = k8s_parsing.parse_time(condition["lastTransitionTime"])
 
                 if condition["type"] == "ContainersReady":
                     pod_times[user_index].containers_ready = last_transition
@@ -512,9 +516,7 @@ def _parse_pod_times(dirname, test_config=None, is_notebook=False):
 
             for containerStatus in pod["status"].get("containerStatuses", []):
                 try:
-                    finishedAt =  datetime.datetime.strptime(
-                        containerStatus["state"]["terminated"]["finishedAt"],
-                        K8S_TIME_FMT)
+                    finishedAt =  k8s_parsing.parse_time(containerStatus["state"]["terminated"]["finishedAt"])
                 except KeyError: continue
 
                 if ("container_finished" not in pod_times[user_index].__dict__
@@ -522,8 +524,7 @@ def _parse_pod_times(dirname, test_config=None, is_notebook=False):
                     pod_times[user_index].container_finished = finishedAt
 
     for filename in filenames:
-        with open(register_important_file(dirname, filename)) as f:
-            _parse_pod_times_file(json.load(f))
+        _parse_pod_times_file(k8s_list.iter_items(register_important_file(dirname, filename)))
 
     return pod_times, hostnames
 
@@ -550,23 +551,23 @@ def _parse_test_config(dirname):
         logging.error("Config file '{filename}' is empty ...")
         yaml_file = test_config.yaml_file = {}
 
-    def get(key, missing=...):
-        nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
+    # not a closure, so that test_config can be pickled by the parallel parser
+    test_config.get = functools.partial(_get_test_config_value, yaml_file, filename)
 
-        match = jsonpath_expression.find(yaml_file)
-        if not match:
-            if missing != ...:
-                return missing
+    return test_config
 
-            raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+def _get_test_config_value(yaml_file, filename, key, missing=...):
+    match = jsonpath_cache.find(yaml_file, f'$.{key}')
+    if not match:
+        if missing != ...:
+            return missing
 
-    test_config.get = get
+        raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-    return test_config
+    return match[0]
 
+@parse_cache.cached(version="2026-10-18")
 def _extract_metrics(dirname):
     METRICS = {
         "sutest": ("artifacts-sutest/prometheus_ocp.t*", rhods_plotting_prom.get_sutest_metrics()),
@@ -574,18 +575,7 @@ def _extract_metrics(dirname):
         "rhods":  ("artifacts-sutest/prometheus_rhods.t*", rhods_plotting_prom.get_rhods_metrics()),
     }
 
-    results_metrics = {}
-    for name, (tarball_glob, metrics) in METRICS.items():
-        try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
-        except IndexError:
-            logging.warning(f"No {tarball_glob} in '{dirname}'.")
-            continue
-
-        register_important_file(dirname, prom_tarball.relative_to(dirname))
-        results_metrics[name] = store_prom_db.extract_metrics(prom_tarball, metrics, dirname)
-
-    return results_metrics
+    return prom_metrics.extract_metrics(dirname, METRICS, register_important_file)
 
 
 @ignore_file_not_found
@@ -604,6 +594,7 @@ def _parse_ods_ci_exit_code(dirname, output_dir):
             return None
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_ods_ci_output_xml(dirname, output_dir):
     filename = output_dir / "output.xml"
     with open(register_important_file(dirname, filename)) as f:
@@ -631,6 +622,7 @@ def _parse_ods_ci_output_xml(dirname, output_dir):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_notebook_benchmark(dirname, output_dir):
     filename = output_dir / "benchmark_measures.json"
     with open(register_important_file(dirname, filename)) as f:
@@ -638,6 +630,7 @@ def _parse_notebook_benchmark(dirname, output_dir):
 
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_ods_ci_progress(dirname, output_dir):
     filename = output_dir / "progress_ts.yaml"
     with open(register_important_file(dirname, filename)) as f:
@@ -649,12 +642,30 @@ def _parse_ods_ci_progress(dirname, output_dir):
     return progress
 
 @ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
 def _parse_ocp_version(dirname):
     with open(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "ocp_version.yml")) as f:
         sutest_ocp_version_yaml = yaml.safe_load(f)
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
+def _locust_files(dirname, suffix):
+    return [register_important_file(dirname, path.relative_to(dirname))
+            for path in sorted((dirname / LOCUST_DIRNAME).glob(f"*/*_worker*{suffix}"))]
+
+
+@ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
+def _parse_locust_progress(dirname):
+    return store_locust.load_progress(_locust_files(dirname, store_locust.PROGRESS_SUFFIX))
+
+
+@ignore_file_not_found
+@parse_cache.cached(version="2026-10-18")
+def _parse_locust_bug_hits(dirname):
+    return store_locust.load_bug_hits(_locust_files(dirname, store_locust.BUG_HITS_SUFFIX))
+
+
 def _extract_rhods_cluster_info(nodes_info):
     rhods_cluster_info = types.SimpleNamespace()
 
@@ -722,38 +733,7 @@ def _parse_ods_ci_pods_directory(dirname, output_dir):
 
     return ods_ci
 
-def _parse_results(fn_add_to_matrix, dirname, import_settings):
-    ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
-    if not ignore_cache:
-        try:
-            results = load_cache(dirname)
-        except FileNotFoundError:
-            results = None # Cache file doesn't exit, ignore and parse the artifacts
-    else:
-        logging.info("MATBENCH_STORE_IGNORE_CACHE is set, not processing the cache file.")
-        results = None
-
-    if results:
-        _parse_always(results, dirname, import_settings)
-
-        fn_add_to_matrix(results)
-
-        return
-
-
-    results = types.SimpleNamespace()
-
-    results.parser_version = PARSER_VERSION
-    results.artifacts_version = _parse_artifacts_version(dirname)
-
-    if results.artifacts_version != ARTIFACTS_VERSION:
-        if not results.artifacts_version:
-            logging.warning("Artifacts does not have a version...")
-        else:
-            logging.warning(f"Artifacts version '{results.artifacts_version}' does not match the parser version '{ARTIFACTS_VERSION}' ...")
-
-    _parse_always(results, dirname, import_settings)
-
+def _parse_once(results, dirname, import_settings):
     start_end = _parse_start_end_times(dirname)
     start, end = start_end if start_end else (None, None)
     results.start_time = start
@@ -812,6 +792,14 @@ def _parse_results(fn_add_to_matrix, dirname, import_settings):
     else:
         results.ods_ci = None
 
+    # Locust
+    if (dirname / LOCUST_DIRNAME).exists():
+        results.locust_progress = _parse_locust_progress(dirname)
+        results.locust_bug_hits = _parse_locust_bug_hits(dirname)
+    else:
+        results.locust_progress = None
+        results.locust_bug_hits = None
+
     # notebook performance
     if (dirname / "notebook-artifacts").exists():
         if results.ods_ci is None:
@@ -829,6 +817,42 @@ def _parse_results(fn_add_to_matrix, dirname, import_settings):
 
     results.lts = lts_parser.generate_lts_payload(results, import_settings)
 
+
+def _parse_results(fn_add_to_matrix, dirname, import_settings):
+    ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
+    if not ignore_cache:
+        try:
+            results = load_cache(dirname)
+        except FileNotFoundError:
+            results = None # Cache file doesn't exit, ignore and parse the artifacts
+    else:
+        logging.info("MATBENCH_STORE_IGNORE_CACHE is set, not processing the cache file.")
+        results = None
+
+    if results:
+        _parse_always(results, dirname, import_settings)
+
+        fn_add_to_matrix(results)
+
+        return
+
+
+    results = types.SimpleNamespace()
+
+    results.parser_version = PARSER_VERSION
+    results.artifacts_version = _parse_artifacts_version(dirname)
+
+    if results.artifacts_version != ARTIFACTS_VERSION:
+        if not results.artifacts_version:
+            logging.warning("Artifacts does not have a version...")
+        else:
+            logging.warning(f"Artifacts version '{results.artifacts_version}' does not match the parser version '{ARTIFACTS_VERSION}' ...")
+
+    _parse_always(results, dirname, import_settings)
+
+    with parse_cache.ParseCache(dirname, ignore=ignore_cache):
+        _parse_once(results, dirname, import_settings)
+
     print("add the result to the matrix ...")
 
     fn_add_to_matrix(results)
@@ -885,4 +909,7 @@ store.register_lts_schema(models.NotebookScalePayload)
 
 store_simple.register_custom_parse_results(_parse_results)
 
+def parse_data():
+    return parallel_parse.parse_data(_parse_results)
+
 build_lts_payloads = lts.build_lts_payloads
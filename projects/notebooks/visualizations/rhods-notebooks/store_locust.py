@@ -0,0 +1,114 @@
+#! /usr/bin/env python
+
+# Loads the progress files recorded by the Locust workers
+# (common.CsvFileWriter of the notebooks_locust_scale_test role) into
+# DataFrames, for the visualization of the scale test.
+#
+# The store parses the files exported to the
+# locust-scale-test/<pod name>/ artifacts directories. The module can
+# also be launched directly, against the RESULTS_DEST prefix of a
+# local run (run_locust_on_laptop.sh).
+
+import re
+import sys
+import glob
+import logging
+
+import pandas as pd
+
+PROGRESS_SUFFIX = "_progress.csv"
+BUG_HITS_SUFFIX = "_bug_hits.csv"
+
+_WORKER_REGEX = re.compile(r"_worker(\d+)_[^/]*$")
+
+
+def _load_csv_files(files):
+    dfs = []
+    for filepath in files:
+        df = pd.read_csv(filepath)
+        df["worker"] = int(_WORKER_REGEX.search(str(filepath)).group(1))
+        dfs.append(df)
+
+    if not dfs:
+        raise FileNotFoundError("No Locust progress file to load")
+
+    return pd.concat(dfs, ignore_index=True)
+
+
+def results_files(results_dest, suffix):
+    """
+    Returns the files of all the Locust workers of a local run.
+
+    Args:
+      results_dest: the RESULTS_DEST prefix of the files, eg: results/locust_scale_test
+      suffix: PROGRESS_SUFFIX or BUG_HITS_SUFFIX
+    """
+
+    return sorted(glob.glob(f"{results_dest}_worker*{suffix}"))
+
+
+def load_progress(files):
+    """
+    Loads the progress files of the Locust workers.
+
+    Args:
+      files: the paths of the *_worker<N>_progress.csv files
+
+    Returns:
+      a DataFrame with one row per event (type, user_name, user_index, step_name, start, stop, exception, worker),
+      with the start and stop as datetimes and the duration in seconds.
+    """
+
+    df = _load_csv_files(files)
+
+    df["duration"] = df["stop"] - df["start"]
+    df["start"] = pd.to_datetime(df["start"], unit="s")
+    df["stop"] = pd.to_datetime(df["stop"], unit="s")
+
+    return df.sort_values("start", ignore_index=True)
+
+
+def load_bug_hits(files):
+    """
+    Loads the bug hits files of the Locust workers.
+
+    Args:
+      files: the paths of the *_worker<N>_bug_hits.csv files
+
+    Returns:
+      a DataFrame with one row per bug hit (jira_id, user_name, timestamp, details, worker)
+    """
+
+    df = _load_csv_files(files)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+
+    return df.sort_values("timestamp", ignore_index=True)
+
+
+def step_summary(progress_df):
+    """
+    Returns the count, failures and duration percentiles of each of the steps.
+    """
+
+    steps = progress_df[progress_df["type"] == "STEP"]
+
+    return steps.groupby("step_name").agg(
+        count=("duration", "size"),
+        failures=("exception", "count"),
+        median=("duration", "median"),
+        p90=("duration", lambda d: d.quantile(0.9)),
+        max=("duration", "max"),
+    ).sort_values("median", ascending=False)
+
+
+def main(results_dest="results/locust_scale_test"):
+    progress_df = load_progress(results_files(results_dest, PROGRESS_SUFFIX))
+    logging.info(f"{len(progress_df)} events recorded by {progress_df['worker'].nunique()} workers, "
+                 f"for {progress_df[progress_df['type'] == 'STEP']['user_index'].nunique()} users.")
+
+    print(step_summary(progress_df).to_string(float_format="{:.2f}".format))
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+    sys.exit(main(*sys.argv[1:]))
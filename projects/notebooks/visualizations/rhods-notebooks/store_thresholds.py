@@ -5,13 +5,15 @@ from collections import defaultdict
 import logging
 import os, sys
 
+from topsail.visualizations import thresholds
+
 thresholds_cache = None
 
 def _parse_thresholds():
     global thresholds_cache
     if thresholds_cache is not None: return
 
-    thresholds_cache = []
+    thresholds_cache = thresholds.ThresholdIndex()
 
     filename = os.environ.get("MATBENCH_RHODS_NOTEBOOKS_UX_CONFIG")
     if not filename:
@@ -34,7 +36,7 @@ def _parse_thresholds():
         for threshold in visualization.get("thresholds", []):
             if "files" not in threshold:
                 # threshold entry is here, cache it
-                thresholds_cache.append([threshold["settings_selector"] or {}, threshold["thresholds"] or {}])
+                thresholds_cache.add(threshold["settings_selector"], threshold["thresholds"])
                 continue
 
             for filename in threshold["files"]:
@@ -42,9 +44,8 @@ def _parse_thresholds():
                 with open(fname.parent / filename) as f:
                     threshold_file_data = yaml.safe_load(f)
                     for threshold_file_entry in threshold_file_data:
-                        thresholds_cache.append(
-                            [threshold_file_entry["settings_selector"] or {},
-                             threshold_file_entry["thresholds"] or {}])
+                        thresholds_cache.add(threshold_file_entry["settings_selector"],
+                                             threshold_file_entry["thresholds"])
 
     if not thresholds_cache:
         logging.info(f"No threshold found in {filename}|{config_id}.")
@@ -52,13 +53,4 @@ def _parse_thresholds():
 def get_thresholds(entry_settings):
     _parse_thresholds()
 
-    entry_thresholds = {}
-
-    for threshold_settings, threshold_values in thresholds_cache:
-        for threshold_setting_key, threshold_setting_value in threshold_settings.items():
-            if not str(entry_settings.get(threshold_setting_key)) == str(threshold_setting_value):
-                break
-        else: # no incompatible settings found, save the threshold
-            entry_thresholds.update(threshold_values)
-
-    return entry_thresholds
+    return thresholds_cache.get(entry_settings)
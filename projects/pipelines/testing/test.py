@@ -89,9 +89,9 @@ def uninstall_ocp_pipelines():
 
 
     webhooks_cmd = run.run("oc get validatingwebhookconfigurations,mutatingwebhookconfigurations -oname | grep tekton.dev", capture_stdout=True, check=False)
-    for webhook in webhooks_cmd.stdout.split("\n"):
-        if not webhook: continue # empty lines
-        run.run(f"oc delete {webhook}")
+    run.gather([f"oc delete {webhook}" for webhook in webhooks_cmd.stdout.split("\n")
+                if webhook], # skip the empty lines
+               max_concurrency=10)
 
 
 def create_dsp_application():
@@ -247,7 +247,7 @@ def prepare_test_driver_namespace():
     # Prepare the container image
     #
 
-    istag = config.get_command_arg("cluster", "build_push_image --prefix base_image", "_istag")
+    istag = config.get_command_arg("cluster", "build_push_image", "_istag", prefix="base_image")
 
     if run.run(f"oc get istag {istag} -n {namespace} -oname 2>/dev/null", check=False).returncode == 0:
         logging.info(f"Image {istag} already exists in namespace {namespace}. Don't build it.")
@@ -7,6 +7,8 @@ import fnmatch
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+from topsail.visualizations import parallel_parse
+
 from . import parsers
 from .. import models
 
@@ -146,12 +148,11 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 def parse_data():
     # delegate the parsing to the simple_store
     store.register_custom_rewrite_settings(_rewrite_settings)
-    store_simple.register_custom_parse_results(_parse_directory)
 
     from . import lts
     store_simple.register_custom_build_lts_payloads(lts.build_lts_payloads)
 
-    return store_simple.parse_data()
+    return parallel_parse.parse_data(_parse_directory)
 
 
 def build_lts_payloads():
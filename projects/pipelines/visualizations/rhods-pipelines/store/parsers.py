@@ -1,4 +1,5 @@
 import types
+import functools
 import pathlib
 import logging
 import yaml
@@ -8,7 +9,8 @@ import datetime
 from collections import defaultdict
 import uuid
 
-import jsonpath_ng
+from topsail.testing import jsonpath_cache
+from topsail.visualizations import k8s_list, k8s_parsing, prom_metrics
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store.prom_db as store_prom_db
@@ -18,7 +20,6 @@ from . import prom as rhods_pipelines_prom
 
 register_important_file = None # will be when importing store/__init__.py
 
-K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
@@ -144,22 +145,21 @@ def _parse_test_config(dirname):
         logging.error("Config file '{filename}' is empty ...")
         yaml_file = test_config.yaml_file = {}
 
-    def get(key, missing=...):
-        nonlocal yaml_file
-        jsonpath_expression = jsonpath_ng.parse(f'$.{key}')
+    # not a closure, so that test_config can be pickled by the parallel parser
+    test_config.get = functools.partial(_get_test_config_value, yaml_file, filename)
 
-        match = jsonpath_expression.find(yaml_file)
-        if not match:
-            if missing != ...:
-                return missing
+    return test_config
 
-            raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-        return match[0].value
+def _get_test_config_value(yaml_file, filename, key, missing=...):
+    match = jsonpath_cache.find(yaml_file, f'$.{key}')
+    if not match:
+        if missing != ...:
+            return missing
 
-    test_config.get = get
+        raise KeyError(f"Key '{key}' not found in {filename} ...")
 
-    return test_config
+    return match[0]
 
 
 def _extract_rhods_cluster_info(nodes_info):
@@ -231,7 +231,7 @@ def _parse_rhods_info(dirname):
         rhods_info.createdAt_raw = f.read().strip()
 
     try:
-        rhods_info.createdAt = datetime.datetime.strptime(rhods_info.createdAt_raw, K8S_TIME_FMT)
+        rhods_info.createdAt = k8s_parsing.parse_time(rhods_info.createdAt_raw)
     except ValueError as e:
         logging.error("Couldn't parse RHODS version timestamp: {e}")
         rhods_info.createdAt = None
@@ -320,15 +320,11 @@ def _parse_tester_job(dirname):
         job = yaml.safe_load(f)
 
     job_info.creation_time = \
-        datetime.datetime.strptime(
-            job["status"]["startTime"],
-            K8S_TIME_FMT)
+        k8s_parsing.parse_time(job["status"]["startTime"])
 
     if job["status"].get("completionTime"):
         job_info.completion_time = \
-            datetime.datetime.strptime(
-                job["status"]["completionTime"],
-                K8S_TIME_FMT)
+            k8s_parsing.parse_time(job["status"]["completionTime"])
     else:
         job_info.completion_time = job_info.creation_time + datetime.timedelta(hours=1)
 
@@ -351,18 +347,7 @@ def _extract_metrics(dirname):
         "driver": ("000__local_ci__run_multi/prometheus_ocp.t*", rhods_pipelines_prom.get_driver_metrics()),
     }
 
-    metrics = {}
-    for name, (tarball_glob, metric) in METRICS.items():
-        try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
-        except IndexError:
-            logging.warning(f"No {tarball_glob} in '{dirname}'.")
-            continue
-
-        register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
-
-    return metrics
+    return prom_metrics.extract_metrics(dirname, METRICS, register_important_file)
 
 @ignore_file_not_found
 def _parse_artifacts_version(dirname):
@@ -406,15 +391,14 @@ def _parse_pod_times(dirname, ci_pod_dir):
         pod_time.pod_namespace = pod["metadata"]["namespace"]
         pod_time.hostname = pod["spec"].get("nodeName")
 
-        pod_time.creation_time = datetime.datetime.strptime(
-                pod["metadata"]["creationTimestamp"], K8S_TIME_FMT)
+        pod_time.creation_time = k8s_parsing.parse_time(pod["metadata"]["creationTimestamp"])
 
         start_time_str = pod["status"].get("startTime")
         pod_time.start_time = None if not start_time_str else \
-            datetime.datetime.strptime(start_time_str, K8S_TIME_FMT)
+            k8s_parsing.parse_time(start_time_str)
 
         for condition in pod["status"].get("conditions", []):
-            last_transition = datetime.datetime.strptime(condition["lastTransitionTime"], K8S_TIME_FMT)
+            last_transition = k8s_parsing.parse_time(condition["lastTransitionTime"])
 
             if condition["type"] == "ContainersReady":
                 pod_time.containers_ready = last_transition
@@ -426,9 +410,7 @@ def _parse_pod_times(dirname, ci_pod_dir):
 
         for containerStatus in pod["status"].get("containerStatuses", []):
             try:
-                finishedAt =  datetime.datetime.strptime(
-                    containerStatus["state"]["terminated"]["finishedAt"],
-                    K8S_TIME_FMT)
+                finishedAt =  k8s_parsing.parse_time(containerStatus["state"]["terminated"]["finishedAt"])
             except KeyError: continue
 
             # take the last container_finished found
@@ -463,15 +445,11 @@ def _parse_resource_times(dirname, ci_pod_dir):
         print(f"Parsing {fname} ...")
         file_path = (ci_pod_dir / "004__pipelines__capture_state" / fname).resolve().relative_to(dirname)
 
-        with open(register_important_file(dirname, file_path)) as f:
-            data = yaml.safe_load(f)
-
-        for item in data["items"]:
+        for item in k8s_list.iter_items(register_important_file(dirname, file_path)):
             metadata = item["metadata"]
 
             kind = item["kind"]
-            creationTimestamp = datetime.datetime.strptime(
-                metadata["creationTimestamp"], K8S_TIME_FMT)
+            creationTimestamp = k8s_parsing.parse_time(metadata["creationTimestamp"])
 
             name = metadata["name"]
             generate_name, found, suffix = name.rpartition("-")
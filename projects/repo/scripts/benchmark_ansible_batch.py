@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+
+# This script measures the time saved by running multiple toolbox
+# commands from a single `ansible-playbook` process (with
+# topsail._common.RunAnsibleRoles), instead of one process per command.
+#
+# The commands run a temporary no-op role, so the measurement only
+# includes the Ansible startup, inventory and collections loading
+# costs (not the `run_toolbox.py` startup, which the batch saves too).
+
+import os
+import sys
+import json
+import tempfile
+import pathlib
+import subprocess
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+SCRIPT_THIS_DIR = pathlib.Path(__file__).absolute().parent
+TOPSAIL_DIR = SCRIPT_THIS_DIR.parent.parent.parent
+
+ROLE_NAME = "benchmark_noop"
+
+MODES = ("sequential", "batch")
+
+MEASURE_CODE = """
+import sys, json, time, pathlib
+from topsail import _common
+
+@_common.AnsibleRole("{role_name}")
+@_common.AnsibleMappedParams
+def noop(self, index):
+    return _common.RunAnsibleRole(locals())
+
+mode, count, result_file = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+runnables = [noop(None, index) for index in range(count)]
+
+start = time.perf_counter()
+if mode == "batch":
+    ret = _common.RunAnsibleRoles(runnables).run(dict(os.environ))
+else:
+    ret = 0
+    for runnable in runnables:
+        try:
+            runnable._run()
+        except SystemExit as e:
+            ret = ret or e.code
+duration = time.perf_counter() - start
+
+with open(result_file, "w") as f:
+    json.dump(dict(ret=ret, duration=duration), f)
+"""
+
+
+def generate_role(roles_dir):
+    tasks_dir = roles_dir / ROLE_NAME / "tasks"
+    tasks_dir.mkdir(parents=True)
+    with open(tasks_dir / "main.yml", "w") as f:
+        print(f"""---
+- name: Do nothing
+  debug: msg="{{{{ {ROLE_NAME}_index }}}}"
+""", file=f)
+
+
+def measure(mode, count, tmp_dir):
+    env = os.environ.copy()
+    env["ARTIFACT_DIR"] = str(tmp_dir / mode)
+    env["ANSIBLE_ROLES_PATH"] = str(tmp_dir / "roles")
+    env.pop("ARTIFACT_EXTRA_LOGS_DIR", None)
+
+    result_file = tmp_dir / f"{mode}.json"
+    subprocess.run([sys.executable, "-c", "import os\n" + MEASURE_CODE.format(role_name=ROLE_NAME), mode, str(count), str(result_file)],
+                   env=env, cwd=TOPSAIL_DIR, stdout=subprocess.DEVNULL, check=True)
+
+    with open(result_file) as f:
+        return json.load(f)
+
+
+def main(count=5):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = pathlib.Path(tmp_dir)
+        generate_role(tmp_dir / "roles")
+
+        results = {mode: measure(mode, count, tmp_dir) for mode in MODES}
+
+    for mode, result in results.items():
+        if result["ret"] != 0:
+            logging.error(f"{mode}: the commands failed (ret={result['ret']})")
+            return 1
+
+        logging.info(f"{mode:>10s}: {result['duration']:.2f}s for {count} commands, {result['duration']/count:.2f}s per command")
+
+    saved = (results["sequential"]["duration"] - results["batch"]["duration"]) / count
+    logging.info(f"The batch saves {saved:.2f}s per command.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
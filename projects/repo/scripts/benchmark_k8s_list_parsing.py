@@ -0,0 +1,94 @@
+#! /usr/bin/env python
+
+# This script measures the peak memory usage (RSS) of parsing a large
+# Kubernetes pod list, with `json.load` and with the streaming
+# iterator of topsail.visualizations.k8s_list.
+
+import sys
+import json
+import tempfile
+import pathlib
+import subprocess
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+SCRIPT_THIS_DIR = pathlib.Path(__file__).absolute().parent
+TOPSAIL_DIR = SCRIPT_THIS_DIR.parent.parent.parent
+
+MODES = {
+    "baseline": "pods = []",
+    "json.load": "pods = json.load(open(sys.argv[1]))['items']",
+    "streaming": "pods = k8s_list.iter_items(sys.argv[1])",
+}
+
+# VmHWM is the peak RSS of the process. Unlike ru_maxrss, it isn't
+# inherited from the (forked) parent process.
+MEASURE_CODE = """
+import sys, json, time
+from topsail.visualizations import k8s_list
+start = time.perf_counter()
+{mode}
+count = sum(1 for pod in pods if pod["status"].get("startTime"))
+duration = time.perf_counter() - start
+with open("/proc/self/status") as f:
+    maxrss_kb = int(next(line for line in f if line.startswith("VmHWM:")).split()[1])
+print(json.dumps(dict(count=count, duration=duration, maxrss_kb=maxrss_kb)))
+"""
+
+
+def generate_pod_list(dest, pod_count):
+    def pod(idx):
+        return dict(
+            apiVersion="v1",
+            kind="Pod",
+            metadata=dict(
+                name=f"user-{idx:05d}-0",
+                namespace=f"benchmark-u{idx}",
+                creationTimestamp="2023-10-18T12:00:00Z",
+                labels={f"label-{i}": f"value-{i}" for i in range(20)},
+                annotations={f"annotation-{i}": "x" * 200 for i in range(10)},
+            ),
+            spec=dict(
+                nodeName=f"node-{idx % 50}",
+                containers=[dict(name=f"container-{i}", image="quay.io/example/image:latest",
+                                 env=[dict(name=f"ENV_{j}", value="y" * 50) for j in range(30)])
+                            for i in range(3)],
+            ),
+            status=dict(
+                startTime="2023-10-18T12:00:05Z",
+                conditions=[dict(type=t, status="True", lastTransitionTime="2023-10-18T12:00:10Z")
+                            for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")],
+            ),
+        )
+
+    with open(dest, "w") as f:
+        json.dump(dict(apiVersion="v1", kind="List", metadata={},
+                       items=[pod(idx) for idx in range(pod_count)]), f, indent=4)
+
+
+def measure(mode, filename):
+    proc = subprocess.run([sys.executable, "-c", MEASURE_CODE.format(mode=MODES[mode]), str(filename)],
+                          cwd=TOPSAIL_DIR, stdout=subprocess.PIPE, check=True)
+
+    return json.loads(proc.stdout)
+
+
+def main(pod_count=5000):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = pathlib.Path(tmp_dir) / "pods.json"
+        generate_pod_list(filename, pod_count)
+        logging.info(f"Generated {pod_count} pods in {filename} ({filename.stat().st_size/1024/1024:.1f} MB)")
+
+        results = {mode: measure(mode, filename) for mode in MODES}
+
+    baseline = results.pop("baseline")["maxrss_kb"]
+    for mode, result in results.items():
+        logging.info(f"{mode:>10s}: peak RSS={result['maxrss_kb']/1024:.1f} MB "
+                     f"(+{(result['maxrss_kb'] - baseline)/1024:.1f} MB over the interpreter), "
+                     f"duration={result['duration']:.2f}s, {result['count']} pods")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
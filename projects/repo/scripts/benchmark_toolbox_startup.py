@@ -0,0 +1,52 @@
+#! /usr/bin/env python
+
+# This script measures the cold-start time of the toolbox, with the
+# lazy (index-based) and the eager (import everything) group loading.
+
+import os
+import sys
+import time
+import pathlib
+import subprocess
+import statistics
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+SCRIPT_THIS_DIR = pathlib.Path(__file__).absolute().parent
+TOPSAIL_DIR = SCRIPT_THIS_DIR.parent.parent.parent
+
+DEFAULT_COMMAND = "cluster capture_environment --help"
+
+
+def measure(command, repeat, eager):
+    env = os.environ.copy()
+    env["TOPSAIL_TOOLBOX_EAGER_LOAD"] = "1" if eager else "0"
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(TOPSAIL_DIR / "run_toolbox.py"), *command.split()],
+                       env=env, cwd=TOPSAIL_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def main(command=DEFAULT_COMMAND, repeat=5):
+    # warm-up run, to generate the toolbox index if needed
+    measure(command, 1, eager=False)
+
+    results = {}
+    for name, eager in (("eager", True), ("lazy", False)):
+        timings = measure(command, repeat, eager)
+        results[name] = statistics.median(timings)
+        logging.info(f"{name:>5s}: median={results[name]:.3f}s min={min(timings):.3f}s max={max(timings):.3f}s ({repeat} runs)")
+
+    logging.info(f"'run_toolbox.py {command}': {results['eager']/results['lazy']:.1f}x faster with the lazy loading")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#! /usr/bin/env python
+
+# This script stresses the artifact directory allocator of
+# topsail.testing.env, with many processes and threads allocating
+# NNN__name directories concurrently in the same artifact directory,
+# and checks that no index has been allocated twice.
+
+import sys
+import time
+import pathlib
+import tempfile
+import concurrent.futures
+import multiprocessing
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+SCRIPT_THIS_DIR = pathlib.Path(__file__).absolute().parent
+TOPSAIL_DIR = SCRIPT_THIS_DIR.parent.parent.parent
+
+# directories created before the allocator is used, like with the older toolbox versions
+PREEXISTING_DIRS = 3
+
+
+def allocate(args):
+    dirname, process_idx, threads, allocations = args
+
+    sys.path.insert(0, str(TOPSAIL_DIR))
+    from topsail.testing import env
+
+    def allocate_thread(thread_idx):
+        return [env.allocate_artifact_dir(f"p{process_idx}_t{thread_idx}_{idx}", dirname).name
+                for idx in range(allocations)]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        return sum(executor.map(allocate_thread, range(threads)), [])
+
+
+def main(processes=8, threads=8, allocations=50):
+    processes, threads, allocations = int(processes), int(threads), int(allocations)
+    expected = processes * threads * allocations
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dirname = pathlib.Path(tmp_dir)
+        for idx in range(PREEXISTING_DIRS):
+            (dirname / f"{idx:03d}__preexisting").mkdir()
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(processes) as pool:
+            names = sum(pool.map(allocate, [(dirname, idx, threads, allocations) for idx in range(processes)]), [])
+        duration = time.perf_counter() - start
+
+        created = len(list(dirname.glob("*__*")))
+
+    indexes = [int(name.partition("__")[0]) for name in names]
+    duplicates = len(indexes) - len(set(indexes))
+
+    logging.info(f"{len(names)} directories allocated by {processes} processes x {threads} threads "
+                 f"in {duration:.2f}s ({duration / len(names) * 1000 * 1000:.0f}us per allocation)")
+
+    errors = []
+    if len(names) != expected:
+        errors.append(f"{len(names)} directories allocated, expected {expected}")
+    if duplicates:
+        errors.append(f"{duplicates} indexes allocated more than once")
+    if sorted(indexes) != list(range(PREEXISTING_DIRS, PREEXISTING_DIRS + expected)):
+        errors.append(f"the indexes aren't contiguous from {PREEXISTING_DIRS}")
+    if created != expected + PREEXISTING_DIRS:
+        errors.append(f"{created} directories found, expected {expected + PREEXISTING_DIRS}")
+
+    for error in errors:
+        logging.error(error)
+
+    if errors:
+        return 1
+
+    logging.info("No collision.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -0,0 +1,170 @@
+#! /usr/bin/env python
+
+# This script aggregates the task timings recorded by the task_timings
+# callback plugin (`_ansible.task_timings.jsonl` files) of an
+# ARTIFACT_DIR tree, and generates:
+# - a report of the time spent per toolbox command, per role and per task,
+# - a flame-graph of the time spent, in the 'folded stacks' format
+#   (`command;...;role;task duration_ms`), which can be rendered with
+#   flamegraph.pl or speedscope.
+
+import os
+import sys
+import json
+import pathlib
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+TIMINGS_FILENAME = "_ansible.task_timings.jsonl"
+REPORT_FILENAME = "task_timings_report.txt"
+FLAMEGRAPH_FILENAME = "task_timings.folded"
+
+NO_ROLE = "(playbook)"
+
+
+def load_timings(artifact_dir):
+    """
+    Yields the task timings of all the toolbox commands of artifact_dir.
+    The `command` field is the path of the command's artifacts directory, relative to artifact_dir.
+
+    The commands batched in a single ansible-playbook process share the timings file of the batch
+    directory. Their timings are attributed with the `artifact_extra_logs_dir` of their play, which
+    is a sibling of the batch directory.
+    """
+
+    for timings_file in sorted(artifact_dir.rglob(TIMINGS_FILENAME)):
+        file_command = str(timings_file.parent.relative_to(artifact_dir))
+
+        with open(timings_file) as f:
+            for line in f:
+                if not line.strip(): continue
+                try:
+                    timing = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Invalid line in {timings_file}, ignoring the rest of the file.")
+                    break # truncated last line, the command was interrupted
+
+                command = file_command
+                if play_dir := timing.get("artifact_extra_logs_dir"):
+                    # the path was recorded where the command ran, only its name is relevant here
+                    command = str((timings_file.parent.parent / pathlib.PurePath(play_dir).name).relative_to(artifact_dir))
+
+                timing["command"] = command
+                timing["role"] = timing.get("role") or NO_ROLE
+
+                yield timing
+
+
+class Aggregate(object):
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.loop_items = 0
+        self.attempts = 0
+        self.failed = 0
+
+    def add(self, timing):
+        self.count += 1
+        self.total += timing["duration"]
+        self.max = max(self.max, timing["duration"])
+        self.loop_items += timing.get("loop_items", 0)
+        self.attempts += timing.get("attempts", 1)
+        if timing.get("status") == "FAILED":
+            self.failed += 1
+
+
+def aggregate(timings, key):
+    aggregates = {}
+    for timing in timings:
+        aggregates.setdefault(key(timing), Aggregate()).add(timing)
+
+    return sorted(aggregates.items(), key=lambda item: item[1].total, reverse=True)
+
+
+def _duration(seconds):
+    if seconds >= 60:
+        return f"{seconds // 60:.0f}m{seconds % 60:04.1f}s"
+
+    return f"{seconds:.1f}s"
+
+
+def generate_report(timings, top):
+    total = sum(timing["duration"] for timing in timings)
+
+    lines = []
+    lines.append(f"{len(timings)} task executions in {len(set(timing['command'] for timing in timings))} toolbox commands, "
+                 f"{_duration(total)} in total.")
+
+    def table(title, aggregates, extra_columns=False):
+        lines.append("")
+        lines.append(title)
+        header = f"{'total':>10} {'%':>5} {'count':>6} {'max':>10}"
+        if extra_columns:
+            header += f" {'items':>6} {'tries':>6} {'failed':>6}"
+        lines.append(header)
+
+        for name, agg in aggregates[:top]:
+            line = f"{_duration(agg.total):>10} {agg.total / total * 100 if total else 0:5.1f} {agg.count:6d} {_duration(agg.max):>10}"
+            if extra_columns:
+                line += f" {agg.loop_items:6d} {agg.attempts:6d} {agg.failed:6d}"
+            lines.append(f"{line}  {name}")
+
+        if len(aggregates) > top:
+            lines.append(f"... {len(aggregates) - top} more")
+
+    table("Time per toolbox command:", aggregate(timings, lambda timing: timing["command"]))
+    table("Time per role:", aggregate(timings, lambda timing: timing["role"]))
+    table("Time per task:", aggregate(timings, lambda timing: f"{timing['role']} : {timing['task']}"), extra_columns=True)
+
+    return "\n".join(lines)
+
+
+def _frame(name):
+    # ';' separates the frames of the folded stacks
+    return name.replace(";", ":").replace("\n", " ")
+
+
+def generate_flamegraph(timings):
+    stacks = {}
+    for timing in timings:
+        frames = list(pathlib.Path(timing["command"]).parts) + [timing["role"], timing["task"]]
+        stack = ";".join(map(_frame, frames))
+        stacks[stack] = stacks.get(stack, 0) + timing["duration"]
+
+    return "\n".join(f"{stack} {duration * 1000:.0f}" for stack, duration in stacks.items())
+
+
+def main(artifact_dir=None, output_dir=None, top=25):
+    if artifact_dir is None:
+        artifact_dir = os.environ.get("ARTIFACT_DIR")
+        if artifact_dir is None:
+            logging.error("No artifact_dir given, and ARTIFACT_DIR isn't set.")
+            return 1
+
+    artifact_dir = pathlib.Path(artifact_dir)
+    output_dir = pathlib.Path(output_dir) if output_dir else artifact_dir
+
+    timings = list(load_timings(artifact_dir))
+    if not timings:
+        logging.error(f"No {TIMINGS_FILENAME} file found in {artifact_dir}.")
+        return 1
+
+    report = generate_report(timings, int(top))
+    print(report)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / REPORT_FILENAME, "w") as f:
+        print(report, file=f)
+
+    with open(output_dir / FLAMEGRAPH_FILENAME, "w") as f:
+        print(generate_flamegraph(timings), file=f)
+
+    logging.info(f"Report saved in {output_dir / REPORT_FILENAME}")
+    logging.info(f"Flame-graph stacks saved in {output_dir / FLAMEGRAPH_FILENAME}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -6,6 +6,11 @@ import topsail
 from projects.repo.scripts.validate_role_files import main as role_files_main
 from projects.repo.scripts.validate_role_vars_used import main as role_vars_used_main
 import projects.repo.scripts.ansible_default_config
+import projects.repo.scripts.benchmark_toolbox_startup
+import projects.repo.scripts.benchmark_k8s_list_parsing
+import projects.repo.scripts.task_timings
+import projects.repo.scripts.benchmark_ansible_batch
+import projects.repo.scripts.stress_artifact_dir_allocator
 
 TOOLBOX_THIS_DIR = pathlib.Path(__file__).absolute().parent
 PROJECT_DIR = TOOLBOX_THIS_DIR.parent
@@ -56,3 +61,66 @@ class Repo:
         """
         projects.repo.scripts.ansible_default_config.generate_all(topsail.Toolbox())
         exit(0)
+
+    @staticmethod
+    def generate_toolbox_index():
+        """
+        Regenerate the toolbox index used to lazily load the toolbox groups.
+        """
+        topsail.generate_toolbox_index()
+        exit(0)
+
+    @staticmethod
+    def benchmark_toolbox_startup(command="cluster capture_environment --help", repeat=5):
+        """
+        Measure the cold-start time of the toolbox, with the lazy and eager group loading.
+
+        Args:
+          command: the toolbox command to launch
+          repeat: the number of times the command should be launched
+        """
+        exit(projects.repo.scripts.benchmark_toolbox_startup.main(command, repeat))
+
+    @staticmethod
+    def benchmark_k8s_list_parsing(pod_count=5000):
+        """
+        Measure the peak memory usage of parsing a large Kubernetes pod list, with and without streaming.
+
+        Args:
+          pod_count: the number of pods in the synthetic pod list
+        """
+        exit(projects.repo.scripts.benchmark_k8s_list_parsing.main(pod_count))
+
+    @staticmethod
+    def benchmark_ansible_batch(count=5):
+        """
+        Measure the time saved by running multiple commands from a single ansible-playbook process.
+
+        Args:
+          count: the number of (no-op) commands to run, one by one and in a batch
+        """
+        exit(projects.repo.scripts.benchmark_ansible_batch.main(count))
+
+    @staticmethod
+    def analyze_task_timings(artifact_dir=None, output_dir=None, top=25):
+        """
+        Aggregate the Ansible task timings of an ARTIFACT_DIR tree into a per-command, per-role and per-task latency report, and a flame-graph.
+
+        Args:
+          artifact_dir: the directory to walk. Default: $ARTIFACT_DIR.
+          output_dir: the directory where the report and the flame-graph (folded stacks) are saved. Default: artifact_dir.
+          top: the number of entries of each section of the report
+        """
+        exit(projects.repo.scripts.task_timings.main(artifact_dir, output_dir, top))
+
+    @staticmethod
+    def stress_artifact_dir_allocator(processes=8, threads=8, allocations=50):
+        """
+        Allocate artifact directories concurrently from many processes and threads, and check that no index is allocated twice.
+
+        Args:
+          processes: the number of processes allocating directories
+          threads: the number of threads of each process
+          allocations: the number of directories allocated by each thread
+        """
+        exit(projects.repo.scripts.stress_artifact_dir_allocator.main(processes, threads, allocations))
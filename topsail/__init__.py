@@ -3,31 +3,142 @@ import pathlib
 import importlib
 import itertools
 import logging
+import json
+
+TOP_DIR = pathlib.Path(__file__).resolve().parent.parent
+
+# The toolbox index maps the group names to their module, and lists
+# the commands of each group. It allows importing only the group
+# requested on the command-line, instead of all the toolbox modules.
+TOOLBOX_INDEX_VERSION = 1
+TOOLBOX_INDEX_FILE = pathlib.Path(os.environ.get("TOPSAIL_TOOLBOX_INDEX", TOP_DIR / ".toolbox_index.json"))
+
+
+def _toolbox_files():
+    return sorted(itertools.chain((TOP_DIR / "projects").glob("*/toolbox/*.py"), (TOP_DIR / "topsail").glob("*.py")))
+
+
+def _toolbox_sources(toolbox_files):
+    sources = {}
+    for toolbox_file in toolbox_files:
+        stat = toolbox_file.stat()
+        sources[str(toolbox_file.relative_to(TOP_DIR))] = [stat.st_mtime_ns, stat.st_size]
+
+    return sources
+
+
+def _index_toolbox_file(toolbox_file):
+    import ast
+
+    project_toolbox_module = str(toolbox_file.relative_to(TOP_DIR).with_suffix("")).replace(os.path.sep, ".")
+    toolbox_name = toolbox_file.with_suffix("").name
+
+    tree = ast.parse(toolbox_file.read_text(), filename=str(toolbox_file))
+
+    for node in tree.body:
+        if not isinstance(node, ast.Assign): continue
+        if any(isinstance(target, ast.Name) and target.id == "__entrypoint" for target in node.targets):
+            return dict(module=project_toolbox_module, attr="__entrypoint", commands={})
+
+    class_name = toolbox_name.title()
+    for node in tree.body:
+        if not (isinstance(node, ast.ClassDef) and node.name == class_name): continue
+
+        commands = {}
+        for item in node.body:
+            if not isinstance(item, ast.FunctionDef) or item.name.startswith("_"): continue
+
+            args = [arg.arg for arg in item.args.posonlyargs + item.args.args + item.args.kwonlyargs]
+            if args and args[0] == "self":
+                args = args[1:]
+            commands[item.name] = args
+
+        return dict(module=project_toolbox_module, attr=class_name, commands=commands)
+
+    logging.fatal(f"module '{project_toolbox_module}' has no attribute '{class_name}'")
+    sys.exit(1)
+
+
+def generate_toolbox_index(save=True):
+    """
+    Generates the toolbox index, by parsing (not importing) the toolbox files.
+    """
+
+    toolbox_files = _toolbox_files()
+
+    groups = {}
+    for toolbox_file in toolbox_files:
+        toolbox_name = toolbox_file.with_suffix("").name
+        if toolbox_name.startswith("_"): continue
+
+        groups[toolbox_name] = _index_toolbox_file(toolbox_file)
+
+    index = dict(version=TOOLBOX_INDEX_VERSION,
+                 sources=_toolbox_sources(toolbox_files),
+                 groups=groups)
+
+    if save:
+        try:
+            tmp_file = TOOLBOX_INDEX_FILE.with_name(f".{TOOLBOX_INDEX_FILE.name}.{os.getpid()}")
+            with open(tmp_file, "w") as f:
+                json.dump(index, f, indent=4)
+            os.replace(tmp_file, TOOLBOX_INDEX_FILE)
+        except OSError as e:
+            logging.debug(f"Could not save the toolbox index in {TOOLBOX_INDEX_FILE}: {e}")
+
+    return index
+
+
+def load_toolbox_index():
+    """
+    Loads the toolbox index, and regenerates it if it is stale.
+    """
+
+    try:
+        with open(TOOLBOX_INDEX_FILE) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return generate_toolbox_index()
+
+    if index.get("version") != TOOLBOX_INDEX_VERSION \
+       or index.get("sources") != _toolbox_sources(_toolbox_files()):
+        return generate_toolbox_index()
+
+    return index
+
 
 class Toolbox:
     """
     The Topsail Toolbox
     """
 
-    def __init__(self):
+    def __init__(self, lazy=None):
+        if lazy is None:
+            lazy = os.environ.get("TOPSAIL_TOOLBOX_EAGER_LOAD") not in ("1", "y", "true")
+
+        self._index = load_toolbox_index()["groups"]
 
-        top_dir = pathlib.Path(__file__).resolve().parent.parent
+        if not lazy:
+            for toolbox_name in self._index:
+                getattr(self, toolbox_name)
 
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._index))
 
-        for toolbox_file in itertools.chain((top_dir / "projects").glob("*/toolbox/*.py"), (top_dir / "topsail").glob("*.py")):
+    def __getattr__(self, name):
+        # only called when the group hasn't been loaded yet
+        if name.startswith("_") or name not in self._index:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
 
-            project_toolbox_module = str(toolbox_file.relative_to(top_dir).with_suffix("")).replace(os.path.sep, ".")
-            mod = importlib.import_module(project_toolbox_module)
-            toolbox_name = toolbox_file.with_suffix("").name
+        entry = self._index[name]
+        mod = importlib.import_module(entry["module"])
 
-            if toolbox_name.startswith("_"): continue
+        try:
+            group = getattr(mod, entry["attr"])
+        except AttributeError as e:
+            logging.fatal(str(e)) # AttributeError: module 'projects.notebooks.toolbox.notebooks' has no attribute 'Notebooks'
+            sys.exit(1)
 
-            if hasattr(mod, "__entrypoint"):
-                self.__dict__[toolbox_name] = getattr(mod, "__entrypoint")
-                continue
+        self.__dict__[name] = group
 
-            try:
-                self.__dict__[toolbox_name] = getattr(mod, toolbox_name.title())
-            except AttributeError as e:
-                logging.fatal(str(e)) # AttributeError: module 'projects.notebooks.toolbox.notebooks' has no attribute 'Notebooks'
-                sys.exit(1)
+        return group
@@ -11,6 +11,8 @@ import inspect
 import shutil
 import shlex
 
+from topsail.testing import env as testing_env
+
 TOPSAIL_DIR = Path(__file__).resolve().parent.parent
 
 def AnsibleRole(role_name):
@@ -87,7 +89,17 @@ class RunAnsibleRole:
     def __str__(self):
         return ""
 
-    def _run(self):
+    def _prepare(self, env):
+        """
+        Computes the Ansible variables of the role, and prepares its artifacts directory.
+
+        Args:
+          env: the environment of the ansible-playbook process. ARTIFACT_DIR and ARTIFACT_EXTRA_LOGS_DIR are set in it.
+
+        Returns:
+          the artifacts directory of the role (artifact_extra_logs_dir)
+        """
+
         if not self.role_name:
             raise RuntimeError("Role not set :/")
 
@@ -104,9 +116,6 @@ class RunAnsibleRole:
             for constant in self.ansible_constants:
                 self.ansible_vars[f"{self.role_name}_{constant['name']}"] = constant["value"]
 
-        # do not modify the `os.environ` of this Python process
-        env = os.environ.copy()
-
         if env.get("ARTIFACT_DIR") is None:
             ci_artifact_base_dir = Path(env.get("CI_ARTIFACT_BASE_DIR", "/tmp"))
             env["ARTIFACT_DIR"] = str(ci_artifact_base_dir / f"ci-artifacts_{time.strftime('%Y%m%d')}")
@@ -121,11 +130,9 @@ class RunAnsibleRole:
             artifact_base_dirname = f"{self.group}__{self.command}" if self.group and self.command \
                 else "__".join(sys.argv[1:3])
 
-            previous_extra_count = len(list(artifact_dir.glob("*__*")))
+            name = f"{prefix}{artifact_base_dirname}{suffix}"
 
-            name = f"{previous_extra_count:03d}__{prefix}{artifact_base_dirname}{suffix}"
-
-            env["ARTIFACT_EXTRA_LOGS_DIR"] = str(Path(env["ARTIFACT_DIR"]) / name)
+            env["ARTIFACT_EXTRA_LOGS_DIR"] = str(testing_env.allocate_artifact_dir(name, artifact_dir))
 
         artifact_extra_logs_dir = Path(env["ARTIFACT_EXTRA_LOGS_DIR"])
         artifact_extra_logs_dir.mkdir(parents=True, exist_ok=True)
@@ -152,51 +159,18 @@ class RunAnsibleRole:
         print(f"Using '{artifact_extra_logs_dir}' to store extra log files.")
         self.ansible_vars["artifact_extra_logs_dir"] = str(artifact_extra_logs_dir)
 
-        if env.get("ANSIBLE_LOG_PATH") is None:
-            env["ANSIBLE_LOG_PATH"] = str(artifact_extra_logs_dir / "_ansible.log")
-        print(f"Using '{env['ANSIBLE_LOG_PATH']}' to store ansible logs.")
-        Path(env["ANSIBLE_LOG_PATH"]).parent.mkdir(parents=True, exist_ok=True)
-
-        if env.get("ANSIBLE_CACHE_PLUGIN_CONNECTION") is None:
-            env["ANSIBLE_CACHE_PLUGIN_CONNECTION"] = str(artifact_dir / "ansible_facts")
-        print(f"Using '{env['ANSIBLE_CACHE_PLUGIN_CONNECTION']}' to store ansible facts.")
-        Path(env["ANSIBLE_CACHE_PLUGIN_CONNECTION"]).parent.mkdir(parents=True, exist_ok=True)
+        return artifact_extra_logs_dir
 
-        # We configure the roles path dynamically appending them to the defaults
-        topsail_roles_list = []
-
-        if current_roles_path := env.get("ANSIBLE_ROLES_PATH"):
-            topsail_roles_list += [current_roles_path]
+    def _run(self):
+        # do not modify the `os.environ` of this Python process
+        env = os.environ.copy()
 
-        topsail_roles_list += [str(entry) for entry in (TOPSAIL_DIR / "projects").glob("*/roles")]
+        artifact_extra_logs_dir = self._prepare(env)
 
-        env["ANSIBLE_ROLES_PATH"] = os.pathsep.join(topsail_roles_list)
+        _configure_ansible_env(env, Path(env["ARTIFACT_DIR"]), artifact_extra_logs_dir)
         self.ansible_vars["roles_path"] = env["ANSIBLE_ROLES_PATH"]
-
-        # We configure the collections path dynamically
-        current_collections_paths = []
-        if (collect_path := env.get("ANSIBLE_COLLECTIONS_PATHS")) is not None:
-            current_collections_paths.append(str(collect_path))
-        for path in sys.path:
-            collections_path = Path(path) / 'ansible_collections'
-            if collections_path.exists():
-                current_collections_paths.append(str(collections_path))
-        env["ANSIBLE_COLLECTIONS_PATHS"] = os.pathsep.join(current_collections_paths)
         self.ansible_vars["collections_paths"] = env["ANSIBLE_COLLECTIONS_PATHS"]
 
-        if env.get("ANSIBLE_CONFIG") is None:
-            env["ANSIBLE_CONFIG"] = str(TOPSAIL_DIR / "config" / "ansible.cfg")
-        print(f"Using '{env['ANSIBLE_CONFIG']}' as ansible configuration file.")
-
-        if env.get("ANSIBLE_JSON_TO_LOGFILE") is None:
-            env["ANSIBLE_JSON_TO_LOGFILE"] = str(artifact_extra_logs_dir / "_ansible.log.json")
-        print(f"Using '{env['ANSIBLE_JSON_TO_LOGFILE']}' as ansible json log file.")
-
-        # the play file must be in the directory where the 'roles' are
-        tmp_play_file = tempfile.NamedTemporaryFile("w+",
-                                                    prefix="tmp_play_{}_".format(artifact_extra_logs_dir.name),
-                                                    suffix=".yaml",
-                                                    dir=os.getcwd(), delete=False)
         generated_play = [
             dict(name=f"Run {self.role_name} role",
                  connection="local",
@@ -207,40 +181,239 @@ class RunAnsibleRole:
                  )
         ]
 
-        generated_play_path = artifact_extra_logs_dir / "_ansible.play.yaml"
-        with open(generated_play_path, "w") as f:
-            yaml.dump(generated_play, f)
-        shutil.copy(generated_play_path, tmp_play_file.name)
+        ret = -1
+        try:
+            ret = _run_playbook(env, generated_play, artifact_extra_logs_dir)
+        finally:
+            if ret != 0:
+                extra_dir_name = Path(env['ARTIFACT_EXTRA_LOGS_DIR']).name
+                with open(artifact_extra_logs_dir / "FAILURE", "a") as f:
+                    print(f"[{extra_dir_name}] {' '.join(sys.argv)} --> {ret}", file=f)
+
+        raise SystemExit(ret)
+
+
+class RunAnsibleRoles:
+    """
+    Batched playbook runner
+
+    Runs the roles of multiple toolbox commands from a single
+    `ansible-playbook` process, so that the Ansible startup, inventory
+    and collections loading is paid only once.
+
+    Each command gets its own play, artifacts directory and variables,
+    like when it is launched with `run_toolbox.py` (so a `meta:
+    end_play` only ends the play of its command). The Ansible logs of
+    the batch are stored in a dedicated artifacts directory. The
+    commands run in order, and the batch stops at the first failure,
+    which is recorded in the FAILURE file of the command's directory
+    (and of the batch directory). The commands that were never reached
+    get a FAILURE file as well.
+
+    The Ansible log files of all the batched commands (`_ansible.log`,
+    `_ansible.log.json*` and `_ansible.task_timings.jsonl`) are in the
+    batch directory, not in the directories of the commands (where
+    `_ansible.batch_dir` points to the batch directory). The task
+    timings record the `artifact_extra_logs_dir` of their play, so
+    that `repo analyze_task_timings` attributes them to their command.
+
+    Args:
+      runnables: the RunAnsibleRole objects returned by the toolbox commands
+      name: the name of the batch artifacts directory
+      suffixes: optional list of ARTIFACT_TOOLBOX_NAME_SUFFIX values, one per runnable
+    """
+
+    def __init__(self, runnables, name="ansible_batch", suffixes=None):
+        self.runnables = list(runnables)
+        self.name = name
+        self.suffixes = suffixes or [None] * len(self.runnables)
 
-        cmd = ["ansible-playbook", "-vv", tmp_play_file.name]
+        if len(self.suffixes) != len(self.runnables):
+            raise ValueError(f"Expected {len(self.runnables)} suffixes, got {len(self.suffixes)}.")
 
-        with open(artifact_extra_logs_dir / "_ansible.env", "w") as f:
-            for k, v in env.items():
-                print(f"{k}={v}", file=f)
+    def __str__(self):
+        return ""
 
-        with open(artifact_extra_logs_dir / "_python.cmd", "w") as f:
-            print(" ".join(map(shlex.quote, sys.argv)), file=f)
+    def run(self, env):
+        """
+        Runs the batch.
 
-        sys.stdout.flush()
-        sys.stderr.flush()
+        Args:
+          env: the environment of the ansible-playbook process (a copy of os.environ)
+
+        Returns:
+          the return code of ansible-playbook
+        """
+
+        if env.get("ARTIFACT_DIR") is None:
+            ci_artifact_base_dir = Path(env.get("CI_ARTIFACT_BASE_DIR", "/tmp"))
+            env["ARTIFACT_DIR"] = str(ci_artifact_base_dir / f"ci-artifacts_{time.strftime('%Y%m%d')}")
+
+        artifact_dir = Path(env["ARTIFACT_DIR"])
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+
+        if env.get("ARTIFACT_EXTRA_LOGS_DIR") is None:
+            env["ARTIFACT_EXTRA_LOGS_DIR"] = str(testing_env.allocate_artifact_dir(self.name, artifact_dir))
+
+        batch_logs_dir = Path(env["ARTIFACT_EXTRA_LOGS_DIR"])
+        batch_logs_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Using '{batch_logs_dir}' to store the logs of the {len(self.runnables)} batched commands.")
+
+        _configure_ansible_env(env, artifact_dir, batch_logs_dir)
+
+        generated_play = []
+        commands = []
+        started_markers = []
+        for runnable, suffix in zip(self.runnables, self.suffixes):
+            role_env = {k: v for k, v in env.items() if k != "ARTIFACT_EXTRA_LOGS_DIR"}
+            if suffix is not None:
+                role_env["ARTIFACT_TOOLBOX_NAME_SUFFIX"] = suffix
+
+            artifact_extra_logs_dir = runnable._prepare(role_env)
+            runnable.ansible_vars["roles_path"] = env["ANSIBLE_ROLES_PATH"]
+            runnable.ansible_vars["collections_paths"] = env["ANSIBLE_COLLECTIONS_PATHS"]
+
+            with open(artifact_extra_logs_dir / "_ansible.batch_dir", "w") as f:
+                print(batch_logs_dir, file=f)
+
+            command = f"{runnable.group} {runnable.command}"
+            commands.append(f"{artifact_extra_logs_dir.name}: {command}")
+
+            started_marker = artifact_extra_logs_dir / "_ansible.batch_started"
+            started_markers.append((artifact_extra_logs_dir, command, started_marker))
+
+            # one play per command: a failed play leaves no host for the
+            # next ones (so the batch stops), and a `meta: end_play`
+            # only ends the play of its own command.
+            generated_play.append(dict(
+                name=f"Run {runnable.role_name} role ({artifact_extra_logs_dir.name})",
+                connection="local",
+                gather_facts=False,
+                hosts="localhost",
+                vars=runnable.ansible_vars,
+                tasks=[
+                    {"name": "Mark the command as started",
+                     "ansible.builtin.file": dict(path=str(started_marker), state="touch")},
+                    dict(
+                        name=f"Run {runnable.role_name} role",
+                        block=[{"ansible.builtin.import_role": dict(name=runnable.role_name)}],
+                        rescue=[
+                            {"name": "Mark the command as failed",
+                             "ansible.builtin.lineinfile": dict(
+                                 path=str(artifact_extra_logs_dir / "FAILURE"),
+                                 line=f"[{artifact_extra_logs_dir.name}] {command} --> failed in task '{{{{ ansible_failed_task.name }}}}'",
+                                 create=True),
+                             },
+                            {"name": "Stop the batch",
+                             "ansible.builtin.fail": dict(msg=f"{command} failed, stopping the batch.")},
+                        ],
+                    ),
+                ],
+            ))
+
+        with open(batch_logs_dir / "_ansible.batch.txt", "w") as f:
+            print("\n".join(commands), file=f)
 
         ret = -1
         try:
-            run_result = subprocess.run(cmd, env=env, check=False)
-            ret = run_result.returncode
-        except KeyboardInterrupt:
-            print("")
-            print("Interrupted :/")
-            sys.exit(1)
+            ret = _run_playbook(env, generated_play, batch_logs_dir)
         finally:
-            try:
-                os.remove(tmp_play_file.name)
-            except FileNotFoundError:
-                pass # play file was removed, ignore
-
             if ret != 0:
-                extra_dir_name = Path(env['ARTIFACT_EXTRA_LOGS_DIR']).name
+                with open(batch_logs_dir / "FAILURE", "a") as f:
+                    print(f"[{batch_logs_dir.name}] {self.name} batch --> {ret}", file=f)
+
+            for artifact_extra_logs_dir, command, started_marker in started_markers:
+                if started_marker.exists():
+                    continue
+
                 with open(artifact_extra_logs_dir / "FAILURE", "a") as f:
-                    print(f"[{extra_dir_name}] {' '.join(sys.argv)} --> {ret}", file=f)
+                    print(f"[{artifact_extra_logs_dir.name}] {command} --> not run, the {self.name} batch stopped before it ({ret})", file=f)
 
-        raise SystemExit(ret)
+        return ret
+
+    def _run(self):
+        # do not modify the `os.environ` of this Python process
+        raise SystemExit(self.run(os.environ.copy()))
+
+
+def _configure_ansible_env(env, artifact_dir, artifact_extra_logs_dir):
+    if env.get("ANSIBLE_LOG_PATH") is None:
+        env["ANSIBLE_LOG_PATH"] = str(artifact_extra_logs_dir / "_ansible.log")
+    print(f"Using '{env['ANSIBLE_LOG_PATH']}' to store ansible logs.")
+    Path(env["ANSIBLE_LOG_PATH"]).parent.mkdir(parents=True, exist_ok=True)
+
+    if env.get("ANSIBLE_CACHE_PLUGIN_CONNECTION") is None:
+        env["ANSIBLE_CACHE_PLUGIN_CONNECTION"] = str(artifact_dir / "ansible_facts")
+    print(f"Using '{env['ANSIBLE_CACHE_PLUGIN_CONNECTION']}' to store ansible facts.")
+    Path(env["ANSIBLE_CACHE_PLUGIN_CONNECTION"]).parent.mkdir(parents=True, exist_ok=True)
+
+    # We configure the roles path dynamically appending them to the defaults
+    topsail_roles_list = []
+
+    if current_roles_path := env.get("ANSIBLE_ROLES_PATH"):
+        topsail_roles_list += [current_roles_path]
+
+    topsail_roles_list += [str(entry) for entry in (TOPSAIL_DIR / "projects").glob("*/roles")]
+
+    env["ANSIBLE_ROLES_PATH"] = os.pathsep.join(topsail_roles_list)
+
+    # We configure the collections path dynamically
+    current_collections_paths = []
+    if (collect_path := env.get("ANSIBLE_COLLECTIONS_PATHS")) is not None:
+        current_collections_paths.append(str(collect_path))
+    for path in sys.path:
+        collections_path = Path(path) / 'ansible_collections'
+        if collections_path.exists():
+            current_collections_paths.append(str(collections_path))
+    env["ANSIBLE_COLLECTIONS_PATHS"] = os.pathsep.join(current_collections_paths)
+
+    if env.get("ANSIBLE_CONFIG") is None:
+        env["ANSIBLE_CONFIG"] = str(TOPSAIL_DIR / "config" / "ansible.cfg")
+    print(f"Using '{env['ANSIBLE_CONFIG']}' as ansible configuration file.")
+
+    if env.get("ANSIBLE_JSON_TO_LOGFILE") is None:
+        env["ANSIBLE_JSON_TO_LOGFILE"] = str(artifact_extra_logs_dir / "_ansible.log.json")
+    print(f"Using '{env['ANSIBLE_JSON_TO_LOGFILE']}' as ansible json log file.")
+
+    if env.get("ANSIBLE_TASK_TIMINGS_FILE") is None:
+        env["ANSIBLE_TASK_TIMINGS_FILE"] = str(artifact_extra_logs_dir / "_ansible.task_timings.jsonl")
+    print(f"Using '{env['ANSIBLE_TASK_TIMINGS_FILE']}' as ansible task timings file.")
+
+
+def _run_playbook(env, generated_play, artifact_extra_logs_dir):
+    # the play file must be in the directory where the 'roles' are
+    tmp_play_file = tempfile.NamedTemporaryFile("w+",
+                                                prefix="tmp_play_{}_".format(artifact_extra_logs_dir.name),
+                                                suffix=".yaml",
+                                                dir=os.getcwd(), delete=False)
+
+    generated_play_path = artifact_extra_logs_dir / "_ansible.play.yaml"
+    with open(generated_play_path, "w") as f:
+        yaml.dump(generated_play, f)
+    shutil.copy(generated_play_path, tmp_play_file.name)
+
+    cmd = ["ansible-playbook", "-vv", tmp_play_file.name]
+
+    with open(artifact_extra_logs_dir / "_ansible.env", "w") as f:
+        for k, v in env.items():
+            print(f"{k}={v}", file=f)
+
+    with open(artifact_extra_logs_dir / "_python.cmd", "w") as f:
+        print(" ".join(map(shlex.quote, sys.argv)), file=f)
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    try:
+        run_result = subprocess.run(cmd, env=env, check=False)
+    except KeyboardInterrupt:
+        print("")
+        print("Interrupted :/")
+        sys.exit(1)
+    finally:
+        try:
+            os.remove(tmp_play_file.name)
+        except FileNotFoundError:
+            pass # play file was removed, ignore
+
+    return run_result.returncode
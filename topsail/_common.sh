@@ -31,7 +31,9 @@ ARTIFACT_DIRNAME="${TOOLBOX_PATH//\//__}" # replace / by __
 mkdir -p "${ARTIFACT_DIR}"
 
 if [ -z "${ARTIFACT_EXTRA_LOGS_DIR:-}" ]; then
-    ARTIFACT_EXTRA_LOGS_DIR="${ARTIFACT_DIR}/$(printf '%03d' $(ls "${ARTIFACT_DIR}/" | grep __ | wc -l))__${ARTIFACT_DIRNAME}" # add ARTIFACT_DIR/date__
+    # allocates ARTIFACT_DIR/NNN__${ARTIFACT_DIRNAME}, see topsail.testing.env.allocate_artifact_dir
+    ARTIFACT_EXTRA_LOGS_DIR=$(PYTHONPATH="${TOP_DIR}" python3 -c 'import sys; from topsail.testing import env; print(env.allocate_artifact_dir(sys.argv[2], sys.argv[1]))' \
+                                  "${ARTIFACT_DIR}" "${ARTIFACT_DIRNAME}")
     export ARTIFACT_EXTRA_LOGS_DIR
 fi
 
@@ -70,6 +72,14 @@ fi
 
 echo "Using '${ANSIBLE_JSON_TO_LOGFILE}' as ansible json log file."
 
+# Ansible task timings
+
+if [ -z "${ANSIBLE_TASK_TIMINGS_FILE:-}" ]; then
+    export ANSIBLE_TASK_TIMINGS_FILE="${ARTIFACT_EXTRA_LOGS_DIR}/_ansible.task_timings.jsonl"
+fi
+
+echo "Using '${ANSIBLE_TASK_TIMINGS_FILE}' as ansible task timings file."
+
 ###
 
 echo ""
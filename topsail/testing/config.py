@@ -4,13 +4,11 @@ import os
 import pathlib
 import yaml
 import shutil
-import subprocess
 import threading
 
-import jsonpath_ng
-
 from . import env
 from . import run
+from . import jsonpath_cache
 
 VARIABLE_OVERRIDES_FILENAME = "variable_overrides"
 PR_ARG_KEY = "PR_POSITIONAL_ARG_"
@@ -36,6 +34,31 @@ class TempValue(object):
         return False # If we returned True here, any exception would be suppressed!
 
 
+class ConfigBatch(object):
+    """
+    Applies the configuration updates in memory, and writes the
+    configuration files only once, when the outermost batch exits.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+    def __enter__(self):
+        self.config._batch_depth += 1
+
+        return True
+
+    def __exit__(self, ex_type, ex_value, exc_traceback):
+        self.config._batch_depth -= 1
+
+        if self.config._batch_depth == 0:
+            # flush even if an exception occured, so that the files
+            # stay in sync with the in-memory configuration
+            self.config._flush_batch()
+
+        return False # If we returned True here, any exception would be suppressed!
+
+
 class Config:
     def __init__(self, config_path):
         self.config_path = config_path
@@ -48,6 +71,30 @@ class Config:
         with open(self.config_path) as config_f:
             self.config = yaml.safe_load(config_f)
 
+        self._batch_depth = 0
+        self._batch_config_dirty = False
+        self._batch_dump_command_args = False
+
+    def batch(self):
+        """
+        Returns a context where the set_config calls are applied in memory only.
+        The configuration files are written once, when leaving the context.
+        """
+        return ConfigBatch(self)
+
+    def _flush_batch(self):
+        config_dirty = self._batch_config_dirty
+        dump_command_args = self._batch_dump_command_args
+
+        self._batch_config_dirty = False
+        self._batch_dump_command_args = False
+
+        if config_dirty:
+            self._save_config()
+
+        if dump_command_args:
+            self.dump_command_args()
+
     def apply_local_config_overrides(self):
         TOPSAIL_PR_ARGS_KEY = "TOPSAIL_PR_ARGS"
         pr_args = os.environ.get(TOPSAIL_PR_ARGS_KEY)
@@ -71,7 +118,7 @@ class Config:
             logging.info(f"apply_config_overrides: {variable_overrides_path} does not exist, nothing to override.")
             return
 
-        with open(variable_overrides_path) as f:
+        with open(variable_overrides_path) as f, self.batch():
             for line in f.readlines():
                 if not line.strip():
                     continue
@@ -105,6 +152,10 @@ class Config:
         if not values:
             raise ValueError("Preset '{name}' does not exists")
 
+        with self.batch():
+            self._apply_preset(name, values)
+
+    def _apply_preset(self, name, values):
         presets = self.get_config("ci_presets.names") or []
         if not name in presets:
             self.set_config("ci_presets.names", presets + [name], dump_command_args=False)
@@ -126,7 +177,7 @@ class Config:
 
     def get_config(self, jsonpath, default_value=..., warn=True, print=True):
         try:
-            value = jsonpath_ng.parse(jsonpath).find(self.config)[0].value
+            value = jsonpath_cache.find(self.config, jsonpath)[0]
         except IndexError as ex:
             if default_value != ...:
                 if warn:
@@ -154,27 +205,36 @@ class Config:
 
         try:
             self.get_config(jsonpath, value) # will raise an exception if the jsonpath does not exist
-            jsonpath_ng.parse(jsonpath).update(self.config, value)
+            jsonpath_cache.update(self.config, jsonpath, value)
         except Exception as ex:
             logging.error(f"set_config: {jsonpath}={value} --> {ex}")
             raise
 
         logging.info(f"set_config: {jsonpath} --> {value}")
 
-        with open(self.config_path, "w") as f:
-            yaml.dump(self.config, f, indent=4, default_flow_style=False, sort_keys=False)
+        if self._batch_depth:
+            self._batch_config_dirty = True
+            self._batch_dump_command_args |= dump_command_args
+            return
+
+        self._save_config()
 
         if dump_command_args:
             self.dump_command_args()
 
-        if (shared_dir := os.environ.get("SHARED_DIR")) and (shared_dir_path := pathlib.Path(shared_dir)) and shared_dir_path.exists():
+    def _save_config(self):
+        _dump_yaml_atomic(self.config, self.config_path, indent=4, default_flow_style=False, sort_keys=False)
 
-            with open(shared_dir_path / "config.yaml", "w") as f:
-                yaml.dump(self.config, f, indent=4)
+        if (shared_dir := os.environ.get("SHARED_DIR")) and (shared_dir_path := pathlib.Path(shared_dir)) and shared_dir_path.exists():
+            _dump_yaml_atomic(self.config, shared_dir_path / "config.yaml", indent=4)
 
     def dump_command_args(self):
+        if self._batch_depth:
+            self._batch_dump_command_args = True
+            return
+
         try:
-            command_template = get_command_arg("dump", "config", None)
+            command_template = render_command_args()
         except Exception as e:
             import traceback
             with open(env.ARTIFACT_DIR / "command_args.yml", "w") as f:
@@ -182,16 +242,19 @@ class Config:
             logging.warning("Could not dump the command_args template.")
             return
 
-        with open(env.ARTIFACT_DIR / "command_args.yml", "w") as f:
+        tmp_path = env.ARTIFACT_DIR / ".command_args.yml.tmp"
+        with open(tmp_path, "w") as f:
             print(command_template, file=f)
+        os.replace(tmp_path, env.ARTIFACT_DIR / "command_args.yml")
 
     def apply_preset_from_pr_args(self):
-        for config_key in self.get_config("$", print=False).keys():
-            if not config_key.startswith(PR_ARG_KEY): continue
-            if config_key == f"{PR_ARG_KEY}0": continue
+        with self.batch():
+            for config_key in list(self.get_config("$", print=False).keys()):
+                if not config_key.startswith(PR_ARG_KEY): continue
+                if config_key == f"{PR_ARG_KEY}0": continue
 
-            for preset in self.get_config(config_key).strip().split(" "):
-                self.apply_preset(preset)
+                for preset in self.get_config(config_key).strip().split(" "):
+                    self.apply_preset(preset)
 
     def detect_apply_light_profile(self, profile, name_suffix="light"):
         job_name_safe = os.environ.get("JOB_NAME_SAFE", "")
@@ -247,25 +310,63 @@ def _set_config_environ(base_dir):
     return config_path
 
 
+def _get_command_args_file():
+    command_args_file = os.environ.get("CI_ARTIFACTS_FROM_COMMAND_ARGS_FILE")
+    if not command_args_file:
+        raise RuntimeError("CI_ARTIFACTS_FROM_COMMAND_ARGS_FILE must be set to resolve the command arguments.")
+
+    return command_args_file
+
+
+def _get_config_source():
+    if ci_artifacts:
+        return dict(config=ci_artifacts.config)
+
+    config_file = os.environ.get("CI_ARTIFACTS_FROM_CONFIG_FILE")
+    if not config_file:
+        raise RuntimeError("CI_ARTIFACTS_FROM_CONFIG_FILE must be set to resolve the command arguments.")
+
+    return dict(config_file=config_file)
+
+
+def render_command_args():
+    from projects.core.toolbox import from_config
+
+    return from_config.render_command_args(_get_command_args_file(), **_get_config_source()).strip()
+
+
 def get_command_arg(group, command, arg, prefix=None, suffix=None):
+    logging.info(f"get_command_arg: {group} {command} {arg}")
+
+    # resolved in-process, `run_toolbox.py from_config` is only used
+    # for running the roles.
+    from projects.core.toolbox import from_config
+
     try:
-        logging.info(f"get_command_arg: {group} {command} {arg}")
-        proc = run.run_toolbox_from_config(group, command, show_args=arg,
-                                           prefix=prefix, suffix=suffix,
-                                           check=True, run_kwargs=dict(capture_stdout=True, capture_stderr=True))
-    except subprocess.CalledProcessError as e:
-        logging.error(e.stderr.strip().encode("ascii", "ignore"))
+        command_args = from_config.get_command_args(group, command, prefix, suffix,
+                                                    command_args_file=_get_command_args_file(),
+                                                    **_get_config_source())
+        return str(command_args[arg]).strip()
+    except KeyError as e:
+        logging.error(f"get_command_arg: {group} {command} {arg}: {e}")
         raise
 
-    return proc.stdout.strip()
+
+def _dump_yaml_atomic(doc, path, **kwargs):
+    path = pathlib.Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        yaml.dump(doc, f, **kwargs)
+
+    os.replace(tmp_path, path)
 
 
 def set_jsonpath(config, jsonpath, value):
     get_jsonpath(config, jsonpath) # will raise an exception if the jsonpath does not exist
-    jsonpath_ng.parse(jsonpath).update(config, value)
+    jsonpath_cache.update(config, jsonpath, value)
 
 def get_jsonpath(config, jsonpath):
-    return jsonpath_ng.parse(jsonpath).find(config)[0].value
+    return jsonpath_cache.find(config, jsonpath)[0]
 
 
 def init(base_dir):
@@ -1,4 +1,6 @@
 import os
+import re
+import fcntl
 import pathlib
 import time
 import traceback
@@ -18,7 +20,9 @@ class MyThread(threading.Thread):
         self.parent_artifact_dict = None
 
     def start(self):
-        self.parent_artifact_dict = get_tls_artifact_dir()
+        # the parent thread may not have an ARTIFACT_DIR, eg the
+        # internal threads of concurrent.futures.ProcessPoolExecutor
+        self.parent_artifact_dict = getattr(_tls_artifact_dir, "val", None)
         super(MyThread, self).start()
 
     def run(self):
@@ -64,8 +68,7 @@ def init():
 
 
 def NextArtifactDir(name):
-    next_count = next_artifact_index()
-    dirname = get_tls_artifact_dir() / f"{next_count:03d}__{name}"
+    dirname = allocate_artifact_dir(name)
 
     return TempArtifactDir(dirname)
 
@@ -80,6 +83,11 @@ class TempArtifactDir(object):
         os.environ["ARTIFACT_DIR"] = str(self.dirname)
         self.dirname.mkdir(exist_ok=True)
 
+        # the NNN index may have been chosen by the caller,
+        # make sure that it won't be allocated again
+        if (index := _artifact_dir_index(self.dirname.name)) is not None:
+            reserve_artifact_index(index, self.dirname.parent)
+
         _set_tls_artifact_dir(self.dirname)
 
         return True
@@ -99,5 +107,99 @@ class TempArtifactDir(object):
         return False # If we returned True here, any exception would be suppressed!
 
 
-def next_artifact_index():
-    return len(list(get_tls_artifact_dir().glob("*__*")))
+###
+# Allocation of the NNN__name artifact directories.
+#
+# The next index of each artifact directory is stored in its
+# ARTIFACT_INDEX_FILENAME file, and updated under an exclusive lock
+# of this file. So the allocation doesn't depend on the number of
+# directories, and the threads (run.Parallel) and processes
+# (local_ci run_multi) sharing an artifact directory never get the
+# same index.
+###
+
+ARTIFACT_INDEX_FILENAME = ".artifact_index"
+
+_ARTIFACT_DIR_INDEX_RE = re.compile(r"^(\d+)__")
+
+
+def _artifact_dir_index(name):
+    match = _ARTIFACT_DIR_INDEX_RE.match(name)
+
+    return int(match.group(1)) if match else None
+
+
+def _update_artifact_index(dirname, update):
+    # update(current next index) -> (new next index, return value)
+    dirname = pathlib.Path(dirname)
+    dirname.mkdir(parents=True, exist_ok=True)
+
+    fd = os.open(dirname / ARTIFACT_INDEX_FILENAME, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX) # released when the file is closed
+
+        content = os.pread(fd, 32, 0).strip()
+        if content:
+            next_index = int(content)
+        else:
+            # first allocation, the directory may have been populated without the index file
+            next_index = len(list(dirname.glob("*__*")))
+
+        new_next_index, value = update(next_index)
+        if new_next_index != next_index or not content:
+            data = f"{new_next_index}\n".encode()
+            os.pwrite(fd, data, 0)
+            os.ftruncate(fd, len(data))
+    finally:
+        os.close(fd)
+
+    return value
+
+
+def next_artifact_index(dirname=None):
+    """
+    Allocates the next NNN index of an artifact directory.
+
+    Args:
+      dirname: the artifact directory. Default: the current ARTIFACT_DIR.
+
+    Returns:
+      the index, which is never returned again for this directory
+    """
+
+    if dirname is None:
+        dirname = get_tls_artifact_dir()
+
+    return _update_artifact_index(dirname, lambda next_index: (next_index + 1, next_index))
+
+
+def reserve_artifact_index(index, dirname=None):
+    """
+    Marks an index (chosen without next_artifact_index) as used in an artifact directory.
+    """
+
+    if dirname is None:
+        dirname = get_tls_artifact_dir()
+
+    _update_artifact_index(dirname, lambda next_index: (max(next_index, index + 1), None))
+
+
+def allocate_artifact_dir(name, dirname=None):
+    """
+    Creates the next NNN__name directory of an artifact directory.
+
+    Args:
+      name: the name of the directory, after the NNN__ index
+      dirname: the parent artifact directory. Default: the current ARTIFACT_DIR.
+
+    Returns:
+      the path of the new directory
+    """
+
+    if dirname is None:
+        dirname = get_tls_artifact_dir()
+
+    path = pathlib.Path(dirname) / f"{next_artifact_index(dirname):03d}__{name}"
+    path.mkdir()
+
+    return path
@@ -0,0 +1,75 @@
+import re
+import functools
+
+import jsonpath_ng
+
+# Compiling a JSONPath expression with jsonpath_ng is expensive (PLY
+# parser), so the compiled expressions are cached. Plain dotted keys
+# (`a.b.c`) don't go through the JSONPath grammar at all, they are
+# looked up with a direct dict walk.
+
+CACHE_SIZE = 1024
+
+_DOTTED_KEY_RE = re.compile(r"^(\$\.)?[a-zA-Z_@][a-zA-Z0-9_@\-]*(\.[a-zA-Z_@][a-zA-Z0-9_@\-]*)*$")
+_RESERVED_WORDS = {"where", "wherenot"}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse(jsonpath):
+    """
+    Returns the compiled JSONPath expression, from the cache if possible.
+    """
+    return jsonpath_ng.parse(jsonpath)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _split_dotted_key(jsonpath):
+    if jsonpath == "$":
+        return []
+
+    if not _DOTTED_KEY_RE.match(jsonpath):
+        return None
+
+    fields = jsonpath.removeprefix("$.").split(".")
+    if _RESERVED_WORDS.intersection(fields):
+        return None
+
+    return fields
+
+
+def find(doc, jsonpath):
+    """
+    Returns the list of values matching the JSONPath expression in doc.
+    """
+
+    fields = _split_dotted_key(jsonpath)
+    if fields is None:
+        return [match.value for match in parse(jsonpath).find(doc)]
+
+    value = doc
+    for field in fields:
+        if not isinstance(value, dict) or field not in value:
+            return []
+        value = value[field]
+
+    return [value]
+
+
+def update(doc, jsonpath, value):
+    """
+    Updates the existing fields matching the JSONPath expression in doc.
+    """
+
+    fields = _split_dotted_key(jsonpath)
+    if not fields: # None or root element
+        parse(jsonpath).update(doc, value)
+        return
+
+    parent = doc
+    for field in fields[:-1]:
+        if not isinstance(parent, dict) or field not in parent:
+            return
+        parent = parent[field]
+
+    if isinstance(parent, dict) and fields[-1] in parent:
+        parent[fields[-1]] = value
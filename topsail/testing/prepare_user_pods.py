@@ -5,7 +5,7 @@ import base64
 import yaml
 import re
 
-from topsail.testing import env, config, run, sizing
+from topsail.testing import env, config, run, sizing, sizing_planner
 
 def apply_prefer_pr(pr_number=None):
     if not config.ci_artifacts.get_config("base_image.repo.ref_prefer_pr"):
@@ -72,11 +72,15 @@ def rebuild_driver_image(namespace, pr_number):
     prepare_base_image_container(namespace)
 
 
+# must match 'roles/local_ci/local_ci_run_multi/templates/job.yaml.j2'
+DRIVER_POD_CPU = 0.250
+DRIVER_POD_MEMORY = 2
+
+
 def compute_driver_node_requirement(user_count):
-    # must match 'roles/local_ci/local_ci_run_multi/templates/job.yaml.j2'
     kwargs = dict(
-        cpu = 0.250,
-        memory = 2,
+        cpu = DRIVER_POD_CPU,
+        memory = DRIVER_POD_MEMORY,
         machine_type = config.ci_artifacts.get_config("clusters.driver.compute.machineset.type"),
         user_count = user_count,
         )
@@ -84,16 +88,38 @@ def compute_driver_node_requirement(user_count):
     return sizing.main(**kwargs)
 
 
+def compute_driver_machine_requirement(user_count):
+    # picks the cheapest machine type able to run the user Pods
+    workload = [dict(count=user_count, cpu=DRIVER_POD_CPU, memory=DRIVER_POD_MEMORY)]
+
+    max_nodes = config.ci_artifacts.get_config("clusters.driver.compute.machineset.max_count", None, warn=False)
+
+    cheapest = sizing_planner.cheapest(workload, max_nodes=max_nodes)
+    if cheapest is None:
+        raise RuntimeError(f"No machine type can run {user_count} user Pods")
+
+    machine_type, node_count = cheapest
+    logging.info(f"Need {node_count} {machine_type} nodes for running {user_count} users")
+
+    return machine_type, node_count
+
+
 def cluster_scale_up(namespace, user_count):
     if config.ci_artifacts.get_config("clusters.driver.is_metal"):
         return
 
     node_count = config.ci_artifacts.get_config("clusters.driver.compute.machineset.count")
 
-    if node_count is None:
+    extra = {}
+    if config.ci_artifacts.get_config("clusters.driver.compute.machineset.type") is None:
+        extra["instance_type"], planned_node_count = compute_driver_machine_requirement(user_count)
+        if node_count is None:
+            node_count = planned_node_count
+
+    elif node_count is None:
         node_count = compute_driver_node_requirement(user_count)
 
-    extra = dict(scale=node_count)
+    extra["scale"] = node_count
 
     run.run_toolbox_from_config("cluster", "set_scale", prefix="driver", extra=extra, artifact_dir_suffix="_driver")
 
@@ -3,10 +3,14 @@ import traceback
 import logging
 logging.getLogger().setLevel(logging.INFO)
 import json
+import time
+import datetime
+import concurrent.futures
+import asyncio
 
 import subprocess
 
-import joblib
+import yaml
 
 from . import env
 
@@ -80,6 +84,50 @@ def run_toolbox(group, command, artifact_dir_suffix=None, run_kwargs=None, mute_
     return run(f'{cmd_env} ./run_toolbox.py {group} {command} {_dict_to_run_toolbox_args(kwargs)}', **run_kwargs)
 
 
+def run_toolbox_batch(commands, name="ansible_batch", check=True):
+    """
+    Runs multiple toolbox commands from a single `ansible-playbook` process, in order.
+
+    Each command gets its own artifacts directory, as with run_toolbox(), and the batch stops
+    at the first failure. See topsail._common.RunAnsibleRoles.
+
+    Args:
+      commands: list of (group, command, kwargs) tuples. The kwargs may contain an `artifact_dir_suffix` entry.
+      name: the name of the artifacts directory of the batch (where the Ansible logs are stored)
+      check: if True, raise subprocess.CalledProcessError if the batch fails.
+
+    Returns:
+      the return code of ansible-playbook
+    """
+
+    import topsail
+    from topsail import _common
+
+    toolbox = topsail.Toolbox()
+
+    runnables = []
+    suffixes = []
+    for group, command, kwargs in commands:
+        kwargs = dict(kwargs)
+        suffixes.append(kwargs.pop("artifact_dir_suffix", None))
+
+        run_ansible_role = getattr(getattr(toolbox, group), command)(None, **kwargs)
+        run_ansible_role.py_command_name = f"{group} {command}"
+        run_ansible_role.py_command_args = kwargs
+
+        runnables.append(run_ansible_role)
+
+    logging.info(f"run_toolbox_batch: {', '.join(f'{group} {command}' for group, command, _ in commands)}")
+
+    batch = _common.RunAnsibleRoles(runnables, name=name, suffixes=suffixes)
+    ret = batch.run(dict(os.environ, ARTIFACT_DIR=str(env.ARTIFACT_DIR)))
+
+    if check and ret != 0:
+        raise subprocess.CalledProcessError(ret, f"run_toolbox_batch {name}")
+
+    return ret
+
+
 def run(command, capture_stdout=False, capture_stderr=False, check=True, protect_shell=True, cwd=None, stdin_file=None, log_command=True):
     if log_command:
         logging.info(f"run: {command}")
@@ -107,12 +155,193 @@ def run(command, capture_stdout=False, capture_stderr=False, check=True, protect
 
     return proc
 
+# process groups of the running arun() commands. They are outside of
+# our process group, so Parallel must kill them explicitly on abort.
+_arun_process_groups = set()
+
+
+def _kill_process_group(pgid):
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass # already terminated
+
+
+def _kill_arun_process_groups():
+    for pgid in list(_arun_process_groups):
+        _kill_process_group(pgid)
+
+
+async def arun(command, capture_stdout=False, capture_stderr=False, check=True, protect_shell=True, cwd=None, log_command=True, log_file=None, timeout=None, semaphore=None):
+    """
+    Asynchronous counterpart of run().
+
+    Args:
+      log_file: if set, the stdout and stderr of the command are streamed to this file (unless captured).
+      timeout: the command is killed and subprocess.TimeoutExpired is raised after this number of seconds.
+      semaphore: if set, the command waits for the asyncio.Semaphore before starting.
+    """
+
+    if semaphore is not None:
+        async with semaphore:
+            return await arun(command, capture_stdout, capture_stderr, check, protect_shell, cwd, log_command, log_file, timeout)
+
+    if log_command:
+        logging.info(f"arun: {command}")
+
+    args = {}
+    args["cwd"] = cwd
+
+    if protect_shell:
+        command = f"set -o errexit;set -o pipefail;set -o nounset;set -o errtrace;{command}"
+
+    log_f = open(log_file, "ab") if log_file else None
+    try:
+        args["stdout"] = asyncio.subprocess.PIPE if capture_stdout else log_f
+        args["stderr"] = asyncio.subprocess.PIPE if capture_stderr else log_f
+
+        # in a dedicated process group, so that the whole command tree can be killed
+        # (registered, so that Parallel's abort path kills it as well)
+        proc = await asyncio.create_subprocess_shell(command, start_new_session=True, **args)
+        _arun_process_groups.add(proc.pid)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            _kill_process_group(proc.pid)
+            await proc.wait()
+            if log_command:
+                logging.error(f"arun: timeout after {timeout}s: {command}")
+            raise subprocess.TimeoutExpired(command, timeout)
+        except asyncio.CancelledError:
+            # eg, another command of the gather() failed
+            _kill_process_group(proc.pid)
+            await proc.wait()
+            raise
+        finally:
+            _arun_process_groups.discard(proc.pid)
+    finally:
+        if log_f:
+            log_f.close()
+
+    if capture_stdout: stdout = stdout.decode("utf8")
+    if capture_stderr: stderr = stderr.decode("utf8")
+
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, command, stdout, stderr)
+
+    return subprocess.CompletedProcess(command, proc.returncode, stdout, stderr)
+
+
+async def agather(commands, max_concurrency=None, return_exceptions=False, **kwargs):
+    """
+    Runs the commands concurrently, with at most `max_concurrency` commands running at the same time.
+
+    Args:
+      commands: list of commands. Each entry can be a command string, or a (command, kwargs) tuple overriding the common kwargs.
+      max_concurrency: maximum number of commands running concurrently. Unbounded if None.
+      return_exceptions: if True, the exceptions are returned in the result list instead of being raised.
+      kwargs: common arguments passed to arun()
+
+    Returns:
+      the list of subprocess.CompletedProcess, in the order of the commands.
+
+    Unless `return_exceptions` is set, the first failure cancels (and kills) the other commands before being raised.
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    tasks = []
+    for entry in commands:
+        command, command_kwargs = (entry, {}) if isinstance(entry, str) else entry
+        tasks.append(asyncio.create_task(arun(command, semaphore=semaphore, **(kwargs | command_kwargs))))
+
+    if not tasks:
+        return []
+
+    if return_exceptions:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        # on failure, or if we are cancelled ourselves
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    for task in tasks:
+        if task.done() and not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+    return [task.result() for task in tasks]
+
+
+def gather(commands, max_concurrency=None, return_exceptions=False, **kwargs):
+    """
+    Synchronous entrypoint of agather(), see its documentation.
+    """
+
+    return asyncio.run(agather(commands, max_concurrency, return_exceptions, **kwargs))
+
+
+PARALLEL_BACKENDS = ("threading", "process")
+
+
+def _run_parallel_task(artifact_dir, function, args, kwargs):
+    # executed in the worker thread/process. Never raises, the
+    # exception is returned to the scheduler along with the timing record.
+    env._set_tls_artifact_dir(artifact_dir)
+
+    record = dict(
+        task=f"{getattr(function, '__name__', function)}({', '.join(map(str, args))})",
+        start=time.time(),
+    )
+    exception = None
+    try:
+        function(*args, **kwargs)
+        record["status"] = "success"
+    except Exception as e:
+        exception = e
+        record["status"] = "failed"
+        record["error"] = f"{e.__class__.__name__}: {e}"
+        record["traceback"] = traceback.format_exc()
+
+    record["end"] = time.time()
+    record["duration"] = record["end"] - record["start"]
+
+    return record, exception
+
+
 class Parallel(object):
-    def __init__(self, name, exit_on_exception=True, dedicated_dir=True):
+    """
+    Runs the delayed functions in parallel, when leaving the context.
+
+    Args:
+      name: name of the parallel execution, used for the dedicated artifact directory.
+      exit_on_exception: if True, kill the process group and exit when a task fails. Otherwise, re-raise the exception.
+      dedicated_dir: if True, run the tasks in a dedicated artifact directory.
+      max_workers: maximum number of tasks running concurrently. Default: $TOPSAIL_PARALLEL_MAX_WORKERS, or the CPU count.
+      backend: 'threading' or 'process'. With 'process', the functions and their arguments must be picklable.
+      drain_on_exception: if True, a failure stops the scheduling of new tasks, but the running ones are allowed to complete.
+        If False, the failure is handled immediately, without waiting for the running tasks.
+    """
+
+    def __init__(self, name, exit_on_exception=True, dedicated_dir=True, max_workers=None, backend="threading", drain_on_exception=True):
+        if backend not in PARALLEL_BACKENDS:
+            raise ValueError(f"Invalid Parallel backend '{backend}'. Expected one of {', '.join(PARALLEL_BACKENDS)}.")
+
+        if max_workers is None:
+            max_workers = int(os.environ.get("TOPSAIL_PARALLEL_MAX_WORKERS", 0)) or os.cpu_count()
+
         self.name = name
         self.parallel_tasks = None
         self.exit_on_exception = exit_on_exception
         self.dedicated_dir = dedicated_dir
+        self.max_workers = max_workers
+        self.backend = backend
+        self.drain_on_exception = drain_on_exception
 
     def __enter__(self):
         self.parallel_tasks = []
@@ -120,7 +349,72 @@ class Parallel(object):
         return self
 
     def delayed(self, function, *args, **kwargs):
-        self.parallel_tasks += [joblib.delayed(function)(*args, **kwargs)]
+        self.parallel_tasks += [(function, args, kwargs)]
+
+    def _execute(self):
+        artifact_dir = env.ARTIFACT_DIR
+
+        if self.backend == "process":
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers,
+                                                              initializer=env._set_tls_artifact_dir,
+                                                              initargs=(artifact_dir,))
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+
+        records = [dict(task=f"{getattr(function, '__name__', function)}({', '.join(map(str, args))})", status="cancelled")
+                   for function, args, kwargs in self.parallel_tasks]
+        exceptions = []
+
+        pending = iter(enumerate(self.parallel_tasks))
+        running = {}
+        scheduling = True
+        try:
+            while True:
+                while scheduling and len(running) < self.max_workers:
+                    try:
+                        idx, (function, args, kwargs) = next(pending)
+                    except StopIteration:
+                        scheduling = False
+                        break
+
+                    running[executor.submit(_run_parallel_task, artifact_dir, function, args, kwargs)] = idx
+
+                if not running:
+                    break
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    idx = running.pop(future)
+                    records[idx], exception = future.result()
+                    if exception is None:
+                        continue
+
+                    exceptions.append(exception)
+                    logging.error(f"Parallel[{self.name}] task #{idx} {records[idx]['task']} failed: {records[idx]['error']}")
+                    if scheduling:
+                        logging.warning(f"Parallel[{self.name}]: not scheduling the remaining tasks, "
+                                        f"waiting for the {len(running)} running task(s) to complete.")
+                    scheduling = False
+
+                if exceptions and not self.drain_on_exception:
+                    break
+        finally:
+            executor.shutdown(wait=not exceptions or self.drain_on_exception, cancel_futures=True)
+            self._save_records(artifact_dir, records)
+
+        return exceptions
+
+    def _save_records(self, artifact_dir, records):
+        tasks = []
+        for idx, record in enumerate(records):
+            task = dict(index=idx, **record)
+            for key in ("start", "end"):
+                if key in task:
+                    task[key] = datetime.datetime.fromtimestamp(task[key]).isoformat()
+            tasks.append(task)
+
+        with open(artifact_dir / "parallel_tasks.yaml", "a") as f:
+            yaml.dump([dict(parallel=self.name, tasks=tasks)], f, sort_keys=False)
 
     def __exit__(self, ex_type, ex_value, exc_traceback):
 
@@ -134,15 +428,17 @@ class Parallel(object):
             context = open("/dev/null") # dummy context
 
         with context:
-            try:
-                joblib.Parallel(n_jobs=-1, backend="threading")(self.parallel_tasks)
-            except Exception as e:
+            exceptions = self._execute()
+            if exceptions:
                 if not self.exit_on_exception:
-                    raise e
+                    raise exceptions[0]
 
-                traceback.print_exc()
+                for exception in exceptions:
+                    traceback.print_exception(type(exception), exception, exception.__traceback__)
 
                 logging.error(f"Exception caught during the '{self.name}' Parallel execution. Exiting.")
+                # kill the arun() commands, which run in their own process groups
+                _kill_arun_process_groups()
                 # kill all processes in my group
                 # (the group was started with the os.setpgrp() above)
                 os.killpg(0, signal.SIGKILL)
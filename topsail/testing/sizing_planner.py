@@ -0,0 +1,308 @@
+#! /usr/bin/env python
+
+# Cluster sizing planner: evaluates all the machines of
+# sizing.machines for a workload mix (Pod sizes and counts), with
+# single-type node pools and with one dedicated node pool per Pod
+# size, and returns the Pareto set of the hourly cost versus the
+# capacity headroom.
+#
+# The Pods are bin-packed node after node (first-fit, largest Pods
+# first), for all the machine types at once with numpy arrays.
+#
+# The planner is intentionally stricter than `sizing.main`, which
+# divides the total cpu/memory requested by the capacity of a node:
+# here the Pods are whole, so the capacity left on a node when the
+# next Pod doesn't fit is lost, and the planner may require more
+# nodes for the same Pod size.
+#
+# Usage: python3 -m topsail.testing.sizing_planner 1000x0.2/0.75,30x1/4/1 --max_nodes=20
+
+import logging
+logging.getLogger().setLevel(logging.INFO)
+
+import sys
+import types
+import itertools
+
+import numpy as np
+
+from topsail.testing import sizing
+
+AWS_MAX_VOLUMES_PER_NODE = 26
+
+# machine groups which cannot be scaled with `cluster set_scale`
+UNSCALABLE_GROUPS = ["Bare-metal scale lab machines"]
+
+
+def parse_workload(workload):
+    """
+    Parses the workload mix.
+
+    Args:
+      workload: list of dict(count=..., cpu=..., memory=...[, volumes=...]),
+                or the equivalent 'COUNTxCPU/MEMORY[/VOLUMES],...' string, eg: '1000x0.2/0.75,30x1/4/1'.
+                The memory is in Gi. The entries without Pods are dropped.
+    """
+
+    if isinstance(workload, str):
+        parsed = []
+        for pods in workload.split(","):
+            count, _, size = pods.strip().partition("x")
+            cpu, memory, *volumes = size.split("/")
+            parsed.append(dict(count=int(count), cpu=float(cpu), memory=float(memory),
+                               volumes=int(volumes[0]) if volumes else 0))
+        workload = parsed
+
+    return [types.SimpleNamespace(count=int(pods["count"]), cpu=float(pods["cpu"]),
+                                  memory=float(pods["memory"]), volumes=int(pods.get("volumes", 0)))
+            for pods in workload if int(pods["count"]) > 0]
+
+
+def _pack(machines, pods, max_nodes=None,
+          max_pods_per_node=sizing.MAX_POD_PER_NODE,
+          max_volumes_per_node=AWS_MAX_VOLUMES_PER_NODE):
+    """
+    Returns the number of nodes of each of the machines required to run all the pods
+    (np.inf when a Pod doesn't fit in the machine, or when more than max_nodes are required).
+    """
+
+    # largest Pods first
+    pods = sorted(pods, key=lambda p: (p.cpu, p.memory), reverse=True)
+
+    node_cpu = np.array([m.cpu - sizing.RESERVED_CPU for m in machines], dtype=float)
+    node_mem = np.array([m.memory - sizing.RESERVED_MEM for m in machines], dtype=float)
+    # the AWS volume limit only applies to the AWS instances
+    node_volumes = np.array([max_volumes_per_node if max_volumes_per_node and "xlarge" in m.name else np.inf
+                             for m in machines], dtype=float)
+
+    pod_cpu = np.array([p.cpu for p in pods], dtype=float)
+    pod_mem = np.array([p.memory for p in pods], dtype=float)
+    pod_volumes = np.array([p.volumes for p in pods], dtype=float)
+
+    remaining = np.tile(np.array([p.count for p in pods], dtype=float), (len(machines), 1))
+    nodes = np.zeros(len(machines))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        def fits(free_cpu, free_mem, free_pods, free_volumes, idx):
+            return np.minimum.reduce([
+                np.floor(free_cpu / pod_cpu[idx]) if pod_cpu[idx] else np.full(len(machines), np.inf),
+                np.floor(free_mem / pod_mem[idx]) if pod_mem[idx] else np.full(len(machines), np.inf),
+                free_pods,
+                np.floor(free_volumes / pod_volumes[idx]) if pod_volumes[idx] else np.full(len(machines), np.inf),
+            ])
+
+        # machines where one of the Pods doesn't fit in an empty node
+        possible = np.ones(len(machines), dtype=bool)
+        for idx in range(len(pods)):
+            empty_node = fits(node_cpu, node_mem, np.full(len(machines), float(max_pods_per_node)), node_volumes, idx)
+            possible &= (empty_node >= 1) | (remaining[:, idx] == 0)
+
+        active = possible & (remaining.sum(axis=1) > 0)
+        while active.any():
+            # fill one node of each machine type
+            free_cpu, free_mem = node_cpu.copy(), node_mem.copy()
+            free_pods = np.full(len(machines), float(max_pods_per_node))
+            free_volumes = node_volumes.copy()
+
+            fill = np.zeros_like(remaining)
+            for idx in range(len(pods)):
+                count = np.where(active, np.minimum(remaining[:, idx], fits(free_cpu, free_mem, free_pods, free_volumes, idx)), 0)
+                fill[:, idx] = count
+                free_cpu -= count * pod_cpu[idx]
+                free_mem -= count * pod_mem[idx]
+                free_pods -= count
+                free_volumes -= count * pod_volumes[idx]
+
+            # repeat the same node until one of its Pod sizes runs out
+            repeat = np.where(fill > 0, np.floor(remaining / fill), np.inf).min(axis=1)
+            repeat = np.where(active & np.isfinite(repeat), np.maximum(repeat, 1), 0)
+
+            remaining = np.maximum(remaining - fill * repeat[:, None], 0)
+            nodes += repeat
+
+            active = active & (remaining.sum(axis=1) > 0)
+            if max_nodes is not None:
+                active &= nodes <= max_nodes
+
+    nodes[~possible] = np.inf
+    if max_nodes is not None:
+        nodes[nodes > max_nodes] = np.inf
+
+    return nodes
+
+
+def _headroom(pools, pods):
+    # the fraction of the allocatable cpu and memory left unrequested
+    cpu = sum(count * (machine.cpu - sizing.RESERVED_CPU) for machine, count in pools)
+    mem = sum(count * (machine.memory - sizing.RESERVED_MEM) for machine, count in pools)
+
+    requested_cpu = sum(p.count * p.cpu for p in pods)
+    requested_mem = sum(p.count * p.memory for p in pods)
+
+    return min(1 - requested_cpu / cpu, 1 - requested_mem / mem)
+
+
+def _merge_pools(pools, pods, pack, cache):
+    # the dedicated pools of the Pod sizes sharing a machine type are
+    # merged into a single pool, where their Pods are packed together
+    machine_pods = {}
+    for pod_idx, (machine, count) in enumerate(pools):
+        machine_pods.setdefault(machine.name, (machine, count, []))[2].append(pod_idx)
+
+    merged = []
+    for machine, count, pod_indexes in machine_pods.values():
+        if len(pod_indexes) > 1:
+            key = (machine.name, tuple(pod_indexes))
+            if key not in cache:
+                [cache[key]] = pack([machine], [pods[idx] for idx in pod_indexes])
+            count = cache[key]
+
+        if not np.isfinite(count):
+            return None
+
+        merged.append((machine, count))
+
+    return merged
+
+
+def _plan(pools, pods):
+    return types.SimpleNamespace(
+        pools=[(machine.name, int(count)) for machine, count in pools],
+        node_count=int(sum(count for _, count in pools)),
+        cost=sum(count * machine.price for machine, count in pools),
+        headroom=_headroom(pools, pods),
+    )
+
+
+def pareto(plans):
+    """
+    Returns the plans which aren't dominated by a cheaper plan with more headroom, by increasing cost.
+    """
+
+    front = []
+    for plan in sorted(plans, key=lambda p: (p.cost, -p.headroom, p.node_count)):
+        if front and plan.headroom <= front[-1].headroom:
+            continue
+        front.append(plan)
+
+    return front
+
+
+def get_machines(machine_types=None):
+    machines = sizing.parse_machines()
+
+    if machine_types:
+        if isinstance(machine_types, str):
+            machine_types = machine_types.split(",")
+        missing = [name for name in machine_types if name not in machines]
+        if missing:
+            raise KeyError(f"Machine types not found in {sizing.MACHINES_FILE.name}: {', '.join(missing)}")
+
+        return [machines[name] for name in machine_types]
+
+    # without price, the cost cannot be compared
+    return [machine for machine in machines.values()
+            if machine.price and machine.group not in UNSCALABLE_GROUPS]
+
+
+def plan(workload, machine_types=None, max_nodes=None, mixed_pools=True,
+         max_pods_per_node=sizing.MAX_POD_PER_NODE,
+         max_volumes_per_node=AWS_MAX_VOLUMES_PER_NODE):
+    """
+    Computes the Pareto set of the cluster sizings for a workload mix.
+
+    Args:
+      workload: the workload mix, see parse_workload
+      machine_types: list of the machine types to evaluate. Default: all the machines with a price.
+      max_nodes: the maximum number of nodes of the cluster
+      mixed_pools: if True, also evaluate one dedicated node pool per Pod size
+      max_pods_per_node: the maximum number of Pods per node
+      max_volumes_per_node: the maximum number of volumes per AWS node
+
+    Returns:
+      the list of the Pareto-optimal plans, by increasing cost: SimpleNamespace(pools=[(machine type, node count)], node_count, cost, headroom).
+      Empty if the workload has no Pod.
+    """
+
+    pods = parse_workload(workload)
+    if not pods:
+        return []
+
+    machines = get_machines(machine_types)
+
+    pack_args = dict(max_nodes=max_nodes, max_pods_per_node=max_pods_per_node, max_volumes_per_node=max_volumes_per_node)
+
+    plans = []
+    for machine, count in zip(machines, _pack(machines, pods, **pack_args)):
+        if np.isfinite(count):
+            plans.append(_plan([(machine, count)], pods))
+
+    if mixed_pools and len(pods) > 1:
+        # the Pareto-optimal pools of each Pod size, combined together
+        pod_pools = []
+        for pod in pods:
+            candidates = [((machine, count), _plan([(machine, count)], [pod]))
+                          for machine, count in zip(machines, _pack(machines, [pod], **pack_args))
+                          if np.isfinite(count)]
+
+            front = pareto([pool_plan for _, pool_plan in candidates])
+            pod_pools.append([pool for pool, pool_plan in candidates
+                              if any(pool_plan is front_plan for front_plan in front)])
+
+        pack = lambda pool_machines, pool_pods: _pack(pool_machines, pool_pods, **pack_args)
+        merged_pools_cache = {}
+        for pools in itertools.product(*pod_pools):
+            pools = _merge_pools(pools, pods, pack, merged_pools_cache)
+            if pools is None:
+                continue
+            if max_nodes is not None and sum(count for _, count in pools) > max_nodes:
+                continue
+            plans.append(_plan(pools, pods))
+
+    return pareto(plans)
+
+
+def cheapest(workload, machine_types=None, max_nodes=None, **kwargs):
+    """
+    Returns the machine type and the node count of the cheapest single-type plan, or None if none fits (or if the workload has no Pod).
+    """
+
+    plans = plan(workload, machine_types, max_nodes, mixed_pools=False, **kwargs)
+    if not plans:
+        return None
+
+    [(machine_type, node_count)] = plans[0].pools
+
+    return machine_type, node_count
+
+
+def main(workload, machine_types=None, max_nodes=None, mixed_pools=True, max_volumes_per_node=AWS_MAX_VOLUMES_PER_NODE):
+    """
+    Prints the Pareto set of the cluster sizings for a workload mix.
+
+    Args:
+      workload: 'COUNTxCPU/MEMORY[/VOLUMES],...', eg: '1000x0.2/0.75,30x1/4/1'
+      machine_types: comma-separated list of the machine types to evaluate. Default: all the machines with a price.
+      max_nodes: the maximum number of nodes of the cluster
+      mixed_pools: if True, also evaluate one dedicated node pool per Pod size
+      max_volumes_per_node: the maximum number of volumes per AWS node (0 to disable the limit)
+    """
+
+    plans = plan(workload, machine_types, max_nodes, mixed_pools, max_volumes_per_node=max_volumes_per_node)
+    if not plans:
+        logging.error("No machine can run this workload with these constraints.")
+        sys.exit(1)
+
+    logging.info(f"Reserved cpu={sizing.RESERVED_CPU}, mem={sizing.RESERVED_MEM}")
+    for p in plans:
+        pools = " + ".join(f"{count} x {name}" for name, count in p.pools)
+        logging.info(f"${p.cost:7.3f}/h  headroom={p.headroom*100:5.1f}%  {p.node_count:4d} nodes: {pools}")
+
+
+if __name__ == "__main__":
+    import fire
+
+    # Print help rather than opening a pager
+    fire.core.Display = lambda lines, out: print(*lines, file=out)
+
+    fire.Fire(main)
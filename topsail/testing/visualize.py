@@ -84,6 +84,24 @@ def prepare_matbench():
 @entrypoint()
 def generate_visualizations(results_dirname, generate_lts=None):
     visualizations = matbench_config.get_config("visualize")
+
+    if config.ci_artifacts.get_config("matbench.single_process", False, warn=False):
+        # parse the results once, then render all the visualizations in one process
+        renderings = []
+        errors = generate_visualization(results_dirname, 0, generate_lts=generate_lts, renderings=renderings)
+        for idx in range(1, len(visualizations)):
+            renderings += get_visualization_renderings(idx)
+
+        errors += call_render_all(len(visualizations), results_dirname, renderings)
+        if errors:
+            msg = f"An error happened during the visualization post-processing ... ({', '.join(errors)})"
+            logging.error(msg)
+            with open(env.ARTIFACT_DIR / "FAILURE", "w") as f:
+                print(msg, file=f)
+            raise RuntimeError(msg)
+
+        return
+
     plotting_failed = False
     for idx in range(len(visualizations)):
         generate_visualization(results_dirname, idx, generate_lts=generate_lts)
@@ -101,6 +119,10 @@ def call_parse(step_idx, common_args, common_env):
         logging.info(f"Download mode set to '{mode}', ignoring the parser cache.")
         parse_env["MATBENCH_STORE_IGNORE_CACHE"] = "y"
 
+    parse_workers = config.ci_artifacts.get_config("matbench.parse_workers", None, warn=False)
+    if parse_workers is not None:
+        parse_env["MATBENCH_STORE_PARSE_WORKERS"] = parse_workers
+
     parse_args["output-matrix"] = env.ARTIFACT_DIR / "internal_matrix.json"
 
     parse_args_str = " ".join(f"'--{k}={v}'" for k, v in parse_args.items())
@@ -273,6 +295,15 @@ def call_visualize(step_idx, common_env_str, common_args, filters_to_apply, gene
         logging.warning("An error happened while generating the visualization ...")
         errors.append(log_file.name)
 
+    errors += check_visualize_log(log_file)
+
+    move_figures(dest_dir)
+
+    return errors
+
+
+def check_visualize_log(log_file):
+    errors = []
     with open(log_file) as log_f:
         logs_has_errors = False
         for line in log_f.readlines():
@@ -287,22 +318,80 @@ def call_visualize(step_idx, common_env_str, common_args, filters_to_apply, gene
         if logs_has_errors:
             errors.append(log_file.name)
 
+    return errors
+
+
+def move_figures(dest_dir):
     run.run(f"""
         mkdir -p {dest_dir}/figures_{{png,html}}
         mv {dest_dir}/fig_*.png "{dest_dir}/figures_png" 2>/dev/null || true
         mv {dest_dir}/fig_*.html "{dest_dir}/figures_html" 2>/dev/null || true
         """)
 
+
+def call_render_all(step_idx, results_dirname, renderings):
+    common_args, common_env = get_common_matbench_args_env(results_dirname)
+
+    render_workers = config.ci_artifacts.get_config("matbench.render_workers", None, warn=False)
+    if render_workers is not None:
+        common_env["MATBENCH_RENDER_WORKERS"] = render_workers
+
+    common_env_str = "env " + " ".join(f"'{k}={v}'" for k, v in common_env.items())
+
+    plan = []
+    for rendering_idx, (filters_to_apply, generate_url) in enumerate(renderings):
+        visu_args = common_args.copy()
+        visu_args["filters"] = filters_to_apply
+        visu_args["generate"] = generate_url
+
+        dest_dir = env.ARTIFACT_DIR / filters_to_apply
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        plan.append(dict(dest_dir=str(dest_dir),
+                         log_file=str(dest_dir / f"{step_idx}_{rendering_idx}_matbench_visualize.log"),
+                         args=visu_args))
+
+    plan_file = env.ARTIFACT_DIR / f"{step_idx}_matbench_render_all.json"
+    with open(plan_file, "w") as f:
+        json.dump(plan, f, indent=4, default=str)
+
+    log_file = env.ARTIFACT_DIR / f"{step_idx}_matbench_render_all.log"
+
+    cmd = f"{common_env_str} python3 -m topsail.visualizations.render_all '{plan_file}' |& tee > {log_file}"
+
+    errors = []
+    if run.run(cmd, check=False, cwd=TOPSAIL_DIR).returncode != 0:
+        logging.warning("An error happened while rendering the visualizations ...")
+        errors.append(log_file.name)
+
+    for rendering in plan:
+        log_file = pathlib.Path(rendering["log_file"])
+        if not log_file.exists():
+            errors.append(log_file.name)
+            continue
+
+        errors += check_visualize_log(log_file)
+
+        move_figures(rendering["dest_dir"])
+
     return errors
 
 
-def generate_visualization(results_dirname, idx, generate_lts=None, upload_lts=None, analyze_lts=None):
+def get_visualization_renderings(idx):
     generate_list = matbench_config.get_config(f"visualize[{idx}].generate")
     if not generate_list:
         raise ValueError(f"Couldn't get the configuration #{idx} ...")
 
     generate_url = "stats=" + "&stats=".join(generate_list)
 
+    filters = matbench_config.get_config(f"visualize[{idx}]").get("filters", [None])
+
+    return [(filters_to_apply or "", generate_url) for filters_to_apply in filters]
+
+
+def generate_visualization(results_dirname, idx, generate_lts=None, upload_lts=None, analyze_lts=None, renderings=None):
+    visualization_renderings = get_visualization_renderings(idx)
+
     common_args, common_env = get_common_matbench_args_env(results_dirname)
     common_env_str = "env " + " ".join(f"'{k}={v}'" for k, v in common_env.items())
 
@@ -395,18 +484,27 @@ def generate_visualization(results_dirname, idx, generate_lts=None, upload_lts=N
     # Generate the visualization reports
     #
 
-    filters = matbench_config.get_config(f"visualize[{idx}]").get("filters", [None])
-    for filters_to_apply in filters:
-        if not filters_to_apply:
-            filters_to_apply = ""
+    if renderings is not None:
+        # the caller will render them all at once
+        renderings += visualization_renderings
 
+    elif config.ci_artifacts.get_config("matbench.render_workers", 1, warn=False) not in (1, "1"):
+        # render the stats in parallel
         step_idx += 1
-        errors += call_visualize(step_idx, common_env_str, common_args, filters_to_apply, generate_url)
+        errors += call_render_all(step_idx, results_dirname, visualization_renderings)
+
+    else:
+        for filters_to_apply, generate_url in visualization_renderings:
+            step_idx += 1
+            errors += call_visualize(step_idx, common_env_str, common_args, filters_to_apply, generate_url)
 
     #
     # Done :)
     #
 
+    if renderings is not None:
+        return errors # the caller will fail after rendering the visualizations
+
     if errors:
         msg = f"An error happened during the visualization post-processing ... ({', '.join(errors)})"
         logging.error(msg)
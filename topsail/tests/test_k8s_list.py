@@ -0,0 +1,25 @@
+import io
+import json
+
+import pytest
+
+from topsail.visualizations import k8s_list
+
+ITEMS = [
+    {"name": f"item-{idx}", "value": idx * 12.5, "exp": 1e3 * idx, "neg": -idx * 1.25e-7, "int": idx * 1000}
+    for idx in range(20)
+] + [12.5, -1e-3, 7, 3.0E+12, "last"]
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 64))
+def test_iter_items_chunk_boundaries(chunk_size):
+    content = json.dumps({"kind": "List", "items": ITEMS, "count": 1.5e2})
+
+    assert list(k8s_list.iter_items(io.StringIO(content), chunk_size=chunk_size)) == ITEMS
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 64))
+def test_iter_array_chunk_boundaries(chunk_size):
+    content = json.dumps(ITEMS)
+
+    assert list(k8s_list.iter_array(io.StringIO(content), chunk_size=chunk_size)) == ITEMS
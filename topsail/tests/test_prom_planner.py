@@ -0,0 +1,41 @@
+import pytest
+
+from topsail.visualizations import prom_planner
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("sum(x)", "sum(x)"),
+    ("sum (x)", "sum(x)"),
+    ("  sum ( x )  ", "sum(x)"),
+    ("rate(x [5m] )", "rate(x[5m])"),
+    ("rate(x[5m])", "rate(x[5m])"),
+    ("x {a=\"b\" , c=\"d\"}", "x{a=\"b\",c=\"d\"}"),
+    ("sum by (pod) (\n    rate(x[5m])\n)", "sum by(pod)(rate(x[5m]))"),
+    ("x{a=\"b  c\"}", "x{a=\"b  c\"}"),
+    ("a   +   b", "a + b"),
+])
+def test_normalize(query, expected):
+    assert prom_planner.normalize(query) == expected
+
+
+def test_normalize_formatting_variants():
+    variants = [
+        "sum(rate(container_cpu_usage_seconds_total{namespace=\"ns\"}[5m]))",
+        "sum (rate(container_cpu_usage_seconds_total{namespace=\"ns\"} [5m]))",
+        "sum(\n  rate(container_cpu_usage_seconds_total{ namespace=\"ns\" }[5m] )\n)",
+    ]
+
+    assert len({prom_planner.normalize(query) for query in variants}) == 1
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("sum(rate(x[5m]))", ("sum", "rate(x[5m])")),
+    ("max(x{a=\")\"})", ("max", "x{a=\")\"}")),
+    ("sum(x) by(y)", None),
+    ("sum(x) + sum(y)", None),
+    ("avg(x)", None),
+    ("sum()", None),
+    ("x", None),
+])
+def test_split_aggregation(query, expected):
+    assert prom_planner.split_aggregation(prom_planner.normalize(query)) == expected
@@ -0,0 +1,2 @@
+# Helpers shared by the matrix-benchmarking visualization modules
+# (projects/*/visualizations/*)
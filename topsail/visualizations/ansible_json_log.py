@@ -0,0 +1,155 @@
+import io
+import json
+import gzip
+import pathlib
+
+from topsail.visualizations import k8s_list
+
+# Streaming reader of the Ansible JSON logs (`_ansible.log.json*`),
+# written by the json_to_logfile callback plugin.
+#
+# The events are yielded one at a time, from the JSON array files
+# (`format=json`) as well as from the JSON-lines files
+# (`format=jsonl`), optionally compressed with gzip or zstd.
+
+LOG_FILENAMES = (
+    "_ansible.log.jsonl.zst",
+    "_ansible.log.jsonl.gz",
+    "_ansible.log.jsonl",
+    "_ansible.log.json.zst",
+    "_ansible.log.json.gz",
+    "_ansible.log.json",
+)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def find_log_file(dirname):
+    """
+    Returns the path of the Ansible JSON log file of an artifacts directory, or None if there is none.
+    """
+
+    for filename in LOG_FILENAMES:
+        path = pathlib.Path(dirname) / filename
+        if path.exists():
+            return path
+
+    return None
+
+
+class _Truncated(object):
+    # ends the stream at the truncation point of a compressed file
+    # (eg, the run was killed), instead of raising an error
+
+    def __init__(self, f, errors):
+        self.f = f
+        self.errors = errors
+
+    def read(self, size=-1):
+        # in small pieces, so that a read hitting the truncation point
+        # only loses the end of the file
+        chunks = []
+        while size != 0:
+            try:
+                chunk = self.f.read(io.DEFAULT_BUFFER_SIZE if size < 0 else min(size, io.DEFAULT_BUFFER_SIZE))
+            except self.errors:
+                break
+            if not chunk:
+                break
+
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+
+        return "".join(chunks)
+
+    def __iter__(self):
+        while True:
+            try:
+                line = self.f.readline()
+            except self.errors:
+                return
+            if not line:
+                return
+            yield line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.f.close()
+
+
+def _open(path):
+    with open(path, "rb") as f:
+        magic = f.read(4)
+
+    if magic.startswith(_GZIP_MAGIC):
+        return _Truncated(gzip.open(path, "rt"), (EOFError, gzip.BadGzipFile))
+
+    if magic.startswith(_ZSTD_MAGIC):
+        import zstandard
+
+        # the files are appended to, one frame per write session
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True, read_across_frames=True)
+
+        return _Truncated(io.TextIOWrapper(reader), (EOFError, zstandard.ZstdError))
+
+    return open(path)
+
+
+def _iter_lines(f):
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            return # truncated last line, the file is still being written
+
+
+def _is_json_array(path):
+    with _open(path) as f:
+        first_char = f.read(1)
+        while first_char and first_char.isspace():
+            first_char = f.read(1)
+
+    return first_char == "["
+
+
+def iter_events(path, chunk_size=k8s_list.CHUNK_SIZE):
+    """
+    Yields the events of an Ansible JSON log file, one at a time.
+    The compression and format are detected from the file content.
+
+    Args:
+      path: path of the log file
+      chunk_size: size of the chunks read from the JSON array files
+    """
+
+    is_json_array = _is_json_array(path)
+
+    with _open(path) as f:
+        if is_json_array:
+            yield from k8s_list.iter_array(f, chunk_size)
+        else:
+            yield from _iter_lines(f)
+
+
+def iter_task_results(path, status=None):
+    """
+    Yields the task events of an Ansible JSON log file.
+
+    Args:
+      path: path of the log file
+      status: if set, only yield the events with this status (OK, FAILED, SKIPPED, UNREACHABLE)
+    """
+
+    for event in iter_events(path):
+        if event.get("scope") != "task":
+            continue
+        if status is not None and event.get("status") != status:
+            continue
+
+        yield event
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+from dash import html
+
+# Vectorized statistics of the latency distributions, shared by the
+# plotting modules.
+#
+# The quantiles of all the groups are computed from a single sort of
+# the values. They are the same as `statistics.quantiles` (default
+# 'exclusive' method), so the numbers of the reports don't change.
+
+QUANTILES = dict(
+    q1=0.25,
+    median=0.50,
+    q3=0.75,
+    p90=0.90,
+    p99=0.99,
+)
+
+STATS = ("count", "min", "q1", "median", "q3", "p90", "p99", "max")
+
+# (stat, percentage, stat of the previous line) of the quantiles summary
+_SUMMARY_LINES = (
+    ("min", 0, None),
+    ("q1", 25, None),
+    ("median", 50, "q1"),
+    ("q3", 75, "median"),
+    ("p90", 90, "q3"),
+    ("max", 100, "p90"),
+)
+
+_SUMMARY_NAMES = dict(min="min", q1="Q1", median="median", q3="Q3", p90="90th quantile", max="max")
+
+
+def _quantile(sorted_values, starts, counts, p):
+    # statistics.quantiles 'exclusive' method, with the data of each
+    # group at sorted_values[start:start+count]
+    h = p * (counts + 1)
+    j = np.clip(np.floor(h), 1, np.maximum(counts - 1, 1)).astype(np.int64)
+    low = sorted_values[starts + j - 1]
+    high = sorted_values[starts + np.minimum(j, counts - 1)]
+
+    return low + (h - j) * (high - low)
+
+
+def describe_groups(df, by, value, sort=True):
+    """
+    Computes the distribution stats of the `value` column, for each group of the `by` column.
+
+    Args:
+      df: the DataFrame
+      by: the name of the column to group by
+      value: the name of the column to describe. The NaN values are ignored.
+      sort: if True, the groups are sorted, otherwise they are in order of appearance
+
+    Returns:
+      a DataFrame indexed by group, with the STATS columns
+    """
+
+    df = df[df[value].notna()]
+    codes, groups = pd.factorize(df[by], sort=sort)
+    values = df[value].to_numpy(dtype=np.float64)
+
+    if not len(values):
+        return pd.DataFrame(columns=STATS, index=groups)
+
+    counts = np.bincount(codes, minlength=len(groups))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    # sort by value, then (stable, radix) by group
+    order = np.argsort(values)
+    order = order[np.argsort(codes[order], kind="stable")]
+    sorted_values = values[order]
+
+    stats = dict(
+        count=counts,
+        min=sorted_values[starts],
+        max=sorted_values[starts + counts - 1],
+    )
+    for name, p in QUANTILES.items():
+        stats[name] = _quantile(sorted_values, starts, counts, p)
+
+    return pd.DataFrame({name: stats[name] for name in STATS}, index=groups)
+
+
+def describe(values):
+    """
+    Computes the distribution stats of a sequence of values.
+
+    Returns:
+      a pandas Series with the STATS entries
+    """
+
+    df = pd.DataFrame(dict(group=0, value=np.asarray(values, dtype=np.float64)))
+    stats = describe_groups(df, "group", "value")
+    if stats.empty:
+        return pd.Series(dict(count=0), index=STATS)
+
+    return stats.iloc[0]
+
+
+def value_formatter(unit, digits=0):
+    """
+    Returns a function formatting a value with the given unit and number of digits.
+    """
+
+    return lambda value: f"{value:.{digits}f} {unit}"
+
+
+def quantiles_summary(stats, label, fmt, min_max=True):
+    """
+    Renders the quantiles of a distribution, one line per quantile:
+    `25% {label} {fmt(q1)} [Q1]`, ..., with the difference from the previous quantile.
+
+    Args:
+      stats: the stats of the distribution (a row of describe_groups or the output of describe)
+      label: the text after the percentage, eg: 'of the calls performed faster than'
+      fmt: the function formatting the values
+      min_max: if True, include the min and max values
+    """
+
+    msg = []
+    for name, percentage, previous in _SUMMARY_LINES:
+        if name in ("min", "max") and not min_max:
+            continue
+
+        line = f"{percentage}% {label} {fmt(stats[name])}"
+        if previous:
+            line += f" (+ {fmt(stats[name] - stats[previous])})"
+        line += f" [{_SUMMARY_NAMES[name]}]"
+
+        msg.append(line)
+        msg.append(html.Br())
+
+    return msg
+
+
+# (low stat, high stat, low name, high name) of the default spreads
+DEFAULT_SPREADS = (
+    ("q1", "q3", "Q1", "Q3"),
+    ("min", "max", "min", "max"),
+)
+
+# Q1 to Q3, and Q3 to max (Q4) spreads
+UPPER_QUARTILE_SPREADS = (
+    ("q1", "q3", "Q1", "Q3"),
+    ("q3", "max", "Q3", "Q4"),
+)
+
+
+def spread_summary(stats, fmt, what=None, median_label="The median", spreads=DEFAULT_SPREADS, relative=True):
+    """
+    Renders the number of values, the median and the spread of a distribution.
+
+    Args:
+      stats: the stats of the distribution (a row of describe_groups or the output of describe)
+      fmt: the function formatting the values
+      what: the name of the values, eg: 'recorded calls'. If None, the number of values isn't rendered.
+      median_label: the name of the median, eg: 'The median load time'. If None, the median isn't rendered.
+      spreads: the (low stat, high stat, low name, high name) spreads to render, eg: ('q3', 'max', 'Q3', 'Q4')
+      relative: if True, the spreads are also given relative to the median
+    """
+
+    msg = []
+    median = stats["median"]
+
+    if what is not None:
+        msg.append(f"There are {stats['count']:.0f} {what}.")
+        msg.append(html.Br())
+
+    if median_label is not None:
+        msg.append(f"{median_label} is {fmt(median)}.")
+        msg.append(html.Br())
+
+    for low, high, low_name, high_name in spreads:
+        spread = stats[high] - stats[low]
+        of_median = f" ({spread/median*100:.1f}% of the median)" if relative and median else ""
+        msg.append(f"There are {fmt(spread)} between {low_name} and {high_name}{of_median}.")
+        msg.append(html.Br())
+
+    return msg
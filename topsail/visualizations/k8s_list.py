@@ -0,0 +1,194 @@
+import io
+import json
+import pathlib
+
+import yaml
+
+# Streaming iterator over the items of Kubernetes lists (`oc get -ojson`).
+#
+# The `items` array of the list is decoded one element at a time,
+# so that the memory usage is bounded by the size of the largest
+# item, instead of the size of the whole file. The YAML lists
+# (`oc get -oyaml`) are loaded in one go (YAML cannot be decoded
+# incrementally with the stdlib), so they don't benefit from it.
+
+CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACES = " \t\n\r"
+
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+_decoder = json.JSONDecoder()
+
+
+class _JsonStream(object):
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_size=0):
+        # read at least as much as what is pending, so that
+        # re-decoding a partial value stays linear
+        chunk = self.f.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+        return True
+
+    def _error(self, msg):
+        return json.JSONDecodeError(msg, self.buf, self.pos)
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACES:
+                self.pos += 1
+
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+
+            if not self._fill():
+                return None
+
+    def expect(self, *chars):
+        char = self.peek()
+        if char not in chars:
+            raise self._error(f"Expecting {' or '.join(repr(c) for c in chars)}")
+        self.pos += 1
+
+        return char
+
+    def decode(self):
+        if self.peek() is None:
+            raise self._error("Expecting value")
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill(len(self.buf) - self.pos):
+                    continue
+                raise
+
+            # a number at the end of the buffer might be truncated
+            # (eg, `12.` | `5` or `1e` | `3` are decoded as `12` and `1`)
+            if _NUMBER_CHARS.issuperset(self.buf[end:]) and self._fill(len(self.buf) - self.pos):
+                continue
+
+            self.pos = end
+
+            return value
+
+
+def _iter_json_items(f, key, chunk_size):
+    stream = _JsonStream(f, chunk_size)
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+
+    while True:
+        name = stream.decode()
+        stream.expect(":")
+
+        if name != key:
+            stream.decode() # skip the value
+        else:
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    yield stream.decode()
+                    if stream.expect(",", "]") == "]":
+                        break
+
+        if stream.expect(",", "}") == "}":
+            return
+
+
+def iter_array(f, chunk_size=CHUNK_SIZE):
+    """
+    Yields the elements of a top-level JSON array, one at a time.
+    A truncated array (eg, a file still being written) ends at its last complete element.
+
+    Args:
+      f: text file object of the JSON file
+      chunk_size: size of the chunks read from the file
+    """
+
+    stream = _JsonStream(f, chunk_size)
+
+    stream.expect("[")
+    if stream.peek() == "]":
+        return
+
+    while True:
+        if stream.peek() is None:
+            return # truncated array
+        try:
+            value = stream.decode()
+        except json.JSONDecodeError:
+            if stream.eof:
+                return # truncated element
+            raise
+
+        yield value
+
+        if stream.peek() is None:
+            return # truncated array
+        if stream.expect(",", "]") == "]":
+            return
+
+
+def _iter_yaml_items(f, key):
+    doc = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+    yield from (doc or {}).get(key) or []
+
+
+class _Prepend(object):
+    def __init__(self, head, f):
+        self.head = head
+        self.f = f
+
+    def read(self, size=-1):
+        head, self.head = self.head, ""
+
+        return head + self.f.read(size)
+
+
+def _iter_file_items(f, key, chunk_size):
+    # skip the leading whitespaces to find out if it's JSON or YAML
+    first_char = f.read(1)
+    while first_char and first_char in _WHITESPACES:
+        first_char = f.read(1)
+
+    if first_char != "{":
+        yield from _iter_yaml_items(io.StringIO(first_char + f.read()), key)
+        return
+
+    yield from _iter_json_items(_Prepend(first_char, f), key, chunk_size)
+
+
+def iter_items(file, key="items", chunk_size=CHUNK_SIZE):
+    """
+    Yields the elements of the `items` list of a Kubernetes list, one at a time.
+
+    Args:
+      file: path or text file object of the JSON (streamed) or YAML (loaded at once) file
+      key: name of the list to iterate over
+      chunk_size: size of the chunks read from the JSON file
+    """
+
+    if isinstance(file, (str, pathlib.PurePath)):
+        with open(file) as f:
+            yield from _iter_file_items(f, key, chunk_size)
+    else:
+        yield from _iter_file_items(file, key, chunk_size)
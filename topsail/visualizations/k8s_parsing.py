@@ -0,0 +1,152 @@
+import datetime
+import functools
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+
+# Fast parsing of the Kubernetes timestamps and quantities, shared by
+# the visualization stores.
+#
+# The timestamps of the Kubernetes resources have a fixed format
+# (RFC 3339, in UTC), so they don't need the generic (regex and locale
+# based) datetime.strptime.
+
+K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
+K8S_TIME_MICRO_FMT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def parse_time(value):
+    """
+    Parses a Kubernetes timestamp (2023-10-18T12:00:05Z, with optional
+    fractional seconds) into a naive datetime, like
+    `datetime.strptime(value, K8S_TIME_FMT)` does.
+
+    Raises:
+      ValueError if the timestamp isn't in the Kubernetes format
+    """
+
+    if value[-1:] != "Z":
+        raise ValueError(f"time data '{value}' does not match the Kubernetes time format")
+
+    seconds, dot, fraction = value[:-1].partition(".")
+    if len(seconds) != 19 or seconds[10] != "T":
+        raise ValueError(f"time data '{value}' does not match the Kubernetes time format")
+
+    if dot:
+        if not (1 <= len(fraction) <= 6 and fraction.isdigit()):
+            raise ValueError(f"time data '{value}' does not match the Kubernetes time format")
+
+        seconds = f"{seconds}.{fraction:0<6}"
+
+    return datetime.datetime.fromisoformat(seconds)
+
+
+def parse_times(values, unit="us"):
+    """
+    Parses a sequence of ISO timestamps (eg, Kubernetes timestamps) into a numpy datetime64 array, in UTC.
+    The None values are converted to NaT.
+
+    Args:
+      values: the timestamps
+      unit: the unit of the datetime64 array, eg: 'ns' for the timestamps with nanoseconds
+    """
+
+    dtype = f"datetime64[{unit}]"
+    try:
+        # numpy parses the ISO timestamps natively, but warns about the
+        # timezone suffix
+        return np.array([(value[:-1] if value.endswith("Z") else value) if value else "NaT"
+                         for value in values], dtype=dtype)
+    except ValueError:
+        pass # not in UTC
+
+    import dateutil.parser
+
+    return np.array([dateutil.parser.isoparse(value).astimezone(datetime.timezone.utc).replace(tzinfo=None)
+                     if value else np.datetime64("NaT")
+                     for value in values], dtype=dtype)
+
+
+# parse_quantity code downloaded from
+# https://raw.githubusercontent.com/kubernetes-client/python/master/kubernetes/utils/quantity.py
+#
+# Copyright 2019 The Kubernetes Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+_QUANTITY_EXPONENTS = {"n": -3, "u": -2, "m": -1, "K": 1, "k": 1, "M": 2,
+                       "G": 3, "T": 4, "P": 5, "E": 6}
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_quantity(quantity):
+    """
+    Parse kubernetes canonical form quantity like 200Mi to a decimal number.
+    Supported SI suffixes:
+    base1024: Ki | Mi | Gi | Ti | Pi | Ei
+    base1000: n | u | m | "" | k | M | G | T | P | E
+
+    See https://github.com/kubernetes/apimachinery/blob/master/pkg/api/resource/quantity.go
+
+    The results are memoized, the same quantities appear in many
+    resources.
+
+    Input:
+    quantity: string. kubernetes canonical form quantity
+
+    Returns:
+    Decimal
+
+    Raises:
+    ValueError on invalid or unknown input
+    """
+    if isinstance(quantity, (int, float, Decimal)):
+        return Decimal(quantity)
+
+    exponents = _QUANTITY_EXPONENTS
+
+    quantity = str(quantity)
+    number = quantity
+    suffix = None
+    if len(quantity) >= 2 and quantity[-1] == "i":
+        if quantity[-2] in exponents:
+            number = quantity[:-2]
+            suffix = quantity[-2:]
+    elif len(quantity) >= 1 and quantity[-1] in exponents:
+        number = quantity[:-1]
+        suffix = quantity[-1:]
+
+    try:
+        number = Decimal(number)
+    except InvalidOperation:
+        raise ValueError("Invalid number format: {}".format(number))
+
+    if suffix is None:
+        return number
+
+    if suffix.endswith("i"):
+        base = 1024
+    elif len(suffix) == 1:
+        base = 1000
+    else:
+        raise ValueError("{} has unknown suffix".format(quantity))
+
+    # handly SI inconsistency
+    if suffix == "ki":
+        raise ValueError("{} has unknown suffix".format(quantity))
+
+    if suffix[0] not in exponents:
+        raise ValueError("{} has unknown suffix".format(quantity))
+
+    exponent = Decimal(exponents[suffix[0]])
+    return number * (base ** exponent)
@@ -0,0 +1,167 @@
+import os
+import math
+import pickle
+import logging
+import multiprocessing
+import concurrent.futures
+
+import matrix_benchmarking.store.simple as store_simple
+
+# Parallel parsing of the results directories.
+#
+# store_simple walks the results directories and calls the store's
+# parse function once per directory. In parallel mode, these calls
+# are only recorded during the walk. The directories are then parsed
+# in a pool of (forked) worker processes, and the results they passed
+# to `fn_add_to_matrix` are sent back to the main process, where they
+# are added to the matrix in the order of the walk.
+#
+# The store's parse function must only communicate with the main
+# process through `fn_add_to_matrix`, and the results it passes must
+# be picklable. The results which cannot be pickled are parsed again
+# in the main process.
+
+WORKERS_ENV_KEY = "MATBENCH_STORE_PARSE_WORKERS"
+
+_jobs = [] # inherited by the forked workers
+
+
+_CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+_CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+_CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _cgroup_cpu_quota():
+    # the CPU limit of the container, or None if it is not limited
+    try:
+        with open(_CGROUP_V2_CPU_MAX) as f:
+            quota, _, period = f.read().strip().partition(" ")
+    except OSError:
+        try:
+            with open(_CGROUP_V1_CPU_QUOTA) as f_quota, open(_CGROUP_V1_CPU_PERIOD) as f_period:
+                quota, period = f_quota.read().strip(), f_period.read().strip()
+        except OSError:
+            return None
+
+    if quota in ("max", "-1"):
+        return None
+
+    try:
+        return int(quota) / int(period)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def available_cpus():
+    """
+    Returns the number of CPUs this process can use: the CPUs of its affinity mask,
+    capped by the CPU quota of its cgroup (eg, the CPU limit of the Pod).
+    os.cpu_count() returns the number of CPUs of the host.
+    """
+
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError: # not available on all the platforms
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+
+    return max(1, cpus)
+
+
+def get_workers(env_key=WORKERS_ENV_KEY, default="1"):
+    """
+    Returns the number of workers, from the env_key environment variable (MATBENCH_STORE_PARSE_WORKERS by default).
+    0 or 'auto' means one worker per available CPU (see available_cpus()).
+    """
+
+    workers = os.environ.get(env_key, default)
+    if workers in ("0", "auto"):
+        return available_cpus()
+
+    try:
+        return max(1, int(workers))
+    except ValueError:
+        logging.warning(f"Invalid {env_key} value '{workers}', using only one worker.")
+        return 1
+
+
+def _parse_job(idx):
+    parse_results_fn, _, dirname, import_settings = _jobs[idx]
+
+    added = []
+    def add_to_matrix(*args, **kwargs):
+        added.append((args, kwargs))
+
+    parse_results_fn(add_to_matrix, dirname, import_settings)
+
+    try:
+        return pickle.dumps(added), None
+    except Exception as e:
+        return None, f"{e.__class__.__name__}: {e}"
+
+
+def parse_data(parse_results_fn, workers=None):
+    """
+    Parses the results with store_simple, with the directories parsed in parallel.
+
+    Args:
+      parse_results_fn: the store's parse function, called as `parse_results_fn(fn_add_to_matrix, dirname, import_settings)`
+      workers: the number of worker processes. If None, taken from get_workers().
+    """
+
+    if workers is None:
+        workers = get_workers()
+
+    if workers <= 1:
+        store_simple.register_custom_parse_results(parse_results_fn)
+        return store_simple.parse_data()
+
+    def defer_parse_results(fn_add_to_matrix, dirname, import_settings):
+        _jobs.append((parse_results_fn, fn_add_to_matrix, dirname, import_settings))
+
+    _jobs[:] = []
+    store_simple.register_custom_parse_results(defer_parse_results)
+    try:
+        ret = store_simple.parse_data()
+    finally:
+        store_simple.register_custom_parse_results(parse_results_fn)
+
+    try:
+        _run_jobs(workers)
+    finally:
+        _jobs[:] = []
+
+    return ret
+
+
+def _run_jobs(workers):
+    if not _jobs:
+        return
+
+    workers = min(workers, len(_jobs))
+    logging.info(f"Parsing {len(_jobs)} results directories with {workers} workers ...")
+
+    # fork, so that the workers inherit the store modules and the jobs
+    mp_context = multiprocessing.get_context("fork")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        futures = [executor.submit(_parse_job, idx) for idx in range(len(_jobs))]
+
+        try:
+            # add the results in the order of the directory walk
+            for (parse_results_fn, fn_add_to_matrix, dirname, import_settings), future in zip(_jobs, futures):
+                payload, pickle_error = future.result()
+
+                if payload is None:
+                    logging.warning(f"Cannot transfer the results of {dirname} from the parse worker ({pickle_error}), parsing it again ...")
+                    parse_results_fn(fn_add_to_matrix, dirname, import_settings)
+                    continue
+
+                for args, kwargs in pickle.loads(payload):
+                    fn_add_to_matrix(*args, **kwargs)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
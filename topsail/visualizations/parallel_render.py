@@ -0,0 +1,212 @@
+import sys
+import time
+import pickle
+import logging
+import functools
+import multiprocessing
+import concurrent.futures
+import urllib.parse
+
+import plotly.io
+
+import matrix_benchmarking.plotting.table_stats as table_stats
+
+from topsail.visualizations import parallel_parse
+
+# Parallel rendering of the reports and figures of a visualization.
+#
+# matbench renders the stats of the `generate` list one after the
+# other, and exports their figures to PNG one after the other. Here,
+# - all the stats of the `generate` list are rendered ahead of time
+#   in a pool of (forked) worker processes, when matbench asks for
+#   the first of them. matbench then gets the pre-rendered figures,
+#   in its own order, and saves them under its own file names.
+# - the static image exports (`plotly.io.write_image`) are sent to
+#   the same pool, and waited for at the end of the rendering.
+#
+# A stat is rendered in the main process if matbench calls it with
+# different arguments, or if its rendering cannot be transferred back.
+# The duration of each stat rendering is logged, slowest first.
+
+WORKERS_ENV_KEY = "MATBENCH_RENDER_WORKERS"
+
+_in_worker = False
+_rendering = None # the Rendering currently active in the main process
+
+
+def _timed_do_plot(stat, do_plot):
+    @functools.wraps(do_plot)
+    def wrapper(*args):
+        if _in_worker or _rendering is None:
+            return do_plot(*args)
+
+        return _rendering.do_plot(stat.name, do_plot, args)
+
+    return wrapper
+
+
+def _hook_stats_registration():
+    register_stat = table_stats.TableStats._register_stat
+    if getattr(register_stat, "topsail_hooked", False):
+        return
+
+    def _register_stat(stat):
+        stat.do_plot = _timed_do_plot(stat, stat.do_plot)
+        return register_stat(stat)
+
+    _register_stat.topsail_hooked = True
+    table_stats.TableStats._register_stat = _register_stat
+
+
+def _render_stat(name, args_payload):
+    global _in_worker
+    _in_worker = True
+
+    start = time.perf_counter()
+    fig, msg = table_stats.TableStats.stats_by_name[name].do_plot(*pickle.loads(args_payload))
+    duration = time.perf_counter() - start
+
+    try:
+        return pickle.dumps((fig, msg)), duration
+    except Exception as e:
+        logging.warning(f"Cannot transfer the rendering of '{name}' from the worker ({e.__class__.__name__}: {e})")
+        return None, duration
+
+
+def _export_image(fig_json, args, kwargs):
+    global _in_worker
+    _in_worker = True
+
+    _original_write_image(plotly.io.from_json(fig_json), *args, **kwargs)
+
+
+_original_write_image = plotly.io.write_image
+
+
+def _write_image(fig, *args, **kwargs):
+    if _in_worker or _rendering is None:
+        return _original_write_image(fig, *args, **kwargs)
+
+    return _rendering.write_image(fig, *args, **kwargs)
+
+
+class Rendering(object):
+    """
+    Context manager activating the parallel rendering of the stats of a matbench `generate` list.
+
+    Args:
+      generate: the matbench `generate` argument (`stats=name1&stats=name2...`)
+      workers: the number of worker processes. If None, taken from MATBENCH_RENDER_WORKERS ('auto' for one per available CPU, see parallel_parse.available_cpus).
+    """
+
+    def __init__(self, generate, workers=None):
+        self.stats_names = [value for key, value in urllib.parse.parse_qsl(generate or "") if key == "stats"]
+        self.workers = workers if workers is not None else parallel_parse.get_workers(WORKERS_ENV_KEY)
+        self.executor = None
+        self.prerendered = {}
+        self.args_payload = None
+        self.image_exports = []
+        self.timings = {}
+
+    def __enter__(self):
+        global _rendering
+
+        _hook_stats_registration()
+        _rendering = self
+
+        if self.workers > 1:
+            plotly.io.write_image = _write_image
+
+        return self
+
+    def __exit__(self, ex_type, ex_value, exc_traceback):
+        global _rendering
+        _rendering = None
+        plotly.io.write_image = _original_write_image
+
+        try:
+            for path, future in self.image_exports:
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"Failed to export the image {path}: {e.__class__.__name__}: {e}")
+        finally:
+            if self.executor:
+                self.executor.shutdown(cancel_futures=True)
+
+        self.log_timings()
+
+        return False # If we returned True here, any exception would be suppressed!
+
+    def _get_executor(self):
+        if self.executor is None:
+            # the forked workers must not duplicate the buffered outputs
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for handler in logging.getLogger().handlers:
+                handler.flush()
+
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers,
+                                                                   mp_context=multiprocessing.get_context("fork"))
+        return self.executor
+
+    def _prerender(self, args):
+        try:
+            self.args_payload = pickle.dumps(args)
+        except Exception as e:
+            logging.warning(f"Cannot render the stats in parallel, their arguments cannot be pickled ({e.__class__.__name__}: {e})")
+            self.workers = 1
+            return
+
+        logging.info(f"Rendering {len(self.stats_names)} stats with {self.workers} workers ...")
+        executor = self._get_executor()
+        for name in self.stats_names:
+            if name not in table_stats.TableStats.stats_by_name: continue
+            self.prerendered[name] = executor.submit(_render_stat, name, self.args_payload)
+
+    def do_plot(self, name, do_plot, args):
+        if self.workers > 1 and self.args_payload is None and name in self.stats_names:
+            self._prerender(args)
+
+        future = self.prerendered.pop(name, None)
+        if future is not None:
+            try:
+                same_args = pickle.dumps(args) == self.args_payload
+            except Exception:
+                same_args = False
+
+            if same_args:
+                try:
+                    payload, duration = future.result()
+                except Exception as e:
+                    logging.warning(f"Parallel rendering of '{name}' failed ({e.__class__.__name__}: {e}), rendering it again ...")
+                    payload = None
+
+                if payload is not None:
+                    self.timings[name] = duration
+                    return pickle.loads(payload)
+            else:
+                future.cancel()
+
+        start = time.perf_counter()
+        try:
+            return do_plot(*args)
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - start
+
+    def write_image(self, fig, *args, **kwargs):
+        path = args[0] if args else kwargs.get("file")
+        try:
+            fig_json = plotly.io.to_json(fig)
+        except Exception:
+            return _original_write_image(fig, *args, **kwargs)
+
+        self.image_exports.append((path, self._get_executor().submit(_export_image, fig_json, args, kwargs)))
+
+    def log_timings(self):
+        if not self.timings:
+            return
+
+        logging.info(f"Rendering time of the {len(self.timings)} stats, slowest first:")
+        for name, duration in sorted(self.timings.items(), key=lambda item: item[1], reverse=True):
+            logging.info(f"  {duration:7.2f}s  {name}")
@@ -0,0 +1,210 @@
+import os
+import pathlib
+import pickle
+import hashlib
+import logging
+import threading
+import functools
+import inspect
+
+# Per-function cache of the parse results.
+#
+# The parse functions decorated with `@parse_cache.cached(version)`
+# are cached individually, in the CACHE_DIRNAME directory of the
+# results directory. A cache entry is reused only if:
+# - the function version is the same,
+# - the function arguments are the same,
+# - all the files read by the function (ie, passed to the store's
+#   `register_important_file`, which must call `record_file`) have
+#   the same size and the same mtime or content hash.
+#
+# The caching is only active inside a `ParseCache(dirname)` context.
+
+CACHE_DIRNAME = ".matbench_parse_cache"
+
+_state = threading.local()
+
+
+def _recorders():
+    if not hasattr(_state, "recorders"):
+        _state.recorders = []
+    return _state.recorders
+
+
+def hash_file(path):
+    """
+    Returns the sha256 hex digest of the content of a file.
+    """
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+
+    return sha.hexdigest()
+
+
+def _fingerprint(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    return dict(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=hash_file(path))
+
+
+def _is_fresh(path, fingerprint):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return fingerprint is None
+
+    if fingerprint is None or stat.st_size != fingerprint["size"]:
+        return False
+
+    if stat.st_mtime_ns == fingerprint["mtime_ns"]:
+        return True
+
+    return hash_file(path) == fingerprint["sha256"]
+
+
+def record_file(path):
+    """
+    Records that the file has been read by the parse functions currently executing.
+    To be called from the store's `register_important_file` function.
+    """
+
+    for recorder in _recorders():
+        recorder.add(pathlib.Path(path))
+
+
+class ParseCache(object):
+    """
+    Activates the per-function parse cache for the given results directory.
+
+    Args:
+      dirname: the results directory
+      ignore: if True, the cache entries are not reused, but they are still regenerated.
+    """
+
+    def __init__(self, dirname, ignore=False):
+        self.dirname = pathlib.Path(dirname)
+        self.ignore = ignore
+        self.previous = None
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        self.previous = getattr(_state, "cache", None)
+        _state.cache = self
+
+        return self
+
+    def __exit__(self, ex_type, ex_value, exc_traceback):
+        _state.cache = self.previous
+        if self.hits or self.misses:
+            logging.info(f"parse_cache: {self.dirname}: {self.hits} hit(s), {self.misses} miss(es)")
+
+        return False # If we returned True here, any exception would be suppressed!
+
+    def _entry_path(self, name, key):
+        return self.dirname / CACHE_DIRNAME / f"{name}.{key}.pickle"
+
+    def load(self, name, key, version):
+        if self.ignore:
+            return ...
+
+        entry_path = self._entry_path(name, key)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return ...
+        except Exception as e:
+            logging.warning(f"parse_cache: cannot load {entry_path}: {e.__class__.__name__}: {e}")
+            return ...
+
+        if entry["version"] != version:
+            logging.info(f"parse_cache: {name}: version changed ({entry['version']} --> {version})")
+            return ...
+
+        for filename, fingerprint in entry["files"].items():
+            if not _is_fresh(self.dirname / filename, fingerprint):
+                logging.info(f"parse_cache: {name}: {filename} changed")
+                return ...
+
+        # the outer cached functions depend on these files as well
+        for filename in entry["files"]:
+            record_file(self.dirname / filename)
+
+        return entry["value"]
+
+    def save(self, name, key, version, files, value):
+        entry = dict(
+            version=version,
+            files={str(path.relative_to(self.dirname)): _fingerprint(path)
+                   for path in files if path.is_relative_to(self.dirname)},
+            value=value,
+        )
+
+        entry_path = self._entry_path(name, key)
+        entry_path.parent.mkdir(exist_ok=True)
+
+        tmp_path = entry_path.with_name(f".{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f)
+        except Exception as e:
+            logging.warning(f"parse_cache: cannot save {name}: {e.__class__.__name__}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        os.replace(tmp_path, entry_path)
+
+
+def cached(version, ignore_args=(), extra_files=()):
+    """
+    Caches the result of a parse function, whose first argument must be the results directory.
+
+    Args:
+      version: version of the parse function. Must be bumped when its code changes.
+      ignore_args: names of the arguments which should not be part of the cache key (eg, unpicklable objects).
+      extra_files: files (relative to the results directory) the result depends on, in addition to the recorded ones.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(dirname, *args, **kwargs):
+            cache = getattr(_state, "cache", None)
+            if cache is None or pathlib.Path(dirname) != cache.dirname:
+                return fn(dirname, *args, **kwargs)
+
+            bound = signature.bind(dirname, *args, **kwargs)
+            bound.apply_defaults()
+            key_args = {k: v for k, v in list(bound.arguments.items())[1:] if k not in ignore_args}
+            key = hashlib.sha256(repr(sorted(key_args.items())).encode()).hexdigest()[:16]
+
+            value = cache.load(name, key, version)
+            if value is not ...:
+                cache.hits += 1
+                return value
+
+            cache.misses += 1
+            files = set(cache.dirname / filename for filename in extra_files)
+
+            _recorders().append(files)
+            try:
+                value = fn(dirname, *args, **kwargs)
+            finally:
+                _recorders().pop()
+
+            cache.save(name, key, version, files, value)
+
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,206 @@
+import os
+import json
+import logging
+import hashlib
+import importlib
+import concurrent.futures
+
+import numpy as np
+
+import matrix_benchmarking.store.prom_db as store_prom_db
+
+from topsail.visualizations import parse_cache, parallel_parse, prom_planner
+
+# Persistent store of the metrics extracted from the Prometheus tarballs.
+#
+# Extracting the metrics means extracting the tarball, launching
+# Prometheus on it and evaluating the queries, so it takes minutes.
+# Here, the series returned by `store_prom_db.extract_metrics` are
+# saved in the STORE_DIRNAME directory of the results directory, one
+# compressed columnar file (numpy .npz) per query, addressed by the
+# hash of the tarball content and of the query text. When the metrics
+# of a tarball are requested again, only the queries which aren't in
+# the store are evaluated, and the tarball isn't extracted at all if
+# there is none.
+#
+# The queries are planned with prom_planner, which evaluates each
+# distinct expression only once, and computes the simple aggregations
+# client-side. The number of queries loaded from the store, computed
+# and evaluated is logged for each tarball.
+#
+# The tarballs are extracted concurrently, see WORKERS_ENV_KEY.
+
+STORE_DIRNAME = ".matbench_prom_metrics"
+
+WORKERS_ENV_KEY = "MATBENCH_PROM_EXTRACT_WORKERS"
+
+
+def _query_key(tarball_hash, query):
+    return hashlib.sha256(f"{tarball_hash}\0{prom_planner.normalize(query)}".encode()).hexdigest()
+
+
+def _metric_items(metrics):
+    for metric in metrics:
+        if isinstance(metric, dict):
+            yield from metric.items()
+        else:
+            yield metric, metric
+
+
+def _to_columns(series_list):
+    labels = []
+    offsets = [0]
+    timestamps = []
+    values = []
+    series_class = None
+
+    for series in series_list:
+        if not isinstance(getattr(series, "values", None), dict) or not isinstance(getattr(series, "metric", None), dict):
+            raise ValueError(f"unexpected series type {series.__class__.__name__}")
+
+        series_class = f"{series.__class__.__module__}:{series.__class__.__qualname__}"
+        labels.append(json.dumps(series.metric))
+        timestamps += series.values.keys()
+        values += series.values.values()
+        offsets.append(len(timestamps))
+
+    return dict(
+        series_class=np.array(series_class or ""),
+        labels=np.array(labels, dtype=str),
+        offsets=np.array(offsets, dtype=np.int64),
+        timestamps=np.array(timestamps),
+        values=np.array(values),
+    )
+
+
+def _from_columns(columns):
+    if not len(columns["labels"]):
+        return []
+
+    module_name, _, class_name = str(columns["series_class"]).partition(":")
+    series_class = importlib.import_module(module_name)
+    for name in class_name.split("."):
+        series_class = getattr(series_class, name)
+
+    offsets = columns["offsets"]
+    timestamps = columns["timestamps"].tolist()
+    values = columns["values"].tolist()
+
+    return [
+        series_class(metric=json.loads(labels),
+                     values=dict(zip(timestamps[start:end], values[start:end])))
+        for labels, start, end in zip(columns["labels"], offsets[:-1], offsets[1:])
+    ]
+
+
+class MetricsStore(object):
+    """
+    Store of the extracted metrics of a results directory.
+    """
+
+    def __init__(self, dirname):
+        self.path = dirname / STORE_DIRNAME
+
+    def load(self, tarball_hash, query):
+        try:
+            with np.load(self.path / f"{_query_key(tarball_hash, query)}.npz") as columns:
+                return _from_columns(columns)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"prom_metrics: cannot load the '{query}' series: {e.__class__.__name__}: {e}")
+            return None
+
+    def save(self, tarball_hash, query, series_list):
+        try:
+            columns = _to_columns(series_list)
+        except ValueError as e:
+            logging.warning(f"prom_metrics: cannot store the '{query}' series: {e}")
+            return
+
+        self.path.mkdir(exist_ok=True)
+        entry_path = self.path / f"{_query_key(tarball_hash, query)}.npz"
+        tmp_path = entry_path.with_name(f".{entry_path.stem}.{os.getpid()}.tmp.npz")
+
+        np.savez_compressed(tmp_path, **columns)
+        os.replace(tmp_path, entry_path)
+
+
+def _extract_tarball(dirname, prom_tarball, roles):
+    store = MetricsStore(dirname)
+    tarball_hash = parse_cache.hash_file(prom_tarball)
+
+    series_by_query = {}
+    missing = {} # query -> name, to evaluate each query only once
+    for role, metrics in roles.items():
+        for name, query in _metric_items(metrics):
+            if query in series_by_query or query in missing: continue
+
+            series_list = store.load(tarball_hash, query)
+            if series_list is None:
+                missing[query] = name if name not in missing.values() else f"{name} ({len(missing)})"
+            else:
+                series_by_query[query] = series_list
+
+    if missing:
+        query_plan = prom_planner.QueryPlan(missing, available=series_by_query)
+        logging.info(f"prom_metrics: {dirname.name}/{prom_tarball.name} ({', '.join(roles)}): "
+                     f"{len(series_by_query)} queries loaded from the store, {query_plan.summary()}")
+
+        evaluated = {}
+        if query_plan.to_evaluate:
+            to_evaluate = list(query_plan.to_evaluate.values())
+            extracted = store_prom_db.extract_metrics(prom_tarball, [{missing[query]: query} for query in to_evaluate], dirname)
+            evaluated = {query: extracted[missing[query]] for query in to_evaluate if missing[query] in extracted}
+
+        for query, series_list in query_plan.resolve({**series_by_query, **evaluated}).items():
+            series_by_query[query] = series_list
+            store.save(tarball_hash, query, series_list)
+
+    return {
+        role: {name: series_by_query[query] for name, query in _metric_items(metrics) if query in series_by_query}
+        for role, metrics in roles.items()
+    }
+
+
+def extract_metrics(dirname, metrics_tarballs, register_important_file, workers=None):
+    """
+    Extracts the metrics from the Prometheus tarballs of a results directory, like `store_prom_db.extract_metrics`.
+
+    Args:
+      dirname: the results directory
+      metrics_tarballs: dict of role name -> (tarball glob, list of metrics {name: query})
+      register_important_file: the store's register_important_file function
+      workers: the number of tarballs extracted concurrently. If None, taken from MATBENCH_PROM_EXTRACT_WORKERS ('auto' by default).
+
+    Returns:
+      a dict of role name -> {metric name: [series]}, without the roles whose tarball is missing
+    """
+
+    if workers is None:
+        workers = parallel_parse.get_workers(WORKERS_ENV_KEY, default="auto")
+
+    tarballs = {} # tarball path -> {role name: metrics}
+    for name, (tarball_glob, metrics) in metrics_tarballs.items():
+        try:
+            prom_tarball = list(dirname.glob(tarball_glob))[0]
+        except IndexError:
+            logging.warning(f"No {tarball_glob} in '{dirname}'.")
+            continue
+
+        register_important_file(dirname, prom_tarball.relative_to(dirname))
+        tarballs.setdefault(prom_tarball, {})[name] = metrics
+
+    results = {}
+    if not tarballs:
+        return results
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers, len(tarballs))) as executor:
+        futures = [executor.submit(_extract_tarball, dirname, prom_tarball, roles)
+                   for prom_tarball, roles in tarballs.items()]
+
+        for future in futures:
+            results.update(future.result())
+
+    # keep the order of the roles
+    return {name: results[name] for name in metrics_tarballs if name in results}
@@ -0,0 +1,180 @@
+import numpy as np
+
+# Planning of the Prometheus queries of the visualization stores.
+#
+# The metric lists of the `prom.py` modules contain many identical
+# (or only differently indented) queries, and aggregations of queries
+# they also contain, eg:
+#   rate(container_cpu_usage_seconds_total{...}[5m])
+#   sum(rate(container_cpu_usage_seconds_total{...}[5m]))
+# The query plan evaluates each distinct expression only once, and
+# computes the plain `sum(...)` and `max(...)` aggregations of
+# expressions which are evaluated anyway (or already available)
+# client-side, with numpy, instead of asking Prometheus for them.
+
+AGGREGATIONS = {
+    "sum": np.add,
+    "max": np.maximum,
+}
+
+
+def normalize(query):
+    """
+    Returns the query with its whitespaces collapsed, outside of the quoted strings.
+    The whitespaces around the brackets and before the commas are dropped.
+    """
+
+    normalized = []
+    quote = None
+    pending_space = False
+    for c in query.strip():
+        if quote:
+            normalized.append(c)
+            if c == quote:
+                quote = None
+            continue
+
+        if c.isspace():
+            pending_space = True
+            continue
+
+        if pending_space and normalized and normalized[-1] not in "({[," and c not in "({[)}],":
+            normalized.append(" ")
+        pending_space = False
+
+        if c in "'\"`":
+            quote = c
+        normalized.append(c)
+
+    return "".join(normalized)
+
+
+def split_aggregation(query):
+    """
+    Splits a normalized `sum(expr)` or `max(expr)` query (without `by`/`without` clause).
+
+    Returns:
+      (aggregation, normalized expr), or None if the query isn't such an aggregation
+    """
+
+    op, paren, rest = query.partition("(")
+    op = op.strip()
+    if not paren or op not in AGGREGATIONS or not rest.endswith(")"):
+        return None
+
+    inner = rest[:-1]
+
+    depth = 0
+    quote = None
+    for c in inner:
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in "'\"`":
+            quote = c
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth < 0:
+                return None # the aggregation parenthesis closes before the end, eg `sum(x) by (y)`
+
+    if depth != 0 or not inner.strip():
+        return None
+
+    return op, normalize(inner)
+
+
+def aggregate(op, series_list):
+    """
+    Computes the `op` (sum or max) aggregation of a list of series, like Prometheus does:
+    one series without labels, with the aggregated value of each timestamp.
+    """
+
+    if not series_list:
+        return []
+
+    timestamps = np.concatenate([np.array(list(series.values.keys())) for series in series_list])
+    values = np.concatenate([np.array(list(series.values.values()), dtype=np.float64) for series in series_list])
+
+    unique_timestamps, positions = np.unique(timestamps, return_inverse=True)
+
+    aggregated = np.full(len(unique_timestamps), 0.0 if op == "sum" else -np.inf)
+    AGGREGATIONS[op].at(aggregated, positions, values)
+
+    return [series_list[0].__class__(metric={}, values=dict(zip(unique_timestamps.tolist(), aggregated.tolist())))]
+
+
+class QueryPlan(object):
+    """
+    Plan of the evaluation of a set of queries.
+
+    Args:
+      queries: the queries to plan
+      available: the queries whose series are already available (eg, loaded from a cache)
+
+    Attributes:
+      to_evaluate: the queries which must be evaluated by Prometheus
+      derived: the queries computed client-side, from the series of another query
+    """
+
+    def __init__(self, queries, available=()):
+        self.queries = list(queries)
+
+        requested = set(normalize(query) for query in self.queries)
+        available = set(normalize(query) for query in available)
+
+        self.to_evaluate = {} # normalized query -> query
+        self.derived = {} # normalized query -> (aggregation, normalized base query)
+
+        for query in self.queries:
+            normalized = normalize(query)
+            if normalized in self.to_evaluate or normalized in self.derived:
+                continue
+
+            aggregation = split_aggregation(normalized)
+            if aggregation and (aggregation[1] in requested or aggregation[1] in available):
+                self.derived[normalized] = aggregation
+            else:
+                self.to_evaluate[normalized] = query
+
+    def summary(self):
+        return (f"{len(self.queries)} queries, {len(self.to_evaluate) + len(self.derived)} distinct, "
+                f"{len(self.derived)} computed client-side, {len(self.to_evaluate)} to evaluate")
+
+    def resolve(self, series_by_query):
+        """
+        Computes the series of the planned queries.
+
+        Args:
+          series_by_query: the series of the evaluated queries, and of the available ones
+
+        Returns:
+          a dict of query -> series, for all the planned queries which could be resolved
+        """
+
+        series_by_normalized = {normalize(query): series for query, series in series_by_query.items()}
+
+        def get(normalized):
+            if normalized in series_by_normalized:
+                return series_by_normalized[normalized]
+
+            if normalized not in self.derived:
+                return None
+
+            op, base = self.derived[normalized]
+            base_series = get(base)
+            if base_series is None:
+                return None
+
+            series_by_normalized[normalized] = aggregate(op, base_series)
+
+            return series_by_normalized[normalized]
+
+        resolved = {}
+        for query in self.queries:
+            series = get(normalize(query))
+            if series is not None:
+                resolved[query] = series
+
+        return resolved
@@ -0,0 +1,134 @@
+#! /usr/bin/env python
+
+import os
+import sys
+import json
+import pathlib
+import logging
+import functools
+import contextlib
+
+import matrix_benchmarking.common as common
+import matrix_benchmarking.store as store
+import matrix_benchmarking.store.simple as store_simple
+import matrix_benchmarking.visualize as matbench_visualize
+
+from topsail.visualizations import parallel_render
+
+# Renders all the visualizations of a plot job in a single process.
+#
+# `matbench visualize` reloads the whole results matrix every time it
+# is launched. Here, it is called in-process for every rendering of
+# the plan file, and the matrix is loaded only once: the first
+# `store_simple.parse_data()` records the entries added to the
+# matrix, and the next calls add the same entries again, without
+# walking and loading the results directories.
+#
+# The stats of each rendering are rendered in parallel, see
+# parallel_render.
+#
+# The plan file is a JSON list of renderings:
+#   {"dest_dir": ..., "log_file": ..., "args": {matbench visualize arguments}}
+# The status of each rendering is saved in `<plan file>.status.json`.
+
+
+def _reset_matrix():
+    for name in ("processed_map", "import_map", "settings"):
+        value = getattr(common.Matrix, name, None)
+        if hasattr(value, "clear"):
+            value.clear()
+
+
+def _load_matrix_once(parse_data):
+    loaded = None # (entries, parse_data return value)
+
+    @functools.wraps(parse_data)
+    def wrapper(*args, **kwargs):
+        nonlocal loaded
+
+        add_to_matrix = store.add_to_matrix
+
+        if loaded is not None:
+            entries, ret = loaded
+            logging.info(f"Reusing the {len(entries)} entries of the matrix already loaded.")
+            for entry_args, entry_kwargs in entries:
+                add_to_matrix(*entry_args, **entry_kwargs)
+
+            return ret
+
+        entries = []
+        def recording_add_to_matrix(*entry_args, **entry_kwargs):
+            entries.append((entry_args, entry_kwargs))
+            return add_to_matrix(*entry_args, **entry_kwargs)
+
+        store.add_to_matrix = recording_add_to_matrix
+        try:
+            ret = parse_data(*args, **kwargs)
+        finally:
+            store.add_to_matrix = add_to_matrix
+
+        loaded = entries, ret
+
+        return ret
+
+    return wrapper
+
+
+def render(dest_dir, log_file, args):
+    """
+    Renders one visualization, like `matbench visualize` launched from dest_dir would do.
+
+    Returns:
+      True if the rendering succeeded, False otherwise.
+    """
+
+    dest_dir = pathlib.Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    _reset_matrix()
+
+    log_handler = logging.FileHandler(log_file, mode="w")
+    log_handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logging.getLogger().addHandler(log_handler)
+
+    cwd = os.getcwd()
+    try:
+        with open(log_file, "a") as log_f, \
+             contextlib.redirect_stdout(log_f), contextlib.redirect_stderr(log_f):
+            os.chdir(dest_dir)
+            try:
+                with parallel_render.Rendering(args.get("generate")):
+                    ret = matbench_visualize.main(**args)
+            except SystemExit as e:
+                ret = e.code
+    except Exception as e:
+        logging.exception(f"Rendering of '{dest_dir}' failed: {e.__class__.__name__}: {e}")
+        ret = 1
+    finally:
+        os.chdir(cwd)
+        logging.getLogger().removeHandler(log_handler)
+        log_handler.close()
+
+    return not ret
+
+
+def main(plan_file):
+    with open(plan_file) as f:
+        plan = json.load(f)
+
+    store_simple.parse_data = _load_matrix_once(store_simple.parse_data)
+
+    status = []
+    for rendering in plan:
+        logging.info(f"Rendering '{rendering['args'].get('filters') or '(no filter)'}' into {rendering['dest_dir']} ...")
+        status.append(render(rendering["dest_dir"], rendering["log_file"], rendering["args"]))
+
+    with open(f"{plan_file}.status.json", "w") as f:
+        json.dump(status, f)
+
+    return 0 if all(status) else 1
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+    sys.exit(main(*sys.argv[1:]))
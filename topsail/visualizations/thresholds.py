@@ -0,0 +1,67 @@
+import collections
+
+# Index of the threshold entries (settings selector -> thresholds),
+# shared by the workloads' threshold checks.
+#
+# The entries are grouped by the keys of their selector. Inside a
+# group, they are stored in a dict keyed by the selector values, so
+# resolving the thresholds of a result costs one dict lookup per
+# group, instead of comparing the result settings with all the
+# selectors.
+#
+# A result matches all the entries whose selector values are equal to
+# its settings (compared as strings). A WILDCARD selector value matches
+# any setting value. The thresholds of all the matching entries are
+# merged, in the order of the entries.
+
+WILDCARD = "*"
+
+
+class ThresholdIndex():
+    def __init__(self, entries=()):
+        # selector keys --> selector values --> [(position, thresholds), ...]
+        self.groups = collections.defaultdict(lambda: collections.defaultdict(list))
+        self.count = 0
+        self._cache = {}
+
+        for settings_selector, thresholds in entries:
+            self.add(settings_selector, thresholds)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, settings_selector, thresholds):
+        """
+        Adds a threshold entry. The entries added last take precedence.
+        """
+
+        keys = tuple(sorted(key for key, value in (settings_selector or {}).items()
+                            if str(value) != WILDCARD))
+        values = tuple(str(settings_selector[key]) for key in keys)
+
+        self.groups[keys][values].append((self.count, thresholds or {}))
+        self.count += 1
+        self._cache.clear()
+
+    def get(self, settings):
+        """
+        Returns the thresholds of all the entries matching the settings, merged in a new dict.
+        """
+
+        cache_key = frozenset((key, str(value)) for key, value in settings.items())
+        try:
+            matches = self._cache[cache_key]
+        except KeyError:
+            matches = []
+            for keys, group in self.groups.items():
+                values = tuple(str(settings.get(key)) for key in keys)
+                matches += group.get(values, [])
+
+            matches.sort(key=lambda match: match[0])
+            self._cache[cache_key] = matches
+
+        thresholds = {}
+        for _, match_thresholds in matches:
+            thresholds.update(match_thresholds)
+
+        return thresholds